@@ -0,0 +1,14 @@
+"""
+Benchmarks for disc generation, export and preview rendering
+
+Run from the repository root. Results are saved as JSON; keep one as the
+baseline and compare later runs against it, the exit status is 1 when a
+case got slower than the threshold:
+
+    python -m benchmarks run -o baseline.json
+    python -m benchmarks run --compare baseline.json
+    python -m benchmarks run --quick -c generate_disc pdf_export -o quick.json
+    python -m benchmarks compare baseline.json benchmark-results.json --threshold 0.25
+
+The preview cases paint with Qt on its offscreen platform, no display is needed.
+"""
@@ -0,0 +1,193 @@
+"""
+Benchmark cases
+
+Every case is run on a grid of discs. The grid varies one parameter at a
+time around a typical disc (4 rings of lines at 33.33 RPM, double
+density, 150 mm), so each axis shows its own trend without running the
+full cartesian product; --full runs the product instead.
+
+ring_segments() is memoized, so every case except the *_cached ones clears
+its cache before each run and times the calculation itself.
+"""
+
+import io
+import os
+from itertools import product
+
+from src.disc_spec import DiscSpec, RingSpec, calculate_ring_lines, layout_disc, ring_segments
+from src.svg_generator import SVGGenerator
+
+
+# Preview size of the GUI cases, in pixels (a typical window)
+PREVIEW_SIZE = 756
+
+BASE_PARAMETERS = {
+    'rings': 4,
+    'rpm': 33.33,
+    'density': 'double',
+    'shape': 'lines',
+    'diameter': 150,
+}
+
+# Custom speeds of 1-10 RPM give the densest rings (thousands of segments)
+GRID = {
+    'rings': [1, 4, 12],
+    'rpm': [1, 5, 10, 33.33, 45, 78],
+    'density': ['normal', 'double'],
+    'shape': ['lines', 'dots'],
+    'diameter': [100, 150, 300],
+}
+
+QUICK_GRID = {
+    'rings': [1, 12],
+    'rpm': [1, 33.33],
+    'shape': ['lines', 'dots'],
+}
+
+
+def disc_grid(full=False, quick=False):
+    """Return the (name, parameters) of the discs to benchmark"""
+    if full:
+        combinations = [dict(zip(GRID, values)) for values in product(*GRID.values())]
+    else:
+        grid = QUICK_GRID if quick else GRID
+        combinations = [dict(BASE_PARAMETERS)]
+        for axis, values in grid.items():
+            for value in values:
+                parameters = dict(BASE_PARAMETERS, **{axis: value})
+                if parameters not in combinations:
+                    combinations.append(parameters)
+
+    return [(disc_name(parameters), parameters) for parameters in combinations]
+
+
+def disc_name(parameters):
+    return ",".join(f"{key}={value}" for key, value in parameters.items())
+
+
+def build_disc_spec(parameters):
+    count = parameters['rings']
+    diameter = parameters['diameter']
+    # Rings share the room between the outer circle and the spindle
+    depth = min(8.0, (diameter / 2 - 10) / count - 1)
+    rings = tuple(
+        RingSpec(
+            rpm=parameters['rpm'],
+            hz=(50.0, 60.0)[index % 2],
+            depth=depth,
+            single_mode=False,
+            shape_type=parameters['shape'],
+            density=parameters['density'],
+        )
+        for index in range(count)
+    )
+    return DiscSpec(diameter=diameter, rings=rings, text_top="Benchmark", text_bottom="Strobe disc")
+
+
+def case_ring_lines(disc_spec, workdir):
+    _, ring_layouts = layout_disc(disc_spec)
+
+    def run():
+        ring_segments.cache_clear()
+        for ring_layout in ring_layouts:
+            calculate_ring_lines(ring_layout.spec, ring_layout.outer_radius, ring_layout.depth)
+    return run
+
+
+def case_ring_lines_cached(disc_spec, workdir):
+    _, ring_layouts = layout_disc(disc_spec)
+    for ring_layout in ring_layouts:
+        calculate_ring_lines(ring_layout.spec, ring_layout.outer_radius, ring_layout.depth)
+
+    def run():
+        for ring_layout in ring_layouts:
+            calculate_ring_lines(ring_layout.spec, ring_layout.outer_radius, ring_layout.depth)
+    return run
+
+
+def case_generate_disc(disc_spec, workdir):
+    # A fresh generator each time, the ring cache would otherwise skip the work
+    def run():
+        ring_segments.cache_clear()
+        SVGGenerator().generate_disc(disc_spec)
+    return run
+
+
+def case_generate_disc_cached(disc_spec, workdir):
+    generator = SVGGenerator()
+    generator.generate_disc(disc_spec)
+
+    def run():
+        generator.generate_disc(disc_spec)
+    return run
+
+
+def case_svg_save(disc_spec, workdir):
+    generator = SVGGenerator()
+    file_path = os.path.join(workdir, "disc.svg")
+
+    def run():
+        ring_segments.cache_clear()
+        generator.ring_cache.clear()
+        generator.generate_disc(disc_spec, filename=file_path)
+    return run
+
+
+def case_pdf_export(disc_spec, workdir):
+    from src.pdf_export import export_pdf
+
+    generator = SVGGenerator()
+    layout = generator.get_disc_layout(disc_spec)
+
+    def run():
+        export_pdf(layout, io.BytesIO())
+    return run
+
+
+def case_preview_raster(disc_spec, workdir):
+    from src.preview_worker import render_preview_image
+
+    generator = SVGGenerator()
+
+    def run():
+        ring_segments.cache_clear()
+        generator.ring_cache.clear()
+        render_preview_image(generator.get_disc_layout(disc_spec), PREVIEW_SIZE)
+    return run
+
+
+def case_preview_svg(disc_spec, workdir):
+    # What the SVG preview renderer does: generate the LOD document, then
+    # rasterize it once into the preview widget's pixmap
+    from PySide6.QtCore import QByteArray, QRectF, Qt
+    from PySide6.QtGui import QPainter, QPixmap
+    from PySide6.QtSvg import QSvgRenderer
+    from src.preview_worker import PREVIEW_LOD_MIN_PITCH_PX
+
+    generator = SVGGenerator()
+    min_pitch = PREVIEW_LOD_MIN_PITCH_PX * disc_spec.diameter / PREVIEW_SIZE
+
+    def run():
+        ring_segments.cache_clear()
+        generator.ring_cache.clear()
+        content, _, _ = generator.generate_preview(disc_spec, min_pitch=min_pitch)
+        renderer = QSvgRenderer(QByteArray(content))
+        pixmap = QPixmap(PREVIEW_SIZE, PREVIEW_SIZE)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        renderer.render(painter, QRectF(0, 0, PREVIEW_SIZE, PREVIEW_SIZE))
+        painter.end()
+    return run
+
+
+# name -> (setup(disc_spec, workdir) returning the timed callable, needs a Qt application)
+CASES = {
+    'ring_lines': (case_ring_lines, False),
+    'ring_lines_cached': (case_ring_lines_cached, False),
+    'generate_disc': (case_generate_disc, False),
+    'generate_disc_cached': (case_generate_disc_cached, False),
+    'svg_save': (case_svg_save, False),
+    'pdf_export': (case_pdf_export, False),
+    'preview_raster': (case_preview_raster, True),
+    'preview_svg': (case_preview_svg, True),
+}
@@ -0,0 +1,210 @@
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from src.version import get_version
+
+from .cases import CASES, build_disc_spec, disc_grid
+
+
+# Every case runs at least this many times and for at least this long
+MIN_RUNS = 3
+MIN_TIME_S = 0.5
+MAX_RUNS = 200
+
+# Fast cases are looped until one timing takes at least this long, so
+# timer resolution does not dominate microsecond results
+MIN_TIMING_S = 0.001
+
+# A case whose minimum time grows by more than this fraction is a regression
+DEFAULT_THRESHOLD = 0.15
+
+DEFAULT_RESULTS_FILE = "benchmark-results.json"
+
+
+def time_loops(run, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        run()
+    return time.perf_counter() - start
+
+
+def time_case(run, min_runs=MIN_RUNS, min_time=MIN_TIME_S):
+    """Time a callable after warming it up, return its statistics in ms per call"""
+    loops = 1
+    while time_loops(run, loops) < MIN_TIMING_S:
+        loops *= 10
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MAX_RUNS and (len(timings) < min_runs or time.perf_counter() - started < min_time):
+        timings.append(time_loops(run, loops) * 1000 / loops)
+    return {
+        'min_ms': round(min(timings), 6),
+        'median_ms': round(statistics.median(timings), 6),
+        'mean_ms': round(statistics.fmean(timings), 6),
+        'runs': len(timings),
+        'loops': loops,
+    }
+
+
+def ensure_qt_application():
+    # GUI cases paint offscreen, so they also run without a display
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def run_benchmarks(case_names, discs, patterns=None, min_time=MIN_TIME_S, progress=None):
+    results = {}
+    app = None
+    with tempfile.TemporaryDirectory(prefix="strobodisc-bench-") as workdir:
+        for case_name in case_names:
+            setup, needs_qt = CASES[case_name]
+            for disc_name, parameters in discs:
+                name = f"{case_name}/{disc_name}"
+                if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+                    continue
+                if needs_qt and app is None:
+                    app = ensure_qt_application()
+                results[name] = time_case(setup(build_disc_spec(parameters), workdir), min_time=min_time)
+                if progress:
+                    progress(name, results[name])
+    return results
+
+
+def environment():
+    return {
+        'version': get_version(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def write_results(path, results):
+    data = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Return a (name, baseline ms, current ms, ratio, status) row per case in both files.
+
+    Minimum times are compared, they are the least affected by other load
+    on the machine.
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        before = baseline[name]['min_ms']
+        after = current[name]['min_ms']
+        ratio = after / before if before > 0 else 1.0
+        if ratio > 1 + threshold:
+            status = 'SLOWER'
+        elif ratio < 1 / (1 + threshold):
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def print_comparison(rows, baseline, current, threshold):
+    width = max((len(row[0]) for row in rows), default=10)
+    print(f"{'case':<{width}}  {'baseline':>10}  {'current':>10}  {'ratio':>6}")
+    for name, before, after, ratio, status in rows:
+        print(f"{name:<{width}}  {before:>8.3f}ms  {after:>8.3f}ms  {ratio:>6.2f}  {status}")
+
+    missing = len(set(baseline) - set(current))
+    added = len(set(current) - set(baseline))
+    if missing:
+        print(f"\n{missing} baseline cases were not run")
+    if added:
+        print(f"\n{added} cases have no baseline")
+
+    slower = [row for row in rows if row[4] == 'SLOWER']
+    print(f"\n{len(slower)} of {len(rows)} cases slower than the baseline by more than {threshold:.0%}")
+    return slower
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark disc generation, export and preview rendering."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and save the results as JSON")
+    run_parser.add_argument("-o", "--output", default=DEFAULT_RESULTS_FILE,
+                            help=f"Results file (default: {DEFAULT_RESULTS_FILE})")
+    run_parser.add_argument("-c", "--case", nargs="+", choices=list(CASES), default=list(CASES),
+                            help="Cases to run (default: all)")
+    run_parser.add_argument("-k", "--filter", nargs="+", metavar="PATTERN",
+                            help="Only run benchmarks whose case/disc name matches a glob pattern")
+    grid = run_parser.add_mutually_exclusive_group()
+    grid.add_argument("--quick", action="store_true", help="Small grid, for a fast check")
+    grid.add_argument("--full", action="store_true",
+                      help="Every combination of the grid instead of one axis at a time (slow)")
+    run_parser.add_argument("--min-time", type=float, default=MIN_TIME_S,
+                            help=f"Minimum time spent timing each benchmark, in seconds (default: {MIN_TIME_S})")
+    run_parser.add_argument("--compare", metavar="BASELINE",
+                            help="Compare the results with a baseline file afterwards")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help=f"Slowdown flagged as a regression (default: {DEFAULT_THRESHOLD})")
+
+    compare_parser = commands.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("baseline", help="Baseline results file")
+    compare_parser.add_argument("current", help="Results file to check")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help=f"Slowdown flagged as a regression (default: {DEFAULT_THRESHOLD})")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    try:
+        if args.command == "run":
+            discs = disc_grid(full=args.full, quick=args.quick)
+
+            def progress(name, result):
+                print(f"{name}: {result['min_ms']:.3f} ms (median {result['median_ms']:.3f} ms, "
+                      f"{result['runs']} runs)", file=sys.stderr)
+
+            results = run_benchmarks(args.case, discs, args.filter, args.min_time, progress)
+            write_results(args.output, results)
+            print(f"{len(results)} benchmarks written to {args.output}", file=sys.stderr)
+            if not args.compare:
+                return 0
+            baseline_file, current = args.compare, results
+        else:
+            baseline_file, current = args.baseline, load_results(args.current)
+
+        baseline = load_results(baseline_file)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    rows = compare_results(baseline, current, args.threshold)
+    slower = print_comparison(rows, baseline, current, args.threshold)
+    return 1 if slower else 0
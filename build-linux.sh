@@ -42,7 +42,6 @@ if [ -n "$ICON_PARAM" ]; then
 	--output-dir=dist \
 	--output-filename="multiringstrobodiscgen-v${VERSION}-${ARCH}.bin" \
 	--include-module=svgwrite \
-	--include-module=svglib \
 	--include-module=tempfile \
 	--include-module=reportlab \
 	--include-package=reportlab \
@@ -59,7 +58,6 @@ else
 	--output-dir=dist \
 	--output-filename="multiringstrobodiscgen-v${VERSION}-${ARCH}.bin" \
 	--include-module=svgwrite \
-	--include-module=svglib \
 	--include-module=tempfile \
 	--include-module=reportlab \
 	--include-package=reportlab \
@@ -32,7 +32,6 @@ if ($ICON_PARAM) {
         --output-dir=dist `
         --output-filename="multiringstrobodiscgen-v$VERSION-$ARCH.exe" `
         --include-module=svgwrite `
-        --include-module=svglib `
         --include-module=tempfile `
         --include-module=reportlab `
         --include-package=reportlab `
@@ -46,7 +45,6 @@ if ($ICON_PARAM) {
         --output-dir=dist `
         --output-filename="multiringstrobodiscgen-v$VERSION-$ARCH.exe" `
         --include-module=svgwrite `
-        --include-module=svglib `
         --include-module=tempfile `
         --include-module=reportlab `
         --include-package=reportlab `
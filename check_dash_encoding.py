@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Accuracy check for the dash-array SVG encoding
+Rasterizes a set of test discs with both the explicit geometry and the
+dash-array encoding and compares them ring by ring, then checks that the
+written dash patterns place the last segments before each circle closes
+where the explicit geometry has them. Both checks run at the precisions
+discs are exported with.
+"""
+
+import math
+import os
+import re
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PySide6.QtCore import QByteArray
+from PySide6.QtGui import QGuiApplication, QImage, QPainter, QColor
+from PySide6.QtSvg import QSvgRenderer
+
+from src.presets import disc_spec_from_preset
+from src.svg_generator import SVGGenerator
+from src.svg_writer import ENCODING_ELEMENTS, ENCODING_DASHARRAY, DEFAULT_PRECISION, COMPACT_PRECISION
+
+# Precisions the dash-array encoding is checked at
+PRECISIONS = (DEFAULT_PRECISION, COMPACT_PRECISION)
+
+# Precision of the explicit geometry the dash-array encoding is compared with
+REFERENCE_PRECISION = 6
+
+# Raster size in pixels for a whole disc
+RASTER_SIZE = 2400
+
+# Maximum relative difference in ink coverage per ring
+MAX_COVERAGE_ERROR = 0.05
+
+# Maximum mean absolute pixel difference inside a ring band (0..1)
+MAX_PIXEL_ERROR = 0.08
+
+# Number of segments checked before the point where each dashed circle closes
+SEAM_SEGMENTS = 5
+
+# Maximum distance between a dash and its explicit segment, as a fraction of the pitch
+MAX_SEAM_ERROR = 0.01
+
+DASHED_CIRCLE = re.compile(
+    r'<circle [^>]*r="([^"]+)"[^>]*stroke-dasharray="([^" ]+) ([^"]+)" '
+    r'stroke-dashoffset="([^"]+)" transform="rotate\(([^ ]+) '
+)
+
+TEST_DISC = {
+    'diameter': 200,
+    'spindle_diameter': 7.3,
+    'outer_circle_width': 1.0,
+    'ring_separation': 1.0,
+    'rings': [
+        {'rpm': 33.33, 'hz': 50, 'depth': 8, 'single_mode': True, 'shape_type': 'lines', 'dot_size': 1.0, 'density': 'double'},
+        {'rpm': 45, 'hz': 60, 'depth': 6, 'single_mode': False, 'shape_type': 'lines', 'dot_size': 1.0, 'density': 'double'},
+        {'rpm': 33.33, 'hz': 60, 'depth': 6, 'single_mode': False, 'shape_type': 'dots', 'dot_size': 1.5, 'density': 'normal'},
+        {'rpm': 78, 'hz': 50, 'depth': 5, 'single_mode': True, 'shape_type': 'dots', 'dot_size': 1.0, 'density': 'double'},
+        {'rpm': 16, 'hz': 50, 'depth': 8, 'single_mode': True, 'shape_type': 'lines', 'dot_size': 1.0, 'density': 'normal'},
+        {'rpm': 8, 'hz': 60, 'depth': 5, 'single_mode': False, 'shape_type': 'lines', 'dot_size': 1.0, 'density': 'normal'},
+    ]
+}
+
+# Thousands of segments near the edge of a large disc, where any rounding of
+# the dash pattern adds up to whole segments before the circle closes. Its
+# segments are too fine for RASTER_SIZE, so it only gets the seam check.
+DENSE_DISC = {
+    'diameter': 300,
+    'spindle_diameter': 7.3,
+    'outer_circle_width': 1.0,
+    'ring_separation': 1.0,
+    'rings': [
+        {'rpm': 1, 'hz': 60, 'depth': 8, 'single_mode': True, 'shape_type': 'lines', 'dot_size': 1.0, 'density': 'double'},
+        {'rpm': 2, 'hz': 60, 'depth': 8, 'single_mode': True, 'shape_type': 'lines', 'dot_size': 1.0, 'density': 'double'},
+        {'rpm': 5, 'hz': 50, 'depth': 6, 'single_mode': True, 'shape_type': 'dots', 'dot_size': 1.0, 'density': 'double'},
+    ]
+}
+
+
+def rasterize(svg_data, size):
+    renderer = QSvgRenderer(QByteArray(svg_data))
+    image = QImage(size, size, QImage.Format.Format_Grayscale8)
+    image.fill(QColor('white'))
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    renderer.render(painter)
+    painter.end()
+
+    pixels = np.frombuffer(image.constBits(), dtype=np.uint8)
+    pixels = pixels.reshape(size, image.bytesPerLine())[:, :size]
+    # Ink coverage: 1 for black, 0 for white
+    return 1 - pixels.astype(np.float64) / 255
+
+
+def ring_bands(layout):
+    for segment_sets in layout['rings']:
+        radii = []
+        for segment_set in segment_sets:
+            if segment_set['shape_type'] == 'lines':
+                radii += [segment_set['start_radius'], segment_set['end_radius']]
+            else:
+                radii += [segment_set['position_radius'] - segment_set['radius'],
+                          segment_set['position_radius'] + segment_set['radius']]
+        yield min(radii), max(radii)
+
+
+def segment_angles(segment_set):
+    """Angles of the explicit segment centres, clockwise from 3 o'clock in degrees"""
+    if segment_set['shape_type'] == 'lines':
+        x = (segment_set['x1'] + segment_set['x2']) / 2
+        y = (segment_set['y1'] + segment_set['y2']) / 2
+    else:
+        x, y = segment_set['cx'], segment_set['cy']
+    center_x, center_y = segment_set['center']
+    return np.degrees(np.arctan2(y - center_y, x - center_x))
+
+
+def seam_error(segment_set, dashed_circle):
+    """Largest distance, in pitches, between the last dashes and their explicit segments.
+
+    The circle path starts at 3 o'clock, turned by the rotation, and dash
+    k (counted from 1) is drawn for segment k - 1, so an error in the
+    pattern grows with k and is largest just before the circle closes.
+    """
+    radius, dash, gap, offset, rotation = (float(value) for value in dashed_circle)
+    num_segments = segment_set['num_segments']
+    explicit = segment_angles(segment_set)
+    pitch = 2 * math.pi * radius / num_segments
+
+    error = 0
+    for k in range(num_segments - SEAM_SEGMENTS + 1, num_segments + 1):
+        centre = k * (dash + gap) - offset + dash / 2
+        angle = rotation + math.degrees(centre / radius)
+        difference = (angle - explicit[k - 1] + 180) % 360 - 180
+        error = max(error, abs(math.radians(difference)) * radius / pitch)
+    return error
+
+
+def check_seams(disc, precision):
+    disc_spec = disc_spec_from_preset(disc)
+    generator = SVGGenerator()
+    layout = generator.build_disc_layout(disc_spec)
+    svg_data = generator.generate_disc(disc_spec, encoding=ENCODING_DASHARRAY, precision=precision)
+    dashed_circles = iter(DASHED_CIRCLE.findall(svg_data.decode('utf-8')))
+
+    failures = 0
+    for index, segment_sets in enumerate(layout['rings']):
+        errors = [seam_error(segment_set, next(dashed_circles)) for segment_set in segment_sets]
+        ok = max(errors) <= MAX_SEAM_ERROR
+        failures += not ok
+
+        counts = "/".join(str(segment_set['num_segments']) for segment_set in segment_sets)
+        print(f"Ring {index + 1} seam ({counts} segments): last dashes off by "
+              f"{max(errors):.2%} of a segment {'✓' if ok else '✗'}")
+
+    return failures
+
+
+def check_disc(disc, precision):
+    # The spec comes straight from the preset, no main window (and no user
+    # config or presets store) is involved
+    disc_spec = disc_spec_from_preset(disc)
+    generator = SVGGenerator()
+    layout = generator.build_disc_layout(disc_spec)
+
+    # The explicit geometry, at a precision well beyond the raster, is the reference
+    explicit_data = generator.generate_disc(disc_spec, encoding=ENCODING_ELEMENTS, precision=REFERENCE_PRECISION)
+    dashed_data = generator.generate_disc(disc_spec, encoding=ENCODING_DASHARRAY, precision=precision)
+    explicit_raster = rasterize(explicit_data, RASTER_SIZE)
+    dashed_raster = rasterize(dashed_data, RASTER_SIZE)
+
+    scale = RASTER_SIZE / layout['diameter']
+    coordinates = (np.arange(RASTER_SIZE) + 0.5) / scale - layout['diameter'] / 2
+    radius = np.hypot(coordinates[np.newaxis, :], coordinates[:, np.newaxis])
+
+    failures = 0
+    for index, (inner, outer) in enumerate(ring_bands(layout)):
+        band = (radius >= inner) & (radius <= outer)
+        explicit = explicit_raster[band]
+        dashed = dashed_raster[band]
+
+        coverage_error = abs(dashed.mean() - explicit.mean()) / max(explicit.mean(), 1e-9)
+        pixel_error = np.abs(dashed - explicit).mean()
+        ok = coverage_error <= MAX_COVERAGE_ERROR and pixel_error <= MAX_PIXEL_ERROR
+        failures += not ok
+
+        print(f"Ring {index + 1}: coverage {explicit.mean():.4f} vs {dashed.mean():.4f} "
+              f"(error {coverage_error:.2%}), pixel error {pixel_error:.4f} "
+              f"{'✓' if ok else '✗'}")
+
+    return failures
+
+
+def main():
+    app = QGuiApplication(sys.argv)
+
+    failures = 0
+    for precision in PRECISIONS:
+        print(f"Test disc, precision {precision}")
+        failures += check_disc(TEST_DISC, precision)
+        failures += check_seams(TEST_DISC, precision)
+        print(f"\nDense disc, precision {precision}")
+        failures += check_seams(DENSE_DISC, precision)
+        print()
+
+    if failures:
+        print(f"{failures} check(s) outside tolerance")
+        sys.exit(1)
+    print("Dash-array encoding matches the explicit geometry")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Batch disc exporter
+
+Exports many discs in one go: every selected preset (saved in the app's
+config or given as preset files), optionally expanded over several
+diameters and mains frequencies, in SVG and/or PDF. The discs are spread
+over a process pool and a manifest.json recording each output file, its
+timing and any failure is written next to them:
+
+    python -m src.batch_export --config-presets -o out/
+    python -m src.batch_export a.json b.json -o out/ --diameter 175 300 --hz 50 60 -f svg pdf
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+
+from .config_manager import ConfigManager
+from .presets import load_preset_file, disc_spec_from_preset, check_number
+from .svg_generator import SVGGenerator
+from .svg_writer import ENCODINGS, ENCODING_ELEMENTS
+from .version import get_full_title
+
+
+FORMATS = ("svg", "pdf")
+PAGE_SIZE_NAMES = ("A4", "Letter", "Legal", "A3")
+MANIFEST_NAME = "manifest.json"
+
+# One generator per worker process, created once instead of per job. Jobs
+# go to whichever process is free, so they should not count on sharing
+# its ring cache
+_worker_generator = None
+
+
+def _init_worker():
+    global _worker_generator
+    _worker_generator = SVGGenerator()
+
+
+def export_disc(generator, disc_spec, file_path, file_format="svg",
+                encoding=ENCODING_ELEMENTS, precision=None, page_size="A4"):
+    if file_format == "svg":
+        generator.generate_disc(disc_spec, encoding=encoding, precision=precision, filename=file_path)
+        return
+
+    # reportlab is only needed (and imported) for PDF output
+    from .pdf_export import export_pdf
+
+    export_pdf(generator.get_disc_layout(disc_spec), file_path, page_size)
+
+
+def run_job(job):
+    """Export one disc inside a worker process and report how it went"""
+    start = time.perf_counter()
+    result = dict(job['entry'])
+    try:
+        export_disc(
+            _worker_generator, job['disc_spec'], job['path'], job['entry']['format'],
+            job['encoding'], job['precision'], job['page_size']
+        )
+        result['status'] = 'ok'
+        result['size'] = os.path.getsize(job['path'])
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    result['pid'] = os.getpid()
+    return result
+
+
+def number(text):
+    # Keep whole numbers as ints so "150" exports exactly like a preset saying 150
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def file_stem(name):
+    stem = re.sub(r'[^\w\-]+', '_', name, flags=re.UNICODE).strip('_')
+    return stem or 'preset'
+
+
+def format_number(value):
+    return f"{value:g}"
+
+
+def validate_overrides(args):
+    # Overrides replace values disc_spec_from_preset already checked, so
+    # they get the same checks before any job is submitted
+    for diameter in args.diameter or []:
+        check_number(diameter, "--diameter")
+    for hz in args.hz or []:
+        check_number(hz, "--hz")
+
+
+def with_overrides(disc_spec, diameter=None, hz=None):
+    if diameter is not None:
+        disc_spec = dataclasses.replace(disc_spec, diameter=diameter)
+    if hz is not None:
+        rings = tuple(dataclasses.replace(ring, hz=hz) for ring in disc_spec.rings)
+        disc_spec = dataclasses.replace(disc_spec, rings=rings)
+    return disc_spec
+
+
+def collect_presets(args):
+    """Return (name, preset data) pairs from the config and the preset files"""
+    presets = []
+
+    if args.config_presets is not None:
+        store = ConfigManager().preset_store()
+        for name in args.config_presets or store.names():
+            preset_data = store.get(name)
+            if preset_data is None:
+                raise ValueError(f"No saved preset named '{name}'")
+            presets.append((name, preset_data))
+
+    for path in args.presets:
+        presets.append((Path(path).stem, load_preset_file(path)))
+
+    if not presets:
+        raise ValueError("No presets given (pass preset files and/or --config-presets)")
+    return presets
+
+
+def build_jobs(args, presets, output_dir):
+    jobs = []
+    failures = []
+    used_stems = set()
+
+    diameters = args.diameter or [None]
+    frequencies = args.hz or [None]
+
+    for name, preset_data in presets:
+        try:
+            base_spec = disc_spec_from_preset(preset_data)
+        except (ValueError, KeyError, TypeError) as e:
+            failures.append({'preset': name, 'status': 'failed', 'error': f"{type(e).__name__}: {e}"})
+            continue
+
+        for diameter, hz, file_format in product(diameters, frequencies, args.format):
+            disc_spec = with_overrides(base_spec, diameter, hz)
+
+            stem = file_stem(name)
+            if diameter is not None:
+                stem += f"_{format_number(diameter)}mm"
+            if hz is not None:
+                stem += f"_{format_number(hz)}Hz"
+            # Two presets may slugify to the same name, never overwrite
+            unique_stem, counter = stem, 2
+            while (unique_stem, file_format) in used_stems:
+                unique_stem = f"{stem}_{counter}"
+                counter += 1
+            used_stems.add((unique_stem, file_format))
+            file_name = f"{unique_stem}.{file_format}"
+
+            jobs.append({
+                'entry': {
+                    'preset': name,
+                    'diameter': disc_spec.diameter,
+                    'hz': hz,
+                    'format': file_format,
+                    'file': file_name
+                },
+                'disc_spec': disc_spec,
+                'path': str(output_dir / file_name),
+                'encoding': args.encoding,
+                'precision': args.precision,
+                'page_size': args.page_size
+            })
+
+    return jobs, failures
+
+
+def run_batch(jobs, workers=None, progress=None):
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. killed), not just the export
+                result = dict(futures[future]['entry'])
+                result['status'] = 'failed'
+                result['error'] = f"{type(e).__name__}: {e}"
+            results.append(result)
+            if progress:
+                progress(len(results), len(jobs), result)
+
+    # Keep the manifest in job order, not completion order
+    order = {job['entry']['file']: index for index, job in enumerate(jobs)}
+    results.sort(key=lambda result: order[result['file']])
+    return results
+
+
+def write_manifest(output_dir, results, elapsed, workers):
+    manifest = {
+        'generator': get_full_title(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'workers': workers,
+        'seconds': round(elapsed, 4),
+        'total': len(results),
+        'failed': sum(1 for result in results if result['status'] != 'ok'),
+        'outputs': results
+    }
+    manifest_path = output_dir / MANIFEST_NAME
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest_path
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.batch_export",
+        description=f"{get_full_title()} - batch exporter"
+    )
+    parser.add_argument("presets", nargs="*", help="preset JSON files")
+    parser.add_argument("--config-presets", nargs="*", metavar="NAME",
+                        help="presets saved in the app (all of them when no name is given)")
+    parser.add_argument("-o", "--output-dir", default=".",
+                        help="directory for the discs and the manifest (default: current)")
+    parser.add_argument("-f", "--format", nargs="+", choices=FORMATS, default=["svg"],
+                        help="output format(s) (default: svg)")
+    parser.add_argument("--diameter", nargs="+", type=number, metavar="MM",
+                        help="export every preset at each of these disc diameters")
+    parser.add_argument("--hz", nargs="+", type=number,
+                        help="export every preset for each of these mains frequencies")
+    parser.add_argument("--encoding", choices=ENCODINGS, default=ENCODING_ELEMENTS,
+                        help="SVG encoding of the rings (default: %(default)s)")
+    parser.add_argument("--precision", type=int,
+                        help="number of decimals for SVG coordinates")
+    parser.add_argument("--page-size", choices=PAGE_SIZE_NAMES, default="A4",
+                        help="PDF page size (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: all cores)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        validate_overrides(args)
+        presets = collect_presets(args)
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    jobs, failures = build_jobs(args, presets, output_dir)
+    workers = max(1, min(args.jobs or 1, len(jobs) or 1))
+
+    def progress(done, total, result):
+        status = "ok" if result['status'] == 'ok' else f"FAILED ({result['error']})"
+        print(f"[{done}/{total}] {result['file']}: {status}", file=sys.stderr)
+
+    start = time.perf_counter()
+    results = failures + (run_batch(jobs, workers, progress) if jobs else [])
+    elapsed = time.perf_counter() - start
+
+    manifest_path = write_manifest(output_dir, results, elapsed, workers)
+    failed = sum(1 for result in results if result['status'] != 'ok')
+    print(f"{len(results) - failed} of {len(results)} discs exported in {elapsed:.2f} s, "
+          f"manifest: {manifest_path}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Headless disc generator
+
+Generates a disc from a preset JSON file (the same schema the Presets tab
+saves). SVG and PDF output never import Qt, so they run on machines without
+a display; PNG/TIFF output paints with Qt on its offscreen platform:
+
+    python -m src.cli preset.json -o disc.svg
+    python -m src.cli preset.json -o disc.pdf --page-size Letter
+    python -m src.cli preset.json -o disc.tif --dpi 2400
+    cat preset.json | python -m src.cli - --encoding paths > disc.svg
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from .presets import load_preset_file, disc_spec_from_preset
+from .svg_generator import SVGGenerator
+from .svg_writer import ENCODINGS, ENCODING_ELEMENTS
+from .version import get_full_title
+
+
+FORMATS = ("svg", "pdf", "png", "tiff")
+RASTER_EXTENSIONS = {".png": "png", ".tif": "tiff", ".tiff": "tiff"}
+PAGE_SIZE_NAMES = ("A4", "Letter", "Legal", "A3")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description=f"{get_full_title()} - headless generator"
+    )
+    parser.add_argument("preset", help="preset JSON file, or - to read it from stdin")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file, or - for stdout (default)")
+    parser.add_argument("-f", "--format", choices=FORMATS,
+                        help="output format (default: from the output extension, else svg)")
+    parser.add_argument("--encoding", choices=ENCODINGS, default=ENCODING_ELEMENTS,
+                        help="SVG encoding of the rings (default: %(default)s)")
+    parser.add_argument("--precision", type=int,
+                        help="number of decimals for SVG coordinates")
+    parser.add_argument("--validated", action="store_true",
+                        help="build the SVG through svgwrite with profile validation")
+    parser.add_argument("--page-size", choices=PAGE_SIZE_NAMES, default="A4",
+                        help="PDF page size (default: %(default)s)")
+    parser.add_argument("--dpi", type=int, default=1200,
+                        help="PNG/TIFF resolution in pixels per inch (default: %(default)s)")
+    return parser
+
+
+def read_preset(source):
+    if source == "-":
+        return json.load(sys.stdin)
+    return load_preset_file(source)
+
+
+def output_format(args):
+    if args.format:
+        return args.format
+    if args.output != "-":
+        extension = os.path.splitext(args.output)[1].lower()
+        if extension == ".pdf":
+            return "pdf"
+        if extension in RASTER_EXTENSIONS:
+            return RASTER_EXTENSIONS[extension]
+    return "svg"
+
+
+def generate(args):
+    preset = read_preset(args.preset)
+    disc_spec = disc_spec_from_preset(preset)
+    generator = SVGGenerator()
+
+    file_format = output_format(args)
+
+    if file_format == "svg":
+        if args.output == "-":
+            svg_content = generator.generate_disc(
+                disc_spec, validated=args.validated,
+                encoding=args.encoding, precision=args.precision
+            )
+            sys.stdout.buffer.write(svg_content)
+            sys.stdout.buffer.flush()
+        else:
+            generator.generate_disc(
+                disc_spec, validated=args.validated,
+                encoding=args.encoding, precision=args.precision, filename=args.output
+            )
+        return
+
+    if file_format in ("png", "tiff"):
+        export_image(generator.get_disc_layout(disc_spec), args, file_format)
+        return
+
+    # reportlab is only needed (and imported) for PDF output
+    from .pdf_export import export_pdf
+
+    layout = generator.get_disc_layout(disc_spec)
+    if args.output == "-":
+        export_pdf(layout, sys.stdout.buffer, args.page_size)
+        sys.stdout.buffer.flush()
+    else:
+        export_pdf(layout, args.output, args.page_size)
+
+
+def export_image(layout, args, file_format):
+    if args.output == "-":
+        raise ValueError("PNG/TIFF output needs an output file (-o)")
+    if args.dpi <= 0:
+        raise ValueError("--dpi must be positive")
+
+    # Qt is only needed (and imported) for raster output
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtGui import QGuiApplication
+    from .raster_export import export_raster
+
+    # Text rendering needs an application object, kept alive while painting
+    app = QGuiApplication.instance() or QGuiApplication([])
+    export_raster(layout, args.output, args.dpi, file_format)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        generate(args)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
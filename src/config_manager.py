@@ -1,14 +1,22 @@
+import os
 import sys
 import json
 import locale
+import tempfile
 from pathlib import Path
 
+from .preset_store import PresetStore
+from .startup import profile_span
+
 
 class ConfigManager:
     def __init__(self):
-        self.config_dir = self._get_config_dir()
+        with profile_span("config directory"):
+            self.config_dir = self._get_config_dir()
         self.config_file = self.config_dir / "config.json"
+        self.presets_file = self.config_dir / "presets.sqlite3"
         self.config = self._load_config()
+        self._preset_store = None
     
     def _get_config_dir(self):
         if sys.platform == "win32":
@@ -20,13 +28,14 @@ class ConfigManager:
         return config_dir
     
     def _load_config(self):
-        default_config = {
-            "language": self._detect_language()
-        }
+        with profile_span("detect language"):
+            default_config = {
+                "language": self._detect_language()
+            }
         
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
+                with open(self.config_file, 'r', encoding='utf-8') as f, profile_span("load config"):
                     config = json.load(f)
                     # Ensure all default keys exist
                     for key, value in default_config.items():
@@ -48,11 +57,43 @@ class ConfigManager:
         return 'en'
     
     def save_config(self):
+        """Write the config, returns False when it could not be written"""
+        # Written to a temporary file that then replaces the config, so a
+        # crash mid-write never leaves a truncated config.json behind
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            fd, temp_path = tempfile.mkstemp(dir=self.config_dir, prefix=".config-", suffix=".json")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(self.config, f, indent=2, ensure_ascii=False)
+                os.replace(temp_path, self.config_file)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
         except OSError:
-            pass
+            return False
+        return True
+    
+    def preset_store(self):
+        """The saved presets, opened on first use.
+
+        Presets kept in config.json by older versions are moved into the
+        store the first time it is opened.
+        """
+        if self._preset_store is None:
+            self._preset_store = PresetStore(self.presets_file)
+            legacy_presets = self.config.get('presets')
+            # Anything but a name -> preset dictionary was not written by
+            # the app, it is left alone rather than guessed at
+            if isinstance(legacy_presets, dict):
+                # Stored presets win, and the store remembers the import,
+                # so an interrupted migration never overwrites or brings
+                # back presets changed or deleted after it
+                self._preset_store.import_legacy_presets(legacy_presets.items())
+                # Dropped from the config only once it is saved without them
+                del self.config['presets']
+                if not self.save_config():
+                    self.config['presets'] = legacy_presets
+        return self._preset_store
     
     def get(self, key, default=None):
         return self.config.get(key, default)
@@ -0,0 +1,213 @@
+"""
+Pure disc computation core
+
+Immutable, hashable value objects describing a disc and the layout of its
+rings. Nothing here touches Qt, so specs can be cached, used as keys and
+shared freely between threads and processes.
+"""
+
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+
+# Number of distinct ring segment calculations kept by ring_segments()
+RING_SEGMENTS_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class RingSpec:
+    rpm: float = 33.33
+    hz: float = 60.0
+    depth: float = 8.0
+    single_mode: bool = True
+    shape_type: str = 'lines'
+    dot_size: float = 1.0
+    density: str = 'double'
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Build a spec from a RingSettings.get_settings() / preset ring dict"""
+        defaults = cls()
+        return cls(
+            rpm=float(settings.get('rpm', defaults.rpm)),
+            hz=float(settings.get('hz', defaults.hz)),
+            depth=float(settings.get('depth', defaults.depth)),
+            single_mode=bool(settings.get('single_mode', defaults.single_mode)),
+            shape_type=settings.get('shape_type', defaults.shape_type),
+            dot_size=float(settings.get('dot_size', defaults.dot_size)),
+            density=settings.get('density', defaults.density)
+        )
+
+    def to_settings(self):
+        return {
+            'rpm': self.rpm,
+            'hz': self.hz,
+            'depth': self.depth,
+            'single_mode': self.single_mode,
+            'shape_type': self.shape_type,
+            'dot_size': self.dot_size,
+            'density': self.density
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class DiscSpec:
+    diameter: float = 150
+    spindle_diameter: float = 7.3
+    outer_circle_width: float = 1.0
+    ring_separation: float = 1.0
+    rings: tuple = field(default_factory=tuple)
+    text_top: str = ''
+    text_bottom: str = ''
+
+    @classmethod
+    def from_preset(cls, preset_data):
+        """Build a spec from a preset (the get_current_settings() schema)"""
+        defaults = cls()
+        return cls(
+            diameter=preset_data.get('diameter', defaults.diameter),
+            spindle_diameter=preset_data.get('spindle_diameter', defaults.spindle_diameter),
+            outer_circle_width=preset_data.get('outer_circle_width', defaults.outer_circle_width),
+            ring_separation=preset_data.get('ring_separation', defaults.ring_separation),
+            rings=tuple(RingSpec.from_settings(ring) for ring in preset_data.get('rings', [])),
+            text_top=preset_data.get('text_top', defaults.text_top),
+            text_bottom=preset_data.get('text_bottom', defaults.text_bottom)
+        )
+
+    def to_preset(self):
+        return {
+            'rings': [ring.to_settings() for ring in self.rings],
+            'diameter': self.diameter,
+            'spindle_diameter': self.spindle_diameter,
+            'outer_circle_width': self.outer_circle_width,
+            'ring_separation': self.ring_separation,
+            'text_top': self.text_top,
+            'text_bottom': self.text_bottom
+        }
+
+    @property
+    def center(self):
+        return (self.diameter / 2, self.diameter / 2)
+
+
+@dataclass(frozen=True, slots=True)
+class RingLayout:
+    """Where a ring ends up on the disc; also the key of its cached geometry"""
+    spec: RingSpec
+    center: tuple
+    outer_radius: float
+    inner_radius: float
+    depth: float
+
+
+@dataclass(frozen=True, slots=True)
+class RingSegments:
+    """Segment counts and line widths of a ring, with the speed each count is exact for.
+
+    In single mode only the outer fields are used.
+    """
+    mode: str
+    num_lines_exact: float
+    outer_num_lines: int
+    outer_line_width: float
+    outer_rpm: float
+    inner_num_lines: int = 0
+    inner_line_width: float = 0.0
+    inner_rpm: float = 0.0
+
+
+def lines_to_rpm(num_lines, hz, density):
+    density_factor = 2 if density == "double" else 1
+    return round((60 * hz * density_factor) / num_lines, 3)
+
+
+@lru_cache(maxsize=RING_SEGMENTS_CACHE_SIZE)
+def ring_segments(rpm, hz, density, single_mode, radius, ring_depth):
+    """Work out the segment count(s) and line width(s) of a ring at a given radius.
+
+    Memoized: the ring information labels and the generator both ask for
+    the same rings, the calculation runs once per distinct ring.
+    """
+    density_factor = 2 if density == "double" else 1
+    num_lines_exact = (60 * hz) / rpm * density_factor
+
+    num_lines_floor = math.floor(num_lines_exact)
+    num_lines_ceil = math.ceil(num_lines_exact)
+
+    if num_lines_floor == num_lines_ceil or single_mode:
+        if num_lines_floor == num_lines_ceil:
+            num_lines = num_lines_floor
+        else:
+            num_lines = round(num_lines_exact)
+
+        circumference = 2 * math.pi * radius
+        line_width = circumference / (num_lines * 2)
+
+        return RingSegments('single', num_lines_exact, num_lines, line_width, lines_to_rpm(num_lines, hz, density))
+
+    outer_circumference = 2 * math.pi * radius
+    inner_circumference = 2 * math.pi * (radius - ring_depth)
+
+    outer_line_width = outer_circumference / (num_lines_floor * 2)
+    inner_line_width = inner_circumference / (num_lines_ceil * 2)
+
+    return RingSegments(
+        'double', num_lines_exact,
+        num_lines_floor, outer_line_width, lines_to_rpm(num_lines_floor, hz, density),
+        num_lines_ceil, inner_line_width, lines_to_rpm(num_lines_ceil, hz, density)
+    )
+
+
+def calculate_ring_lines(spec, radius, ring_depth):
+    """Return the segments of a ring as the dict compute_ring_geometry takes"""
+    segments = ring_segments(spec.rpm, spec.hz, spec.density, spec.single_mode, radius, ring_depth)
+
+    if segments.mode == 'single':
+        return {
+            'mode': 'single',
+            'num_lines': segments.outer_num_lines,
+            'line_width': segments.outer_line_width,
+            'shape_type': spec.shape_type,
+            'dot_size': spec.dot_size
+        }
+
+    return {
+        'mode': 'double',
+        'outer_num_lines': segments.outer_num_lines,
+        'outer_line_width': segments.outer_line_width,
+        'inner_num_lines': segments.inner_num_lines,
+        'inner_line_width': segments.inner_line_width,
+        'shape_type': spec.shape_type,
+        'dot_size': spec.dot_size
+    }
+
+
+def layout_disc(disc_spec):
+    """Place the rings from the outside in, returning (outer circle, ring layouts).
+
+    The outer circle is a (radius, stroke width) pair, or None when the disc
+    has no outer circle.
+    """
+    outer_circle_width = disc_spec.outer_circle_width
+    spindle_radius = disc_spec.spindle_diameter / 2
+    center = disc_spec.center
+
+    disc_radius = disc_spec.diameter / 2 - (outer_circle_width / 2 if outer_circle_width > 0 else 0)
+    current_radius = disc_radius - (outer_circle_width / 2 if outer_circle_width > 0 else 0)
+
+    ring_layouts = []
+    for spec in disc_spec.rings:
+        ring_depth = spec.depth
+        inner_radius = current_radius - ring_depth
+
+        if inner_radius < spindle_radius:
+            inner_radius = spindle_radius
+            ring_depth = current_radius - inner_radius
+
+        ring_layouts.append(RingLayout(spec, center, current_radius, inner_radius, ring_depth))
+
+        current_radius = inner_radius - disc_spec.ring_separation
+
+    outer_circle = (disc_radius, outer_circle_width) if outer_circle_width > 0 else None
+    return outer_circle, tuple(ring_layouts)
@@ -0,0 +1,114 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=128)
+def angle_table(num_segments):
+    """Return read-only (sin, cos) arrays for num_segments equally spaced angles.
+
+    Angles start at 12 o'clock and advance clockwise, so rings with the same
+    segment count share one table regardless of their radius.
+    """
+    angles = np.arange(num_segments) * (2 * math.pi / num_segments)
+    sin_table = np.sin(angles)
+    cos_table = np.cos(angles)
+    sin_table.flags.writeable = False
+    cos_table.flags.writeable = False
+    return sin_table, cos_table
+
+
+def _line_set(center, num_lines, line_width, start_radius, end_radius):
+    sin_table, cos_table = angle_table(num_lines)
+    return {
+        'shape_type': 'lines',
+        'center': center,
+        'num_segments': num_lines,
+        'width': line_width,
+        'start_radius': start_radius,
+        'end_radius': end_radius,
+        'x1': center[0] + start_radius * sin_table,
+        'y1': center[1] - start_radius * cos_table,
+        'x2': center[0] + end_radius * sin_table,
+        'y2': center[1] - end_radius * cos_table,
+    }
+
+
+def _dot_set(center, num_dots, line_width, dot_size, dot_radius_position):
+    sin_table, cos_table = angle_table(num_dots)
+    return {
+        'shape_type': 'dots',
+        'center': center,
+        'num_segments': num_dots,
+        'width': line_width,
+        'position_radius': dot_radius_position,
+        'radius': (line_width / 2) * dot_size,
+        'cx': center[0] + dot_radius_position * sin_table,
+        'cy': center[1] - dot_radius_position * cos_table,
+    }
+
+
+def compute_ring_geometry(lines_info, center, current_radius, inner_radius, ring_depth):
+    """Build every segment of a ring as NumPy arrays in one call.
+
+    Returns a list of segment sets (one for single rings, outer and inner for
+    double rings). Line sets carry x1/y1/x2/y2 endpoint arrays and a stroke
+    width; dot sets carry cx/cy centre arrays and a dot radius.
+    """
+    shape_type = lines_info['shape_type']
+    dot_size = lines_info['dot_size']
+
+    if lines_info['mode'] == 'single':
+        num_lines = lines_info['num_lines']
+        line_width = lines_info['line_width']
+        if shape_type == 'lines':
+            return [_line_set(center, num_lines, line_width, current_radius, inner_radius)]
+        mid_radius = (current_radius + inner_radius) / 2
+        return [_dot_set(center, num_lines, line_width, dot_size, mid_radius)]
+
+    outer_num_lines = lines_info['outer_num_lines']
+    outer_line_width = lines_info['outer_line_width']
+    inner_num_lines = lines_info['inner_num_lines']
+    inner_line_width = lines_info['inner_line_width']
+
+    if shape_type == 'lines':
+        mid_radius = current_radius - ring_depth / 2
+        return [
+            _line_set(center, outer_num_lines, outer_line_width, current_radius, mid_radius),
+            _line_set(center, inner_num_lines, inner_line_width, mid_radius, inner_radius),
+        ]
+
+    return [
+        _dot_set(center, outer_num_lines, outer_line_width, dot_size, current_radius - ring_depth / 4),
+        _dot_set(center, inner_num_lines, inner_line_width, dot_size, inner_radius + ring_depth / 4),
+    ]
+
+
+def segment_set_pitch(segment_set):
+    """Return the distance between neighbouring segments along the set's outer edge"""
+    if segment_set['shape_type'] == 'lines':
+        outer_radius = max(segment_set['start_radius'], segment_set['end_radius'])
+    else:
+        outer_radius = segment_set['position_radius'] + segment_set['radius']
+    return 2 * math.pi * outer_radius / segment_set['num_segments']
+
+
+def segment_set_annulus(segment_set):
+    """Return the (radius, width, coverage) of the annulus a segment set sweeps.
+
+    Coverage is the fraction of the annulus covered by the segments, the grey
+    level the set averages to once they are too small to tell apart.
+    """
+    num_segments = segment_set['num_segments']
+    if segment_set['shape_type'] == 'lines':
+        radius = (segment_set['start_radius'] + segment_set['end_radius']) / 2
+        width = abs(segment_set['start_radius'] - segment_set['end_radius'])
+        # Lines have a constant width, their area over the annulus area
+        coverage = num_segments * segment_set['width'] / (2 * math.pi * radius)
+    else:
+        radius = segment_set['position_radius']
+        dot_radius = segment_set['radius']
+        width = 2 * dot_radius
+        coverage = num_segments * math.pi * dot_radius ** 2 / (2 * math.pi * radius * width)
+    return radius, width, min(coverage, 1.0)
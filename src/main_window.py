@@ -1,59 +1,112 @@
 import os
-import tempfile
+import time
+from contextlib import contextmanager
+from importlib.util import find_spec
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QScrollArea, QSpinBox, QDoubleSpinBox, QFileDialog, QComboBox, 
-    QMessageBox, QTabWidget, QApplication, QInputDialog, QListWidget, 
-    QListWidgetItem, QTextEdit, QRadioButton, QButtonGroup
+    QSpinBox, QDoubleSpinBox, QFileDialog, QComboBox, 
+    QMessageBox, QTabWidget, QApplication, QInputDialog, 
+    QTextEdit, QRadioButton, QButtonGroup, QProgressDialog
 )
-from PySide6.QtCore import Qt, QSize, QTimer
-from PySide6.QtSvgWidgets import QSvgWidget
-from PySide6.QtGui import QResizeEvent, QGuiApplication
+from PySide6.QtCore import Qt, QSize, QTimer, QThreadPool, Signal
+from PySide6.QtGui import QResizeEvent, QGuiApplication, QImage
 
-# For PDF export (only import when needed to avoid dependency issues)
-try:
-    from svglib.svglib import svg2rlg
-    from reportlab.graphics import renderPDF
-    from reportlab.lib.pagesizes import A4, LETTER, LEGAL, A3
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
+# reportlab is only imported on the first PDF export, it is slow to load
+# and most sessions never need it; find_spec checks for it without importing
+PDF_AVAILABLE = find_spec('reportlab') is not None
 
 from .config_manager import ConfigManager
+from .startup import profile_span
 from .translations import TRANSLATIONS
-from .ring_settings import RingSettings
-from .svg_generator import SVGGenerator
+from .disc_spec import DiscSpec, RingSpec, layout_disc
+from .svg_generator import SVGGenerator, GenerationCancelled
+from .raster_export import export_raster, DEFAULT_DPI
+from .presets_view import PresetListModel, PresetItemDelegate, PresetListView
+from .rings_view import RingListModel, RingItemDelegate, RingListView
+from .preview_widget import PreviewWidget
+from .preview_worker import (
+    PreviewJob, PreviewSignals, AdaptiveDebounce, PREVIEW_DEBOUNCE_MIN_MS, PREVIEW_DEBOUNCE_MAX_MS,
+    PREVIEW_DETAIL_DELAY_MS, PREVIEW_RENDERER_RASTER, PREVIEW_RENDERER_SVG
+)
+from .svg_writer import ENCODING_ELEMENTS, ENCODING_PATHS, ENCODING_DASHARRAY, COMPACT_PRECISION
+from .theme import STYLESHEET
 
 
 # Constants for sizes
 PREVIEW_PANEL_MARGIN_WIDTH = 20
 PREVIEW_PANEL_MARGIN_HEIGHT = 20
+PREVIEW_MIN_SIZE = 300
+
+# Minimum interval between preview size updates while the window is resized (in ms)
+PREVIEW_RESIZE_THROTTLE_MS = 50
 
 
 class StroboscopeMultiRingsGenerator(QMainWindow):
+    # Emitted with the generation once its preview is on screen, stale results never are
+    preview_displayed = Signal(int)
+    
     def __init__(self):
         super().__init__()
         
-        self.config_manager = ConfigManager()
+        with profile_span("ConfigManager"):
+            self.config_manager = ConfigManager()
         self.current_language = self.config_manager.get('language', 'en')
         
         self.setWindowTitle(self.tr('app_title'))
         self.setMinimumSize(1000, 700)
-        self.svg_content = ""
-        self.temp_dir = tempfile.TemporaryDirectory()
-        self.temp_svg_file = None
+        self.svg_content = b""
+        self.preview_image = None
         
-        self.ring_widgets = []
         self.svg_generator = SVGGenerator()
         
         self.update_timer = QTimer()
         self.update_timer.setSingleShot(True)
         self.update_timer.timeout.connect(self.generate_disc)
         
+        # Inside bulk_update() edits only mark the preview as stale
+        self.bulk_update_depth = 0
+        self.bulk_update_pending = False
+        
+        self.resize_timer = QTimer()
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(PREVIEW_RESIZE_THROTTLE_MS)
+        self.resize_timer.timeout.connect(self.adjust_preview_size)
+        
+        # Previews are generated on a worker thread. Every edit bumps the
+        # generation so that stale jobs stop early and their results are dropped.
+        # At most one job runs and at most one more waits for it to finish.
+        self.preview_generation = 0
+        self.preview_running = False
+        self.preview_pending = False
+        
+        # While editing, detail finer than a preview pixel is drawn as grey
+        # annuli; the full geometry replaces it once editing pauses
+        self.detail_timer = QTimer()
+        self.detail_timer.setSingleShot(True)
+        self.detail_timer.setInterval(PREVIEW_DETAIL_DELAY_MS)
+        self.detail_timer.timeout.connect(self.generate_detailed_preview)
+        self.preview_detail_generation = None
+        self.preview_pending_detail = False
+        self.preview_pool = QThreadPool()
+        self.preview_pool.setMaxThreadCount(1)
+        self.preview_signals = PreviewSignals()
+        self.preview_signals.finished.connect(self.on_preview_ready)
+        self.preview_signals.done.connect(self.on_preview_job_done)
+        
+        self.preview_renderer = self.config_manager.get('preview_renderer', PREVIEW_RENDERER_RASTER)
+        
+        self.preview_debounce = AdaptiveDebounce(
+            self.config_manager.get('preview_debounce_min_ms', PREVIEW_DEBOUNCE_MIN_MS),
+            self.config_manager.get('preview_debounce_max_ms', PREVIEW_DEBOUNCE_MAX_MS)
+        )
+        
         self.apply_font_scaling()
-        self.setup_ui()
-        self.add_ring()
-        self.load_presets_list()
+        with profile_span("setup_ui"):
+            self.setup_ui()
+        with profile_span("add_ring"):
+            self.add_ring()
+        with profile_span("load_presets_list"):
+            self.load_presets_list()
         
     def tr(self, key):
         return TRANSLATIONS.get(self.current_language, TRANSLATIONS['en']).get(key, key)
@@ -66,6 +119,9 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
         if font_size > 0:
             font.setPointSize(int(font_size * self.scale_factor))
             QApplication.setFont(font)
+            # The window already exists and the application font only reaches
+            # existing widgets once the event loop runs
+            self.setFont(font)
     
     def is_dark_theme(self):
         palette = QGuiApplication.palette()
@@ -80,69 +136,48 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
             font.setPointSize(current_size + size_increase)
             widget.setFont(font)
     
+    @contextmanager
+    def bulk_update(self):
+        """Apply many edits as one: ring information and the preview are updated once, at the end"""
+        self.bulk_update_depth += 1
+        try:
+            yield
+        finally:
+            self.bulk_update_depth -= 1
+            if self.bulk_update_depth == 0 and self.bulk_update_pending:
+                self.bulk_update_pending = False
+                self.schedule_preview_update()
+    
     def schedule_preview_update(self):
-        self.update_timer.start(300)
+        if self.bulk_update_depth:
+            self.bulk_update_pending = True
+            return
+        self.update_rings_info()
+        self.preview_generation += 1
+        self.detail_timer.stop()
+        self.update_timer.start(self.preview_debounce.interval())
+    
+    def update_rings_info(self):
+        # Placing the rings is cheap, so the information follows every edit
+        # with the real radius of each ring instead of waiting for the preview
+        _, ring_layouts = layout_disc(self.get_disc_spec())
+        self.rings_model.set_ring_layouts([(ring_layout.outer_radius, ring_layout.depth) for ring_layout in ring_layouts])
+    
+    def is_current_preview(self, generation):
+        return generation == self.preview_generation
     
     def setup_ui(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         
-        central_widget.setStyleSheet("""
-            QMainWindow, QWidget {
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QPushButton {
-                background-color: #569cd6;
-                color: #ffffff;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-            }
-            QGroupBox {
-                color: #ffffff;
-                font-weight: bold;
-            }
-            QLabel {
-                color: #ffffff;
-                font-size: 13px;
-            }
-            QTabWidget {
-                border: none;
-                background-color: transparent;
-            }
-            QTabWidget::pane {
-                border: 1px solid #404040;
-                border-radius: 8px;
-                background-color: rgba(40, 40, 40, 0.95);
-                margin-top: -1px;
-            }
-            QTabBar::tab {
-                background-color: #2d2d2d;
-                border: 1px solid #404040;
-                border-bottom: none;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                padding: 12px 20px;
-                margin-right: 2px;
-                font-weight: 600;
-                color: #cccccc;
-            }
-            QTabBar::tab:selected {
-                background-color: #569cd6;
-                color: #ffffff;
-                border-color: #569cd6;
-            }
-            QTabBar::tab:hover:!selected {
-                background-color: #404040;
-                color: #ffffff;
-            }
-        """)
+        # One style sheet for the whole window, parsed once; widgets select
+        # their look with object names instead of style sheets of their own
+        central_widget.setStyleSheet(STYLESHEET)
         
         main_layout = QHBoxLayout(central_widget)
         
         controls_panel = QWidget()
-        controls_panel.setStyleSheet("QWidget { background-color: #252525; }")
+        controls_panel.setObjectName("controlsPanel")
         controls_layout = QVBoxLayout(controls_panel)
         controls_layout.setContentsMargins(0, 0, 0, 0)
         
@@ -157,39 +192,22 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
         
         self.add_ring_button = QPushButton(f"+ {self.tr('add_ring')}")
         self.apply_font_to_widget(self.add_ring_button, 1)
-        self.add_ring_button.setStyleSheet("""
-            QPushButton {
-                background-color: #569CD6;
-                border: none;
-                padding: 3px 14px;
-                font-size: 14px;
-                color: #ffffff;
-                min-height: 27px;
-                max-height: 27px;
-            }
-            QPushButton:hover {
-                background-color: #2E383F;
-            }
-            QPushButton:pressed {
-                background-color: #569CD6;
-            }
-        """)
+        self.add_ring_button.setObjectName("primaryButton")
         self.add_ring_button.clicked.connect(self.add_ring)
         rings_tab_layout.addWidget(self.add_ring_button)
         
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        
-        self.rings_container = QWidget()
-        self.rings_layout = QVBoxLayout(self.rings_container)
-        self.rings_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.rings_layout.setContentsMargins(5, 5, 15, 5)
-        self.rings_layout.setSpacing(8)
-        
-        scroll_area.setWidget(self.rings_container)
-        rings_tab_layout.addWidget(scroll_area, 1)
+        # Rings list, only the current ring has its settings widgets
+        self.rings_model = RingListModel(self)
+        self.rings_model.rings_changed.connect(self.schedule_preview_update)
+        self.rings_delegate = RingItemDelegate(self.tr, self)
+        # Queued, deleting a ring can ask for confirmation and removes the
+        # editor whose button was clicked
+        self.rings_delegate.button_clicked.connect(
+            self.on_ring_button_clicked, Qt.ConnectionType.QueuedConnection
+        )
+        self.rings_list = RingListView(self.rings_delegate)
+        self.rings_list.setModel(self.rings_model)
+        rings_tab_layout.addWidget(self.rings_list, 1)
         
         self.tab_widget.addTab(rings_tab, self.tr('rings_tab'))
         
@@ -212,7 +230,7 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
         params_layout.addLayout(language_layout)
         
         self.measurements_title = QLabel(self.tr('measurements_mm'))
-        self.measurements_title.setStyleSheet("font-weight: bold; font-size: 20px; color: #569CD6; margin: 0px; padding: 0px; border: none; background: transparent;")
+        self.measurements_title.setObjectName("sectionTitle")
         self.measurements_title.setContentsMargins(0, 0, 0, 0)
         params_layout.addWidget(self.measurements_title)
         
@@ -267,7 +285,7 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
         
         # Text positioning section
         self.disc_text_title = QLabel(self.tr('disc_text'))
-        self.disc_text_title.setStyleSheet("font-weight: bold; font-size: 20px; color: #569CD6; margin: 15px 0px 10px 0px; padding: 0px; border: none; background: transparent;")
+        self.disc_text_title.setObjectName("sectionTitle")
         self.disc_text_title.setContentsMargins(0, 0, 0, 0)
         params_layout.addWidget(self.disc_text_title)
         
@@ -310,6 +328,8 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
         
         self.svg_radio = QRadioButton("SVG")
         self.pdf_radio = QRadioButton("PDF")
+        self.png_radio = QRadioButton("PNG")
+        self.tiff_radio = QRadioButton("TIFF")
         self.svg_radio.setChecked(True)  # Default to SVG
         
         # Disable PDF if not available
@@ -317,46 +337,18 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
             self.pdf_radio.setEnabled(False)
             self.pdf_radio.setToolTip("PDF export requires additional libraries")
         
-        radio_style = """
-            QRadioButton {
-                color: #cccccc;
-                font-weight: 500;
-                spacing: 10px;
-            }
-            QRadioButton::indicator {
-                width: 14px;
-                height: 14px;
-                border: 2px solid #666666;
-                background-color: #2d2d2d;
-                border-radius: 7px;
-            }
-            QRadioButton::indicator:checked {
-                background-color: #569CD6;
-                border-color: #569CD6;
-            }
-            QRadioButton::indicator:hover {
-                border-color: #999999;
-            }
-            QRadioButton:disabled {
-                color: #666666;
-            }
-            QRadioButton::indicator:disabled {
-                border-color: #444444;
-                background-color: #1e1e1e;
-            }
-        """
-        
-        self.svg_radio.setStyleSheet(radio_style)
-        self.pdf_radio.setStyleSheet(radio_style)
-        
         self.format_button_group = QButtonGroup()
         self.format_button_group.addButton(self.svg_radio, 0)
         self.format_button_group.addButton(self.pdf_radio, 1)
+        self.format_button_group.addButton(self.png_radio, 2)
+        self.format_button_group.addButton(self.tiff_radio, 3)
         self.format_button_group.idClicked.connect(self.update_page_size_visibility)
         
         format_radios_layout = QHBoxLayout()
         format_radios_layout.addWidget(self.svg_radio)
         format_radios_layout.addWidget(self.pdf_radio)
+        format_radios_layout.addWidget(self.png_radio)
+        format_radios_layout.addWidget(self.tiff_radio)
         
         export_format_layout.addWidget(self.export_format_label)
         export_format_layout.addLayout(format_radios_layout)
@@ -369,34 +361,54 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
         self.page_size_combo.addItems(["A4", "Letter", "Legal", "A3"])
         self.page_size_combo.setCurrentIndex(0)
         self.page_size_combo.setEnabled(False)
-        self.page_size_combo.setStyleSheet("QComboBox:disabled { color: gray; }")
         
         self.page_size_layout.addWidget(self.page_size_label)
         self.page_size_layout.addWidget(self.page_size_combo)
         export_tab_layout.addLayout(self.page_size_layout)
         
+        # SVG encoding selection (for SVG export)
+        svg_encoding_layout = QHBoxLayout()
+        self.svg_encoding_label = QLabel(self.tr('svg_encoding'))
+        self.svg_encoding_combo = QComboBox()
+        self.svg_encoding_combo.addItem(self.tr('svg_encoding_elements'), ENCODING_ELEMENTS)
+        self.svg_encoding_combo.addItem(self.tr('svg_encoding_paths'), ENCODING_PATHS)
+        self.svg_encoding_combo.addItem(self.tr('svg_encoding_dasharray'), ENCODING_DASHARRAY)
+        self.svg_encoding_combo.setCurrentIndex(0)
+        self.svg_encoding_combo.currentIndexChanged.connect(self.update_page_size_visibility)
+        
+        svg_encoding_layout.addWidget(self.svg_encoding_label)
+        svg_encoding_layout.addWidget(self.svg_encoding_combo)
+        export_tab_layout.addLayout(svg_encoding_layout)
+        
+        # Coordinate precision (for compact SVG encodings)
+        svg_precision_layout = QHBoxLayout()
+        self.svg_precision_label = QLabel(self.tr('coordinate_decimals'))
+        self.svg_precision_input = QSpinBox()
+        self.svg_precision_input.setRange(1, 6)
+        self.svg_precision_input.setValue(COMPACT_PRECISION)
+        
+        svg_precision_layout.addWidget(self.svg_precision_label)
+        svg_precision_layout.addWidget(self.svg_precision_input)
+        export_tab_layout.addLayout(svg_precision_layout)
+        
+        # Resolution (for PNG/TIFF export)
+        raster_dpi_layout = QHBoxLayout()
+        self.raster_dpi_label = QLabel(self.tr('resolution_dpi'))
+        self.raster_dpi_input = QSpinBox()
+        self.raster_dpi_input.setRange(72, 4800)
+        self.raster_dpi_input.setSingleStep(100)
+        self.raster_dpi_input.setValue(DEFAULT_DPI)
+        
+        raster_dpi_layout.addWidget(self.raster_dpi_label)
+        raster_dpi_layout.addWidget(self.raster_dpi_input)
+        export_tab_layout.addLayout(raster_dpi_layout)
+        
         # Initialize page size visibility
         self.update_page_size_visibility()
         
         self.export_button = QPushButton(self.tr('export'))
         self.apply_font_to_widget(self.export_button, 1)
-        self.export_button.setStyleSheet("""
-            QPushButton {
-                background-color: #569CD6;
-                border: none;
-                padding: 3px 14px;
-                font-size: 14px;
-                color: #ffffff;
-                min-height: 27px;
-                max-height: 27px;
-            }
-            QPushButton:hover {
-                background-color: #2E383F;
-            }
-            QPushButton:pressed {
-                background-color: #569CD6;
-            }
-        """)
+        self.export_button.setObjectName("primaryButton")
         self.export_button.clicked.connect(self.export_file)
         self.export_button.setEnabled(False)
         export_tab_layout.addWidget(self.export_button)
@@ -413,48 +425,21 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
         # Save as new preset button
         self.save_preset_button = QPushButton(self.tr('save_as_new_preset'))
         self.apply_font_to_widget(self.save_preset_button, 1)
-        self.save_preset_button.setStyleSheet("""
-            QPushButton {
-                background-color: #569CD6;
-                border: none;
-                padding: 3px 14px;
-                font-size: 14px;
-                color: #ffffff;
-                min-height: 27px;
-                max-height: 27px;
-            }
-            QPushButton:hover {
-                background-color: #2E383F;
-            }
-            QPushButton:pressed {
-                background-color: #569CD6;
-            }
-        """)
+        self.save_preset_button.setObjectName("primaryButton")
         self.save_preset_button.clicked.connect(self.save_new_preset)
         presets_tab_layout.addWidget(self.save_preset_button)
         
         # Presets list
-        self.presets_list = QListWidget()
-        self.presets_list.setStyleSheet("""
-            QListWidget {
-                background-color: #2d2d2d;
-                border: 1px solid #404040;
-                border-radius: 4px;
-                color: #ffffff;
-                padding: 5px;
-            }
-            QListWidget::item {
-                background-color: transparent;
-                padding: 8px;
-                border-bottom: 1px solid #404040;
-            }
-            QListWidget::item:selected {
-                background-color: #569cd6;
-            }
-            QListWidget::item:hover {
-                background-color: #404040;
-            }
-        """)
+        self.presets_model = PresetListModel(self.config_manager.preset_store(), self)
+        self.presets_delegate = PresetItemDelegate(self.tr, self)
+        # Queued, the actions open dialogs and change rows, which must not
+        # happen inside the view's own mouse handling
+        self.presets_delegate.button_clicked.connect(
+            self.on_preset_button_clicked, Qt.ConnectionType.QueuedConnection
+        )
+        self.presets_list = PresetListView(self.presets_delegate)
+        self.presets_list.setModel(self.presets_model)
+        self.presets_list.setObjectName("presetsList")
         presets_tab_layout.addWidget(self.presets_list, 1)
         
         self.tab_widget.addTab(presets_tab, self.tr('presets_tab'))
@@ -466,130 +451,172 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
         
         # Preview panel
         self.preview_panel = QWidget()
-        self.preview_panel.setStyleSheet("background-color: white;")
+        self.preview_panel.setObjectName("previewPanel")
         preview_layout = QVBoxLayout(self.preview_panel)
         preview_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        self.svg_widget = QSvgWidget()
-        self.svg_widget.setMinimumSize(QSize(300, 300))
-        preview_layout.addWidget(self.svg_widget, 1, Qt.AlignmentFlag.AlignCenter)
+        self.preview_widget = PreviewWidget()
+        self.preview_widget.setMinimumSize(QSize(PREVIEW_MIN_SIZE, PREVIEW_MIN_SIZE))
+        preview_layout.addWidget(self.preview_widget, 1, Qt.AlignmentFlag.AlignCenter)
         
         main_layout.addWidget(self.preview_panel, 1)
     
     def resizeEvent(self, event: QResizeEvent) -> None:
         super().resizeEvent(event)
-        self.adjust_svg_size()
+        # Window drags deliver a resize per mouse move, the preview follows at most once per interval
+        if not self.resize_timer.isActive():
+            self.resize_timer.start()
+    
+    def preview_size(self):
+        available_width = self.preview_panel.width() - PREVIEW_PANEL_MARGIN_WIDTH
+        available_height = self.preview_panel.height() - PREVIEW_PANEL_MARGIN_HEIGHT
+        # Not the widget's minimumWidth(): setFixedSize() raises it to the last size
+        return max(min(available_width, available_height), PREVIEW_MIN_SIZE)
+    
+    def preview_image_size(self):
+        return max(1, round(self.preview_size() * self.preview_widget.devicePixelRatioF()))
     
-    def adjust_svg_size(self):
-        if hasattr(self, 'svg_widget') and hasattr(self, 'preview_panel'):
-            available_width = self.preview_panel.width() - PREVIEW_PANEL_MARGIN_WIDTH
-            available_height = self.preview_panel.height() - PREVIEW_PANEL_MARGIN_HEIGHT
+    def adjust_preview_size(self):
+        if hasattr(self, 'preview_widget'):
+            size = self.preview_size()
+            self.preview_widget.setFixedSize(QSize(size, size))
             
-            size = min(available_width, available_height)
-            self.svg_widget.setFixedSize(QSize(size, size))
+            # A rasterized preview is only sharp at the size it was rendered for
+            if (self.preview_renderer != PREVIEW_RENDERER_SVG and self.preview_image is not None
+                    and self.rings_model.specs and self.preview_image.width() != self.preview_image_size()):
+                self.schedule_preview_update()
     
     def add_ring(self):
-        index = len(self.ring_widgets)
-        ring_widget = RingSettings(
-            parent=self.rings_container,
-            index=index,
-            on_delete=self.delete_ring,
-            on_change=self.schedule_preview_update,
-            tr_func=self.tr,
-            on_move_up=self.move_ring_up,
-            on_move_down=self.move_ring_down
-        )
-        self.ring_widgets.append(ring_widget)
-        self.rings_layout.addWidget(ring_widget)
-        
-        self.schedule_preview_update()
+        row = self.rings_model.append(RingSpec())
+        # A new ring opens for editing
+        self.rings_list.setCurrentIndex(self.rings_model.index(row))
     
-    def delete_ring(self, index):
-        if len(self.ring_widgets) <= 1:
+    def delete_ring(self, row):
+        if self.rings_model.rowCount() <= 1:
             QMessageBox.warning(self, self.tr('warning'), self.tr('at_least_one_ring'))
             return
-            
-        if index < len(self.ring_widgets):
-            widget = self.ring_widgets.pop(index)
-            self.rings_layout.removeWidget(widget)
-            widget.deleteLater()
-            
-        self.update_ring_indices()
-        self.schedule_preview_update()
+        
+        if row < self.rings_model.rowCount():
+            self.rings_model.remove(row)
     
-    def move_ring_up(self, index):
-        if index > 0 and index < len(self.ring_widgets):
-            # Swap rings in the list
-            self.ring_widgets[index], self.ring_widgets[index - 1] = self.ring_widgets[index - 1], self.ring_widgets[index]
-            
-            # Remove both widgets from layout
-            self.rings_layout.removeWidget(self.ring_widgets[index])
-            self.rings_layout.removeWidget(self.ring_widgets[index - 1])
-            
-            # Re-add them in new order
-            self.rings_layout.insertWidget(index - 1, self.ring_widgets[index - 1])
-            self.rings_layout.insertWidget(index, self.ring_widgets[index])
-            
-            # Update indices and titles
-            self.update_ring_indices()
-            self.schedule_preview_update()
-    
-    def move_ring_down(self, index):
-        if index >= 0 and index < len(self.ring_widgets) - 1:
-            # Swap rings in the list
-            self.ring_widgets[index], self.ring_widgets[index + 1] = self.ring_widgets[index + 1], self.ring_widgets[index]
-            
-            # Remove both widgets from layout
-            self.rings_layout.removeWidget(self.ring_widgets[index])
-            self.rings_layout.removeWidget(self.ring_widgets[index + 1])
-            
-            # Re-add them in new order
-            self.rings_layout.insertWidget(index, self.ring_widgets[index])
-            self.rings_layout.insertWidget(index + 1, self.ring_widgets[index + 1])
-            
-            # Update indices and titles
-            self.update_ring_indices()
-            self.schedule_preview_update()
+    def move_ring_up(self, row):
+        self.move_ring(row, row - 1)
     
-    def update_ring_indices(self):
-        for i, widget in enumerate(self.ring_widgets):
-            widget.index = i
-            widget.title_label.setText(f"{widget.tr('ring')} {i + 1}")
+    def move_ring_down(self, row):
+        self.move_ring(row, row + 1)
+    
+    def move_ring(self, row, new_row):
+        # Only the model rows move, the open editor moves along with its ring
+        if self.rings_model.move(row, new_row):
+            self.rings_list.scrollTo(self.rings_model.index(new_row))
+    
+    def on_ring_button_clicked(self, row, action):
+        if action == 'move_up':
+            self.move_ring_up(row)
+        elif action == 'move_down':
+            self.move_ring_down(row)
+        elif action == 'delete':
+            self.delete_ring(row)
     
     def update_page_size_visibility(self):
-        """Update page size combo visibility based on export format selection"""
+        """Update page size and SVG options availability based on export format selection"""
         is_pdf_selected = self.pdf_radio.isChecked() and PDF_AVAILABLE
         self.page_size_combo.setEnabled(is_pdf_selected)
+        
+        if hasattr(self, 'svg_encoding_combo'):
+            is_svg_selected = self.svg_radio.isChecked()
+            self.svg_encoding_combo.setEnabled(is_svg_selected)
+            is_compact = self.svg_encoding_combo.currentData() != ENCODING_ELEMENTS
+            self.svg_precision_input.setEnabled(is_svg_selected and is_compact)
+        
+        if hasattr(self, 'raster_dpi_input'):
+            self.raster_dpi_input.setEnabled(self.png_radio.isChecked() or self.tiff_radio.isChecked())
+    
+    def get_disc_spec(self):
+        return DiscSpec(
+            diameter=self.diameter_input.value(),
+            spindle_diameter=self.spindle_diameter_input.value(),
+            outer_circle_width=self.outer_circle_width_input.value(),
+            ring_separation=self.ring_separation_input.value(),
+            rings=tuple(self.rings_model.specs),
+            text_top=self.top_text_input.toPlainText(),
+            text_bottom=self.bottom_text_input.toPlainText()
+        )
+    
+    def preview_pixels_per_mm(self):
+        # Device pixels, so high DPI screens keep their extra detail
+        pixels = self.preview_widget.width() * self.preview_widget.devicePixelRatioF()
+        return pixels / self.diameter_input.value() if pixels > 0 else None
     
-    def generate_disc(self):
-        if not self.ring_widgets:
+    def generate_disc(self, full_detail=False):
+        if not self.rings_model.specs:
             QMessageBox.warning(self, self.tr('warning'), self.tr('add_at_least_one_ring'))
             return
         
-        diameter = self.diameter_input.value()
-        spindle_diameter = self.spindle_diameter_input.value()
-        outer_circle_width = self.outer_circle_width_input.value()
-        ring_separation = self.ring_separation_input.value()
+        self.preview_generation += 1
+        self.detail_timer.stop()
         
-        # Get text positioning values
-        disc_text = {
-            'top': self.top_text_input.toPlainText(),
-            'bottom': self.bottom_text_input.toPlainText()
-        }
+        # Never queue behind a running job: it has just been superseded and
+        # will stop at the next ring, the newest settings are rendered then
+        if self.preview_running:
+            self.preview_pending = True
+            self.preview_pending_detail = full_detail
+            return
         
-        svg_file = self.svg_generator.generate_disc(
-            diameter, spindle_diameter, outer_circle_width, 
-            ring_separation, self.ring_widgets, disc_text
-        )
+        # Widgets are read here on the GUI thread, the worker only gets an immutable spec
+        if self.preview_renderer == PREVIEW_RENDERER_SVG:
+            job = PreviewJob(
+                self.preview_generation, self.svg_generator, self.get_disc_spec(),
+                self.preview_signals, self.is_current_preview,
+                pixels_per_mm=None if full_detail else self.preview_pixels_per_mm()
+            )
+        else:
+            job = PreviewJob(
+                self.preview_generation, self.svg_generator, self.get_disc_spec(),
+                self.preview_signals, self.is_current_preview,
+                image_size=self.preview_image_size(),
+                device_pixel_ratio=self.preview_widget.devicePixelRatioF()
+            )
+        self.preview_detail_generation = self.preview_generation if full_detail else None
+        self.preview_running = True
+        self.preview_pool.start(job)
+    
+    def generate_detailed_preview(self):
+        self.generate_disc(full_detail=True)
+    
+    def on_preview_job_done(self):
+        self.preview_running = False
+        if self.preview_pending:
+            self.preview_pending = False
+            self.generate_disc(self.preview_pending_detail)
+    
+    def on_preview_ready(self, generation, content, ring_layouts, elapsed_ms, reduced):
+        if not self.is_current_preview(generation):
+            return
+        
+        # The preview is rendered from memory, disk is only touched on export
+        start = time.perf_counter()
+        with profile_span("preview display", generation=generation):
+            if isinstance(content, QImage):
+                self.preview_image = content
+                self.preview_widget.set_image(content)
+            else:
+                self.svg_content = content
+                self.preview_widget.load_svg(content)
+            self.adjust_preview_size()
+        self.preview_displayed.emit(generation)
+        # Only interactive previews drive the debounce, the detailed pass runs when idle
+        if generation != self.preview_detail_generation:
+            self.preview_debounce.record(elapsed_ms + (time.perf_counter() - start) * 1000)
+        
+        if reduced:
+            self.detail_timer.start()
         
-        self.temp_svg_file = type('TempFile', (), {'name': svg_file})()
-        self.svg_widget.load(svg_file)
-        self.adjust_svg_size()
         self.export_button.setEnabled(True)
     
     def export_file(self):
         try:
-            if not self.temp_svg_file:
+            if not self.svg_content and self.preview_image is None:
                 QMessageBox.warning(self, self.tr('error'), self.tr('no_disc_to_export'))
                 return
         
@@ -599,6 +626,12 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
             elif self.pdf_radio.isChecked() and PDF_AVAILABLE:
                 file_filter = "PDF Files (*.pdf)"
                 default_ext = ".pdf"
+            elif self.png_radio.isChecked():
+                file_filter = "PNG Files (*.png)"
+                default_ext = ".png"
+            elif self.tiff_radio.isChecked():
+                file_filter = "TIFF Files (*.tif *.tiff)"
+                default_ext = ".tif"
             else:
                 file_filter = "SVG Files (*.svg)"
                 default_ext = ".svg"
@@ -610,7 +643,7 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
             if not file_path:
                 return
         
-            if not file_path.endswith(default_ext):
+            if not file_path.endswith(default_ext) and not (default_ext == ".tif" and file_path.endswith(".tiff")):
                 file_path += default_ext
         
             if os.path.exists(file_path):
@@ -621,52 +654,51 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
                 if reply == QMessageBox.StandardButton.No:
                     return
         
+            # Export the current settings even if a preview is still pending,
+            # unchanged rings come straight from the generator's cache
+            disc_spec = self.get_disc_spec()
+            
             if self.svg_radio.isChecked():
-                with open(self.temp_svg_file.name, 'r') as src, open(file_path, 'w') as dst:
-                    dst.write(src.read())
+                self.svg_generator.generate_disc(
+                    disc_spec,
+                    encoding=self.svg_encoding_combo.currentData(),
+                    precision=self.svg_precision_input.value() if self.svg_precision_input.isEnabled() else None,
+                    filename=file_path
+                )
             elif self.pdf_radio.isChecked() and PDF_AVAILABLE:
-                drawing = svg2rlg(self.temp_svg_file.name)
-                
-                disc_diameter_mm = self.diameter_input.value()
-                disc_diameter_pt = disc_diameter_mm * 2.83465
-                
-                paper_format = self.page_size_combo.currentText()
-                if paper_format == "A4":
-                    pagesize = A4
-                elif paper_format == "Letter":
-                    pagesize = LETTER
-                elif paper_format == "Legal":
-                    pagesize = LEGAL
-                elif paper_format == "A3":
-                    pagesize = A3
-                else:
-                    pagesize = A4
-                
-                page_width, page_height = pagesize
-                
-                x_offset = (page_width - disc_diameter_pt) / 2
-                y_offset = (page_height - disc_diameter_pt) / 2
-                
-                from reportlab.graphics.shapes import Drawing, Group
-                
-                new_drawing = Drawing(page_width, page_height)
-                
-                group = Group(drawing)
-                scale_factor = disc_diameter_pt / drawing.width
-                group.scale(scale_factor, scale_factor)
-                group.translate(x_offset, y_offset)
-                
-                new_drawing.add(group)
-                
-                renderPDF.drawToFile(new_drawing, file_path, pagesize=pagesize)
+                from .pdf_export import export_pdf
+                export_pdf(
+                    self.svg_generator.get_disc_layout(disc_spec), file_path,
+                    self.page_size_combo.currentText()
+                )
+            elif self.png_radio.isChecked() or self.tiff_radio.isChecked():
+                self.export_raster_file(disc_spec, file_path)
             else:
                 # Fallback to SVG if PDF not available
-                with open(self.temp_svg_file.name, 'r') as src, open(file_path, 'w') as dst:
-                    dst.write(src.read())
+                self.svg_generator.generate_disc(disc_spec, filename=file_path)
         
         except Exception as e:
             QMessageBox.critical(self, self.tr('error'), f"{self.tr('error_saving_file')} {e}")
     
+    def export_raster_file(self, disc_spec, file_path):
+        # Print resolutions take a while, show progress and allow cancelling
+        progress_dialog = QProgressDialog(self.tr('exporting_image'), self.tr('cancel'), 0, 100, self)
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+        
+        def update_progress(done, total):
+            progress_dialog.setValue(int(done * 100 / total))
+        
+        try:
+            export_raster(
+                self.svg_generator.get_disc_layout(disc_spec), file_path, self.raster_dpi_input.value(),
+                progress=update_progress, is_cancelled=progress_dialog.wasCanceled
+            )
+        except GenerationCancelled:
+            pass
+        finally:
+            progress_dialog.close()
+    
     def change_language(self, index):
         new_language = 'en' if index == 0 else 'es'
         if new_language != self.current_language:
@@ -709,15 +741,22 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
             self.export_format_label.setText(self.tr('export_format'))
         if hasattr(self, 'page_size_label'):
             self.page_size_label.setText(self.tr('page_size'))
+        if hasattr(self, 'svg_encoding_label'):
+            self.svg_encoding_label.setText(self.tr('svg_encoding'))
+            self.svg_encoding_combo.setItemText(0, self.tr('svg_encoding_elements'))
+            self.svg_encoding_combo.setItemText(1, self.tr('svg_encoding_paths'))
+            self.svg_encoding_combo.setItemText(2, self.tr('svg_encoding_dasharray'))
+        if hasattr(self, 'svg_precision_label'):
+            self.svg_precision_label.setText(self.tr('coordinate_decimals'))
+        if hasattr(self, 'raster_dpi_label'):
+            self.raster_dpi_label.setText(self.tr('resolution_dpi'))
         if hasattr(self, 'export_button'):
             self.export_button.setText(self.tr('export'))
         
         if hasattr(self, 'save_preset_button'):
             self.save_preset_button.setText(self.tr('save_as_new_preset'))
         
-        # Update presets list to refresh tooltips
-        if hasattr(self, 'presets_list'):
-            self.load_presets_list()
+        # Tooltips of the preset buttons are translated when shown, nothing to rebuild
         
         if hasattr(self, 'language_combo'):
             current_index = self.language_combo.currentIndex()
@@ -728,14 +767,13 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
             self.language_combo.currentIndexChanged.connect(self.change_language)
             self.language_combo.blockSignals(False)
         
-        for i, ring_widget in enumerate(self.ring_widgets):
-            ring_widget.update_language(self.current_language)
+        self.rings_list.update_language(self.current_language)
         
         self.schedule_preview_update()
 
     def get_current_settings(self):
         return {
-            'rings': [ring.get_settings() for ring in self.ring_widgets],
+            'rings': [spec.to_settings() for spec in self.rings_model.specs],
             'diameter': self.diameter_input.value(),
             'spindle_diameter': self.spindle_diameter_input.value(),
             'outer_circle_width': self.outer_circle_width_input.value(),
@@ -745,213 +783,57 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
         }
     
     def load_preset_data(self, preset_data):
-        # Clear all rings without validation
-        for widget in self.ring_widgets:
-            self.rings_layout.removeWidget(widget)
-            widget.deleteLater()
-        self.ring_widgets.clear()
-        
-        self.diameter_input.setValue(preset_data.get('diameter', 150))
-        self.spindle_diameter_input.setValue(preset_data.get('spindle_diameter', 7.3))
-        self.outer_circle_width_input.setValue(preset_data.get('outer_circle_width', 1.0))
-        self.ring_separation_input.setValue(preset_data.get('ring_separation', 1.0))
-        
-        # Load text positioning values
-        self.top_text_input.setPlainText(preset_data.get('text_top', ''))
-        self.bottom_text_input.setPlainText(preset_data.get('text_bottom', ''))
-        
-        for ring_data in preset_data.get('rings', []):
-            self.add_ring()
-            ring_widget = self.ring_widgets[-1]
-            
-            # Set RPM value - check if it matches dropdown options first
-            rpm_value = ring_data.get('rpm', 33.33)
-            rpm_dropdown_values = {16: 0, 33.33: 1, 45: 2, 78: 3}  # value: index mapping
-            
-            if rpm_value in rpm_dropdown_values:
-                # Use dropdown selection
-                ring_widget.rpm_manual_check.setChecked(False)
-                ring_widget.rpm_combo.setCurrentIndex(rpm_dropdown_values[rpm_value])
-            else:
-                # Use manual input
-                ring_widget.rpm_manual_check.setChecked(True)
-                ring_widget.rpm_input.setValue(rpm_value)
-            # Set frequency radio buttons
-            hz_value = ring_data.get('hz', 60)
-            if hz_value == 50:
-                ring_widget.hz_50_radio.setChecked(True)
-            else:
-                ring_widget.hz_60_radio.setChecked(True)
-            
-            ring_widget.depth_input.setValue(ring_data.get('depth', 8))
+        # Every control change below would otherwise recompute the ring
+        # information and restart the preview on its own
+        with self.bulk_update():
+            self.diameter_input.setValue(preset_data.get('diameter', 150))
+            self.spindle_diameter_input.setValue(preset_data.get('spindle_diameter', 7.3))
+            self.outer_circle_width_input.setValue(preset_data.get('outer_circle_width', 1.0))
+            self.ring_separation_input.setValue(preset_data.get('ring_separation', 1.0))
             
-            # Set mode radio buttons
-            if ring_data.get('single_mode', True):
-                ring_widget.mode_single_radio.setChecked(True)
-            else:
-                ring_widget.mode_dual_radio.setChecked(True)
-            
-            # Set shape radio buttons
-            if ring_data.get('shape_type', 'lines') == 'lines':
-                ring_widget.shape_lines_radio.setChecked(True)
-            else:
-                ring_widget.shape_dots_radio.setChecked(True)
+            # Load text positioning values
+            self.top_text_input.setPlainText(preset_data.get('text_top', ''))
+            self.bottom_text_input.setPlainText(preset_data.get('text_bottom', ''))
             
-            dot_size_str = f"{ring_data.get('dot_size', 1)}x"
-            dot_size_index = ring_widget.dot_size_combo.findText(dot_size_str)
-            if dot_size_index >= 0:
-                ring_widget.dot_size_combo.setCurrentIndex(dot_size_index)
-        
-            # Set density radio buttons
-            if ring_data.get('density', 'double') == 'double':
-                ring_widget.density_double_radio.setChecked(True)
-            else:
-                ring_widget.density_normal_radio.setChecked(True)
-            
-        self.schedule_preview_update()
+            # Replaces the rings without validation, the first one opens for editing
+            self.rings_model.set_specs(RingSpec.from_settings(ring) for ring in preset_data.get('rings', []))
+            if self.rings_model.specs:
+                self.rings_list.setCurrentIndex(self.rings_model.index(0))
     
     def save_new_preset(self):
         name, ok = QInputDialog.getText(self, self.tr('preset_name'), self.tr('preset_name_dialog'))
         if ok and name.strip():
             name = name.strip()
-            presets = self.config_manager.get('presets', {})
-            presets[name] = self.get_current_settings()
-            self.config_manager.set('presets', presets)
-            self.load_presets_list()
+            self.config_manager.preset_store().put(name, self.get_current_settings())
+            self.presets_model.preset_saved(name)
     
     def load_presets_list(self):
-        self.presets_list.clear()
-        presets = self.config_manager.get('presets', {})
-        
-        for preset_name in presets.keys():
-            item = QListWidgetItem(preset_name)
-            self.presets_list.addItem(item)
-            
-            widget = QWidget()
-            main_layout = QVBoxLayout(widget)
-            main_layout.setContentsMargins(8, 8, 8, 8)
-            main_layout.setSpacing(5)
-            
-            name_label = QLabel(preset_name)
-            name_label.setStyleSheet("color: #ffffff; font-weight: bold; font-size: 13px;")
-            main_layout.addWidget(name_label)
-            
-            buttons_layout = QHBoxLayout()
-            buttons_layout.setSpacing(3)
-            buttons_layout.addStretch()
-            
-            load_button = QPushButton("📂")
-            load_button.setToolTip(self.tr('load'))
-            load_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #3c6d96;
-                    color: white;
-                    border: none;
-                    padding: 4px;
-                    border-radius: 2px;
-                    font-size: 12px;
-                    min-width: 18px;
-                    min-height: 18px;
-                    max-width: 18px;
-                    max-height: 18px;
-                }
-                QPushButton:hover {
-                    background-color: #4a7397;
-                }
-            """)
-            load_button.clicked.connect(lambda checked, name=preset_name: self.load_preset(name))
-            buttons_layout.addWidget(load_button)
-            
-            save_button = QPushButton("💾")
-            save_button.setToolTip(self.tr('save'))
-            save_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #3c6d96;
-                    color: white;
-                    border: none;
-                    padding: 4px;
-                    border-radius: 2px;
-                    font-size: 12px;
-                    min-width: 18px;
-                    min-height: 18px;
-                    max-width: 18px;
-                    max-height: 18px;
-                }
-                QPushButton:hover {
-                    background-color: #4a7397;
-                }
-            """)
-            save_button.clicked.connect(lambda checked, name=preset_name: self.save_preset(name))
-            buttons_layout.addWidget(save_button)
-            
-            rename_button = QPushButton("✏️")
-            rename_button.setToolTip(self.tr('rename'))
-            rename_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #3c6d96;
-                    color: white;
-                    border: none;
-                    padding: 4px;
-                    border-radius: 2px;
-                    font-size: 12px;
-                    min-width: 18px;
-                    min-height: 18px;
-                    max-width: 18px;
-                    max-height: 18px;
-                }
-                QPushButton:hover {
-                    background-color: #4a7397;
-                }
-            """)
-            rename_button.clicked.connect(lambda checked, name=preset_name: self.rename_preset(name))
-            buttons_layout.addWidget(rename_button)
-            
-            delete_button = QPushButton("🗑️")
-            delete_button.setToolTip(self.tr('delete'))
-            delete_button.setStyleSheet("""
-                QPushButton {
-                    background-color: #a2352a;
-                    color: white;
-                    border: none;
-                    padding: 4px;
-                    border-radius: 2px;
-                    font-size: 12px;
-                    min-width: 18px;
-                    min-height: 18px;
-                    max-width: 18px;
-                    max-height: 18px;
-                }
-                QPushButton:hover {
-                    background-color: #86271e;
-                }
-            """)
-            delete_button.clicked.connect(lambda checked, name=preset_name: self.delete_preset(name))
-            buttons_layout.addWidget(delete_button)
-            
-            main_layout.addLayout(buttons_layout)
-            
-            self.presets_list.setItemWidget(item, widget)
-            item.setSizeHint(QSize(widget.sizeHint().width(), 90))
+        self.presets_model.reload()
+    
+    def on_preset_button_clicked(self, name, action):
+        if action == 'load':
+            self.load_preset(name)
+        elif action == 'save':
+            self.save_preset(name)
+        elif action == 'rename':
+            self.rename_preset(name)
+        elif action == 'delete':
+            self.delete_preset(name)
     
     def load_preset(self, name):
-        presets = self.config_manager.get('presets', {})
-        if name in presets:
-            self.load_preset_data(presets[name])
+        preset_data = self.config_manager.preset_store().get(name)
+        if preset_data is not None:
+            self.load_preset_data(preset_data)
     
     def save_preset(self, name):
-        presets = self.config_manager.get('presets', {})
-        presets[name] = self.get_current_settings()
-        self.config_manager.set('presets', presets)
+        self.config_manager.preset_store().put(name, self.get_current_settings())
     
     def rename_preset(self, name):
         new_name, ok = QInputDialog.getText(self, self.tr('rename'), self.tr('enter_new_name'), text=name)
         if ok and new_name.strip() and new_name.strip() != name:
             new_name = new_name.strip()
-            presets = self.config_manager.get('presets', {})
-            if name in presets:
-                presets[new_name] = presets.pop(name)
-                self.config_manager.set('presets', presets)
-                self.load_presets_list()
+            if self.config_manager.preset_store().rename(name, new_name):
+                self.presets_model.preset_renamed(name, new_name)
     
     def delete_preset(self, name):
         reply = QMessageBox.question(
@@ -959,11 +841,17 @@ class StroboscopeMultiRingsGenerator(QMainWindow):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if reply == QMessageBox.StandardButton.Yes:
-            presets = self.config_manager.get('presets', {})
-            if name in presets:
-                del presets[name]
-                self.config_manager.set('presets', presets)
-                self.load_presets_list()
+            if self.config_manager.preset_store().delete(name):
+                self.presets_model.preset_deleted(name)
 
     def closeEvent(self, event):
-        self.temp_dir.cleanup()
\ No newline at end of file
+        # Cancel pending previews before the window goes away
+        self.update_timer.stop()
+        self.detail_timer.stop()
+        self.resize_timer.stop()
+        self.preview_generation += 1
+        self.preview_pending = False
+        # Queued jobs never start, the running one sees it is stale and stops
+        self.preview_pool.clear()
+        self.preview_pool.waitForDone()
+        event.accept()
\ No newline at end of file
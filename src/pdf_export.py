@@ -0,0 +1,129 @@
+import numpy as np
+from reportlab.lib.pagesizes import A4, LETTER, LEGAL, A3
+from reportlab.pdfgen import canvas
+
+from .svg_generator import DISC_TEXT_FONT_SIZE
+
+
+PAGE_SIZES = {
+    "A4": A4,
+    "Letter": LETTER,
+    "Legal": LEGAL,
+    "A3": A3
+}
+
+POINTS_PER_MM = 2.83465
+CSS_PIXELS_PER_MM = 96 / 25.4
+
+# Coordinates are written in mm, 3 decimals is micrometre precision
+PDF_PRECISION = 3
+
+# Number of segments formatted per content stream chunk
+CHUNK_SIZE = 4096
+
+# Control point distance of the four Bezier curves approximating a circle
+CIRCLE_KAPPA = 0.5522847498
+
+
+def export_pdf(layout, pdf_file, paper_format="A4"):
+    """Draw a disc layout at its physical size in the centre of a PDF page.
+
+    The geometry goes straight from the layout arrays (see
+    SVGGenerator.get_disc_layout) into compressed page content, without
+    writing and parsing an SVG document. pdf_file may be a path or a
+    binary file object.
+    """
+    diameter = layout['diameter']
+    disc_diameter_pt = diameter * POINTS_PER_MM
+
+    pagesize = PAGE_SIZES.get(paper_format, A4)
+    page_width, page_height = pagesize
+
+    x_offset = (page_width - disc_diameter_pt) / 2
+    y_offset = (page_height - disc_diameter_pt) / 2
+
+    pdf = canvas.Canvas(pdf_file, pagesize=pagesize, pageCompression=1)
+
+    # Work in the SVG coordinate system: mm, origin at the disc's top left, y down
+    pdf.translate(x_offset, y_offset + disc_diameter_pt)
+    pdf.scale(POINTS_PER_MM, -POINTS_PER_MM)
+    pdf.setStrokeColorRGB(0, 0, 0)
+    pdf.setFillColorRGB(0, 0, 0)
+
+    center_x, center_y = layout['center']
+
+    if layout['outer_circle']:
+        disc_radius, outer_circle_width = layout['outer_circle']
+        pdf.setLineWidth(outer_circle_width)
+        pdf.circle(center_x, center_y, disc_radius, stroke=1, fill=0)
+
+    for segment_sets in layout['rings']:
+        for segment_set in segment_sets:
+            pdf.addLiteral(segment_set_operators(segment_set))
+
+    # Spindle Hole
+    pdf.setLineWidth(0.2)
+    pdf.circle(center_x, center_y, layout['spindle_radius'], stroke=1, fill=1)
+
+    # The SVG gives the font size in absolute mm inside a mm user space, which
+    # SVG renderers resolve at 96 px per inch, one px per user unit
+    font_size = DISC_TEXT_FONT_SIZE * CSS_PIXELS_PER_MM
+
+    for line, (text_x, text_y) in layout['text_lines']:
+        # Text is drawn upright, undoing the y flip around its baseline
+        pdf.saveState()
+        pdf.translate(text_x, text_y)
+        pdf.scale(1, -1)
+        pdf.setFont("Helvetica", font_size)
+        pdf.drawCentredString(0, 0, line)
+        pdf.restoreState()
+
+    pdf.showPage()
+    pdf.save()
+
+
+def segment_set_operators(segment_set, precision=PDF_PRECISION):
+    """Return the PDF path operators drawing one segment set.
+
+    They are wrapped in q/Q so the line width they set does not leak into
+    the canvas state.
+    """
+    number = f"%.{precision}f"
+
+    if segment_set['shape_type'] == 'lines':
+        # One stroked path made of a move/line pair per segment
+        header = f"q {number % segment_set['width']} w\n"
+        template = f"{number} {number} m {number} {number} l\n"
+        values = [segment_set['x1'], segment_set['y1'], segment_set['x2'], segment_set['y2']]
+        paint = "S Q"
+    else:
+        # One filled path made of a closed four curve circle per dot
+        cx = segment_set['cx']
+        cy = segment_set['cy']
+        r = segment_set['radius']
+        k = CIRCLE_KAPPA * r
+        header = "q\n"
+        template = (
+            f"{number} {number} m "
+            + f"{number} {number} {number} {number} {number} {number} c " * 4
+            + "h\n"
+        )
+        values = [
+            cx + r, cy,
+            cx + r, cy + k, cx + k, cy + r, cx, cy + r,
+            cx - k, cy + r, cx - r, cy + k, cx - r, cy,
+            cx - r, cy - k, cx - k, cy - r, cx, cy - r,
+            cx + k, cy - r, cx + r, cy - k, cx + r, cy,
+        ]
+        paint = "f Q"
+
+    per_segment = len(values)
+    numbers = np.column_stack(values).ravel().tolist()
+
+    parts = [header]
+    step = CHUNK_SIZE * per_segment
+    for start in range(0, len(numbers), step):
+        chunk = numbers[start:start + step]
+        parts.append((template * (len(chunk) // per_segment)) % tuple(chunk))
+    parts.append(paint)
+    return "".join(parts)
@@ -0,0 +1,120 @@
+"""
+Indexed preset store
+
+Presets live in an SQLite database next to config.json, one row per
+preset keyed by name, so getting, saving, renaming or deleting one preset
+touches only that row instead of rewriting every preset. Each write is a
+transaction: a crash leaves either the old or the new state, never a
+truncated file.
+
+Presets are returned in the order they were first saved, like the
+dictionary in config.json they replace.
+"""
+
+import json
+import sqlite3
+
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS presets_position ON presets (position);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class PresetStore:
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(str(path))
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM presets").fetchone()[0]
+
+    def __contains__(self, name):
+        return self.connection.execute("SELECT 1 FROM presets WHERE name = ?", (name,)).fetchone() is not None
+
+    def names(self):
+        return [name for name, in self.connection.execute("SELECT name FROM presets ORDER BY position")]
+
+    def get(self, name, default=None):
+        row = self.connection.execute("SELECT data FROM presets WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def put(self, name, preset_data):
+        """Save a preset, replacing the one with the same name in place"""
+        data = json.dumps(preset_data, ensure_ascii=False)
+        with self.connection:
+            updated = self.connection.execute("UPDATE presets SET data = ? WHERE name = ?", (data, name))
+            if updated.rowcount == 0:
+                self._append(name, data)
+
+    def rename(self, name, new_name):
+        """Rename a preset keeping its place, replacing any preset called new_name.
+
+        Returns False when there is no preset called name.
+        """
+        if name == new_name:
+            return name in self
+        with self.connection:
+            if name not in self:
+                return False
+            self.connection.execute("DELETE FROM presets WHERE name = ?", (new_name,))
+            self.connection.execute("UPDATE presets SET name = ? WHERE name = ?", (new_name, name))
+        return True
+
+    def delete(self, name):
+        """Delete a preset, returns False when it did not exist"""
+        with self.connection:
+            return self.connection.execute("DELETE FROM presets WHERE name = ?", (name,)).rowcount > 0
+
+    def import_presets(self, presets):
+        """Add (name, preset data) pairs in one transaction, keeping presets already stored.
+
+        Returns the number of presets added.
+        """
+        with self.connection:
+            return self._import(presets)
+
+    def import_legacy_presets(self, presets):
+        """Import the presets config.json used to keep, once.
+
+        The import is recorded in the same transaction, so later calls add
+        nothing, even if config.json could not be rewritten without them
+        and presets were deleted since. Returns the number of presets added.
+        """
+        with self.connection:
+            if self.connection.execute("SELECT 1 FROM meta WHERE key = 'legacy_presets_imported'").fetchone():
+                return 0
+            added = self._import(presets)
+            self.connection.execute("INSERT INTO meta (key, value) VALUES ('legacy_presets_imported', '1')")
+        return added
+
+    def _import(self, presets):
+        added = 0
+        for name, preset_data in presets:
+            if name not in self:
+                self._append(name, json.dumps(preset_data, ensure_ascii=False))
+                added += 1
+        return added
+
+    def _append(self, name, data):
+        self.connection.execute(
+            "INSERT INTO presets (name, position, data) "
+            "VALUES (?, (SELECT COALESCE(MAX(position), 0) + 1 FROM presets), ?)",
+            (name, data)
+        )
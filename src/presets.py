@@ -0,0 +1,63 @@
+import json
+import math
+
+from .disc_spec import DiscSpec
+
+
+# Preset values that must be greater than zero, and those that may also be zero
+POSITIVE_DISC_VALUES = ('diameter',)
+NON_NEGATIVE_DISC_VALUES = ('spindle_diameter', 'outer_circle_width', 'ring_separation')
+POSITIVE_RING_VALUES = ('rpm', 'hz', 'depth', 'dot_size')
+RING_CHOICES = {
+    'shape_type': ('lines', 'dots'),
+    'density': ('normal', 'double'),
+}
+
+
+def load_preset_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def disc_spec_from_preset(preset_data):
+    """Build a DiscSpec from a preset (the get_current_settings() schema)"""
+    if not isinstance(preset_data, dict):
+        raise ValueError("A preset must be a JSON object")
+    validate_preset(preset_data)
+
+    disc_spec = DiscSpec.from_preset(preset_data)
+    if not disc_spec.rings:
+        raise ValueError("The preset has no rings")
+    return disc_spec
+
+
+def check_number(value, name, allow_zero=False):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{name} must be a number (got {value!r})")
+    if value < 0 or (value == 0 and not allow_zero):
+        limit = "zero or positive" if allow_zero else "greater than zero"
+        raise ValueError(f"{name} must be {limit} (got {value!r})")
+
+
+def validate_preset(preset_data):
+    """Reject preset values the disc calculation cannot work with.
+
+    Only the keys present are checked, missing ones take the DiscSpec and
+    RingSpec defaults.
+    """
+    for key in POSITIVE_DISC_VALUES + NON_NEGATIVE_DISC_VALUES:
+        if key in preset_data:
+            check_number(preset_data[key], key, allow_zero=key in NON_NEGATIVE_DISC_VALUES)
+
+    rings = preset_data.get('rings', [])
+    if not isinstance(rings, list):
+        raise ValueError("rings must be a list")
+    for number, ring in enumerate(rings, 1):
+        if not isinstance(ring, dict):
+            raise ValueError(f"Ring {number} must be a JSON object")
+        for key in POSITIVE_RING_VALUES:
+            if key in ring:
+                check_number(ring[key], f"Ring {number} {key}")
+        for key, choices in RING_CHOICES.items():
+            if key in ring and ring[key] not in choices:
+                raise ValueError(f"Ring {number} {key} must be one of {', '.join(choices)} (got {ring[key]!r})")
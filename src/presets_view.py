@@ -0,0 +1,212 @@
+"""
+Presets list model and delegate
+
+The Presets tab shows the saved presets through a QListView: the model
+holds only the preset names, and the delegate paints each visible row
+(name plus load/save/rename/delete buttons) and hit-tests the buttons
+itself, so no widgets are created per preset. Saving, renaming and
+deleting update the affected row only, found through a name to row
+index instead of a scan of the list.
+"""
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, Signal
+from PySide6.QtGui import QColor, QFont
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QToolTip
+
+
+PRESET_ROW_HEIGHT = 90
+PRESET_ROW_MARGIN = 8
+PRESET_NAME_SPACING = 5
+PRESET_NAME_FONT_SIZE_PX = 13
+
+PRESET_BUTTON_SIZE = 26
+PRESET_BUTTON_SPACING = 3
+PRESET_BUTTON_RADIUS = 2
+PRESET_BUTTON_FONT_SIZE_PX = 12
+
+# action, icon, translation key of the tooltip, colour, hover colour
+PRESET_BUTTONS = (
+    ('load', "📂", 'load', "#3c6d96", "#4a7397"),
+    ('save', "💾", 'save', "#3c6d96", "#4a7397"),
+    ('rename', "✏️", 'rename', "#3c6d96", "#4a7397"),
+    ('delete', "🗑️", 'delete', "#a2352a", "#86271e"),
+)
+
+
+class PresetListModel(QAbstractListModel):
+    """Preset names in store order"""
+
+    def __init__(self, preset_store, parent=None):
+        super().__init__(parent)
+        self.preset_store = preset_store
+        self.names = []
+        # name -> row, kept in step with names
+        self.rows = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        return self.names[index.row()]
+
+    def reload(self):
+        self.beginResetModel()
+        self.names = self.preset_store.names()
+        self.rows = {name: row for row, name in enumerate(self.names)}
+        self.endResetModel()
+
+    def preset_saved(self, name):
+        # Saving over an existing preset keeps its row, the name is all a row shows
+        if name not in self.rows:
+            row = len(self.names)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.names.append(name)
+            self.rows[name] = row
+            self.endInsertRows()
+
+    def preset_renamed(self, name, new_name):
+        if new_name in self.rows:
+            self.preset_deleted(new_name)
+        row = self.rows.pop(name)
+        self.names[row] = new_name
+        self.rows[new_name] = row
+        self.dataChanged.emit(self.index(row), self.index(row))
+
+    def preset_deleted(self, name):
+        row = self.rows[name]
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.names[row]
+        del self.rows[name]
+        # Only the rows after the deleted one move up
+        for later_row in range(row, len(self.names)):
+            self.rows[self.names[later_row]] = later_row
+        self.endRemoveRows()
+
+
+class PresetItemDelegate(QStyledItemDelegate):
+    """Paints a preset row and turns clicks on its buttons into button_clicked(name, action)"""
+
+    button_clicked = Signal(str, str)
+
+    def __init__(self, tr_func, parent=None):
+        super().__init__(parent)
+        self.tr = tr_func
+        self.hovered = None
+
+        self.name_font = QFont()
+        self.name_font.setBold(True)
+        self.name_font.setPixelSize(PRESET_NAME_FONT_SIZE_PX)
+        self.button_font = QFont()
+        self.button_font.setPixelSize(PRESET_BUTTON_FONT_SIZE_PX)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), PRESET_ROW_HEIGHT)
+
+    def content_rect(self, rect):
+        return rect.adjusted(PRESET_ROW_MARGIN, PRESET_ROW_MARGIN, -PRESET_ROW_MARGIN, -PRESET_ROW_MARGIN)
+
+    def button_rects(self, rect):
+        """Rectangles of the row's buttons, right aligned under the name"""
+        content = self.content_rect(rect)
+        top = content.top() + PRESET_NAME_FONT_SIZE_PX + 2 * PRESET_NAME_SPACING
+        left = content.right() + 1 - len(PRESET_BUTTONS) * (PRESET_BUTTON_SIZE + PRESET_BUTTON_SPACING) + PRESET_BUTTON_SPACING
+        return [
+            QRect(left + i * (PRESET_BUTTON_SIZE + PRESET_BUTTON_SPACING), top, PRESET_BUTTON_SIZE, PRESET_BUTTON_SIZE)
+            for i in range(len(PRESET_BUTTONS))
+        ]
+
+    def button_at(self, rect, position):
+        for button, button_rect in zip(PRESET_BUTTONS, self.button_rects(rect)):
+            if button_rect.contains(position):
+                return button
+        return None
+
+    def paint(self, painter, option, index):
+        self.initStyleOption(option, index)
+        widget = option.widget
+        style = widget.style() if widget else None
+        # The row background (hover, selection) still comes from the style sheet
+        if style:
+            style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, widget)
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+
+        content = self.content_rect(option.rect)
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("#ffffff"))
+        name = painter.fontMetrics().elidedText(index.data(), Qt.TextElideMode.ElideRight, content.width())
+        painter.drawText(content, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, name)
+
+        painter.setFont(self.button_font)
+        painter.setPen(Qt.PenStyle.NoPen)
+        for button, button_rect in zip(PRESET_BUTTONS, self.button_rects(option.rect)):
+            action, icon, _, colour, hover_colour = button
+            is_hovered = self.hovered == (index.row(), action)
+            painter.setBrush(QColor(hover_colour if is_hovered else colour))
+            painter.drawRoundedRect(button_rect, PRESET_BUTTON_RADIUS, PRESET_BUTTON_RADIUS)
+            painter.setPen(QColor("#ffffff"))
+            painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, icon)
+            painter.setPen(Qt.PenStyle.NoPen)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type not in (QEvent.Type.MouseMove, QEvent.Type.MouseButtonPress,
+                              QEvent.Type.MouseButtonRelease, QEvent.Type.MouseButtonDblClick):
+            return False
+
+        button = self.button_at(option.rect, event.position().toPoint())
+        hovered = (index.row(), button[0]) if button else None
+        if hovered != self.hovered:
+            self.hovered = hovered
+            if option.widget:
+                option.widget.viewport().update()
+
+        if button is None:
+            return False
+        if event_type == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            self.button_clicked.emit(index.data(), button[0])
+        # Presses on a button do not select the row
+        return True
+
+    def helpEvent(self, event, view, option, index):
+        button = self.button_at(option.rect, event.pos())
+        if button is None:
+            QToolTip.hideText()
+            return False
+        QToolTip.showText(event.globalPos(), self.tr(button[2]), view)
+        return True
+
+
+class PresetListView(QListView):
+    """List view of a PresetListModel, painted by a PresetItemDelegate"""
+
+    def __init__(self, delegate, parent=None):
+        super().__init__(parent)
+        self.delegate = delegate
+        self.setItemDelegate(delegate)
+        # Every row has the same height, the view never measures them one by one
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+
+    def setModel(self, model):
+        super().setModel(model)
+        # The hovered button is kept by row, which another preset may take
+        # once rows come or go; the next mouse move finds it again
+        model.rowsRemoved.connect(self.clear_hover)
+        model.rowsInserted.connect(self.clear_hover)
+        model.modelReset.connect(self.clear_hover)
+
+    def clear_hover(self):
+        if self.delegate.hovered is not None:
+            self.delegate.hovered = None
+            self.viewport().update()
+
+    def leaveEvent(self, event):
+        self.clear_hover()
+        super().leaveEvent(event)
@@ -0,0 +1,78 @@
+import math
+
+from PySide6.QtCore import Qt, QByteArray, QRectF
+from PySide6.QtGui import QPainter, QPixmap
+from PySide6.QtWidgets import QWidget
+
+
+# SVG previews are rasterized at the widget's device size rounded up to a
+# multiple of this (in device pixels), so small resizes reuse the pixmap
+PREVIEW_SIZE_BUCKET = 32
+
+
+class PreviewWidget(QWidget):
+    """Shows the disc preview from a cached pixmap.
+
+    The content is either an SVG document or an already rasterized QImage.
+    It is rasterized once per content change and size bucket at the
+    screen's device pixel ratio; repaints, exposes and tab switches only
+    blit the cached pixmap.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.svg_renderer = None
+        self.pixmap = None
+        self.pixmap_key = None
+
+    def load_svg(self, content):
+        # QtSvg is only loaded when the SVG preview renderer is selected
+        from PySide6.QtSvg import QSvgRenderer
+
+        self.svg_renderer = QSvgRenderer(QByteArray(content))
+        self.pixmap = None
+        self.pixmap_key = None
+        self.update()
+
+    def set_image(self, image):
+        # Rasterized previews are drawn at their own size, the conversion is the only cost
+        self.svg_renderer = None
+        self.pixmap = QPixmap.fromImage(image)
+        self.pixmap_key = None
+        self.update()
+
+    def cached_pixmap(self):
+        if self.svg_renderer is None:
+            return self.pixmap
+
+        device_pixel_ratio = self.devicePixelRatioF()
+        key = (
+            self.size_bucket(self.width() * device_pixel_ratio),
+            self.size_bucket(self.height() * device_pixel_ratio),
+            device_pixel_ratio,
+        )
+        if key != self.pixmap_key:
+            width, height, _ = key
+            pixmap = QPixmap(width, height)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            self.svg_renderer.render(painter, QRectF(0, 0, width, height))
+            painter.end()
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+            self.pixmap = pixmap
+            self.pixmap_key = key
+        return self.pixmap
+
+    @staticmethod
+    def size_bucket(pixels):
+        return max(PREVIEW_SIZE_BUCKET, math.ceil(pixels / PREVIEW_SIZE_BUCKET) * PREVIEW_SIZE_BUCKET)
+
+    def paintEvent(self, event):
+        pixmap = self.cached_pixmap()
+        if pixmap is None:
+            return
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawPixmap(self.rect(), pixmap)
+        painter.end()
@@ -0,0 +1,138 @@
+import time
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+from PySide6.QtGui import QImage, QPainter
+
+from .polar_raster import render_greyscale
+from .raster_export import draw_disc_text
+from .startup import profile_span
+from .svg_generator import GenerationCancelled
+
+
+# Bounds of the preview debounce interval (in ms), overridable in the config file
+PREVIEW_DEBOUNCE_MIN_MS = 40
+PREVIEW_DEBOUNCE_MAX_MS = 1500
+
+# Interval used until the first preview has been timed (the former fixed delay)
+PREVIEW_DEBOUNCE_INITIAL_MS = 300
+
+# Segment sets with a pitch below this many preview pixels are drawn as grey
+# annuli while editing, and in full once editing pauses for the detail delay
+PREVIEW_LOD_MIN_PITCH_PX = 1.0
+PREVIEW_DETAIL_DELAY_MS = 800
+
+# How the preview is drawn, selectable with the "preview_renderer" config key
+PREVIEW_RENDERER_RASTER = 'raster'  # analytic polar rasterizer, shown as an image
+PREVIEW_RENDERER_SVG = 'svg'  # SVG document rasterized by the preview widget
+
+
+class AdaptiveDebounce:
+    """Pick the preview debounce interval from recent generation latency.
+
+    Cheap discs refresh almost immediately while typing, expensive ones
+    wait long enough that edits coalesce instead of queueing renders.
+    """
+    
+    def __init__(self, minimum_ms=PREVIEW_DEBOUNCE_MIN_MS, maximum_ms=PREVIEW_DEBOUNCE_MAX_MS,
+                 factor=1.5, smoothing=0.4):
+        self.minimum_ms = minimum_ms
+        self.maximum_ms = max(minimum_ms, maximum_ms)
+        self.factor = factor
+        self.smoothing = smoothing
+        self.latency_ms = None
+    
+    def record(self, elapsed_ms):
+        # Exponential moving average, so one outlier does not dominate
+        if self.latency_ms is None:
+            self.latency_ms = elapsed_ms
+        else:
+            self.latency_ms += self.smoothing * (elapsed_ms - self.latency_ms)
+    
+    def interval(self):
+        if self.latency_ms is None:
+            interval = PREVIEW_DEBOUNCE_INITIAL_MS
+        else:
+            interval = self.latency_ms * self.factor
+        return int(min(max(interval, self.minimum_ms), self.maximum_ms))
+
+
+def render_preview_image(layout, size, device_pixel_ratio=1.0, is_cancelled=None):
+    """Rasterize a disc layout into a size x size greyscale QImage, text included"""
+    pixels = render_greyscale(layout, size, is_cancelled)
+    image = QImage(pixels.data, size, size, size, QImage.Format.Format_Grayscale8).copy()
+    
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    draw_disc_text(painter, layout, size / layout['diameter'])
+    painter.end()
+    
+    image.setDevicePixelRatio(device_pixel_ratio)
+    return image
+
+
+class PreviewSignals(QObject):
+    # generation, svg bytes or QImage, ring layouts, generation time in ms, reduced detail
+    finished = Signal(int, object, object, float, bool)
+    # Emitted after every job, whether it finished or was cancelled
+    done = Signal()
+
+
+class PreviewJob(QRunnable):
+    """Generate the preview document on a worker thread.
+
+    Every job carries the generation number it was submitted with. It gives
+    up between rings as soon as a newer generation exists, and the receiver
+    drops any result that is not the latest one.
+
+    With image_size set, the preview is rasterized into a QImage of that
+    many device pixels. Otherwise an SVG document is generated, and with
+    pixels_per_mm set, detail finer than the preview can show is reduced
+    (see PREVIEW_LOD_MIN_PITCH_PX); None renders everything.
+    """
+
+    def __init__(self, generation, svg_generator, disc_spec, signals, is_current, pixels_per_mm=None,
+                 image_size=None, device_pixel_ratio=1.0):
+        super().__init__()
+        self.generation = generation
+        self.svg_generator = svg_generator
+        self.disc_spec = disc_spec
+        self.signals = signals
+        self.is_current = is_current
+        self.pixels_per_mm = pixels_per_mm
+        self.image_size = image_size
+        self.device_pixel_ratio = device_pixel_ratio
+
+    def is_cancelled(self):
+        return not self.is_current(self.generation)
+
+    def run(self):
+        try:
+            if self.is_cancelled():
+                return
+            start = time.perf_counter()
+            try:
+                with profile_span("preview render", generation=self.generation):
+                    if self.image_size:
+                        content, ring_layouts, reduced = self.render_image()
+                    else:
+                        content, ring_layouts, reduced = self.render_svg()
+            except GenerationCancelled:
+                return
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.signals.finished.emit(self.generation, content, ring_layouts, elapsed_ms, reduced)
+        finally:
+            self.signals.done.emit()
+
+    def render_image(self):
+        layout = self.svg_generator.get_disc_layout(self.disc_spec, is_cancelled=self.is_cancelled)
+        image = render_preview_image(layout, self.image_size, self.device_pixel_ratio, self.is_cancelled)
+        # Coverage is exact at any size, nothing is left to refine later
+        return image, layout['ring_layouts'], False
+
+    def render_svg(self):
+        min_pitch = None
+        if self.pixels_per_mm:
+            min_pitch = PREVIEW_LOD_MIN_PITCH_PX / self.pixels_per_mm
+        return self.svg_generator.generate_preview(
+            self.disc_spec, is_cancelled=self.is_cancelled, min_pitch=min_pitch
+        )
@@ -0,0 +1,339 @@
+"""
+High resolution raster export
+
+Renders a disc layout (see SVGGenerator.get_disc_layout) to an 8 bit
+greyscale PNG or TIFF at print resolution. The image is painted in
+full-width bands on worker threads and each band is compressed and
+appended to the file as soon as it is its turn, so only a few bands are
+ever held in memory, whatever the resolution.
+"""
+
+import os
+import struct
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QFont, QFontMetricsF, QImage, QPainter, QPainterPath, QPen
+
+from .svg_generator import DISC_TEXT_FONT_SIZE, GenerationCancelled
+
+
+RASTER_FORMATS = ("png", "tiff")
+DEFAULT_DPI = 1200
+MM_PER_INCH = 25.4
+CSS_PIXELS_PER_MM = 96 / MM_PER_INCH
+
+# Target size of one band in bytes, bounds memory use per worker
+BAND_BYTES = 8 * 1024 * 1024
+
+# Classic TIFF stores offsets in 32 bits
+TIFF_MAX_OFFSET = 2 ** 32 - 1
+
+ZLIB_LEVEL = 6
+
+
+def raster_format(file_path):
+    extension = os.path.splitext(file_path)[1].lower()
+    return "tiff" if extension in (".tif", ".tiff") else "png"
+
+
+def image_size(layout, dpi):
+    return max(1, round(layout['diameter'] / MM_PER_INCH * dpi))
+
+
+def export_raster(layout, file_path, dpi=DEFAULT_DPI, file_format=None,
+                  workers=None, progress=None, is_cancelled=None):
+    """Write the disc layout as a square greyscale image of dpi pixels per inch.
+
+    progress(done, total) is called after each band is written;
+    is_cancelled is polled between bands and GenerationCancelled is raised
+    (and the partial file removed) once it returns True.
+    """
+    file_format = file_format or raster_format(file_path)
+    if file_format not in RASTER_FORMATS:
+        raise ValueError(f"Unsupported raster format '{file_format}'")
+
+    size = image_size(layout, dpi)
+    band_height = max(16, min(size, BAND_BYTES // size))
+    bands = [(top, min(band_height, size - top)) for top in range(0, size, band_height)]
+    workers = workers or os.cpu_count() or 1
+
+    renderer = BandRenderer(layout, size / layout['diameter'], size)
+    writer_class = PNGWriter if file_format == "png" else TIFFWriter
+
+    try:
+        with open(file_path, 'wb') as f, ThreadPoolExecutor(max_workers=workers) as pool:
+            writer = writer_class(f, size, dpi, band_height, len(bands))
+            writer.start()
+
+            # Keep a couple of bands in flight per worker, never the whole image
+            pending = deque()
+            next_band = 0
+            for index in range(len(bands)):
+                while next_band < len(bands) and len(pending) < workers * 2:
+                    top, rows = bands[next_band]
+                    pending.append(pool.submit(renderer.compressed_band, top, rows, writer.band_encoding))
+                    next_band += 1
+
+                if is_cancelled and is_cancelled():
+                    for future in pending:
+                        future.cancel()
+                    raise GenerationCancelled()
+
+                writer.write_band(*pending.popleft().result())
+                if progress:
+                    progress(index + 1, len(bands))
+
+            writer.end()
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+    return file_path
+
+
+class BandRenderer:
+    """Paint horizontal bands of the disc with QPainter.
+
+    Painter paths are built once per worker thread (they are not safe to
+    share between threads) and reused for every band that thread paints.
+    """
+
+    def __init__(self, layout, scale, size):
+        self.layout = layout
+        self.scale = scale
+        self.size = size
+        self.local = threading.local()
+
+    def _scene(self):
+        scene = getattr(self.local, 'scene', None)
+        if scene is None:
+            scene = self.local.scene = self._build_scene()
+        return scene
+
+    def _build_scene(self):
+        scene = []
+        for segment_sets in self.layout['rings']:
+            for segment_set in segment_sets:
+                path = QPainterPath()
+                if segment_set['shape_type'] == 'lines':
+                    for x1, y1, x2, y2 in zip(segment_set['x1'].tolist(), segment_set['y1'].tolist(),
+                                              segment_set['x2'].tolist(), segment_set['y2'].tolist()):
+                        path.moveTo(x1, y1)
+                        path.lineTo(x2, y2)
+                    pen = QPen(Qt.GlobalColor.black, segment_set['width'])
+                    pen.setCapStyle(Qt.PenCapStyle.FlatCap)
+                    margin = segment_set['width']
+                else:
+                    radius = segment_set['radius']
+                    for cx, cy in zip(segment_set['cx'].tolist(), segment_set['cy'].tolist()):
+                        path.addEllipse(QPointF(cx, cy), radius, radius)
+                    pen = None
+                    margin = 0
+                bounds = path.controlPointRect().adjusted(-margin, -margin, margin, margin)
+                scene.append((path, pen, bounds))
+        return scene
+
+    def render_band(self, top, rows):
+        image = QImage(self.size, rows, QImage.Format.Format_Grayscale8)
+        image.fill(Qt.GlobalColor.white)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.translate(0, -top)
+        painter.scale(self.scale, self.scale)
+
+        # Band extent in mm, segment sets entirely outside it are skipped
+        visible = QRectF(0, top / self.scale, self.layout['diameter'], rows / self.scale)
+        center = QPointF(*self.layout['center'])
+
+        if self.layout['outer_circle']:
+            disc_radius, outer_circle_width = self.layout['outer_circle']
+            painter.setPen(QPen(Qt.GlobalColor.black, outer_circle_width))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawEllipse(center, disc_radius, disc_radius)
+
+        for path, pen, bounds in self._scene():
+            if not bounds.intersects(visible):
+                continue
+            if pen is None:
+                painter.fillPath(path, Qt.GlobalColor.black)
+            else:
+                painter.strokePath(path, pen)
+
+        # Spindle Hole
+        spindle_radius = self.layout['spindle_radius']
+        painter.setPen(QPen(Qt.GlobalColor.black, 0.2))
+        painter.setBrush(Qt.GlobalColor.black)
+        painter.drawEllipse(center, spindle_radius, spindle_radius)
+
+        painter.resetTransform()
+        painter.translate(0, -top)
+        draw_disc_text(painter, self.layout, self.scale)
+
+        painter.end()
+
+        # Copied out, the view would not keep the QImage alive
+        pixels = np.frombuffer(image.constBits(), np.uint8).reshape(rows, image.bytesPerLine())
+        return pixels[:, :self.size].copy()
+
+    def compressed_band(self, top, rows, encoding):
+        return encoding(self.render_band(top, rows))
+
+
+def draw_disc_text(painter, layout, scale):
+    """Draw the disc text in pixels, scale being the number of pixels per mm"""
+    if not layout['text_lines']:
+        return
+
+    # Same font size the SVG renderers resolve "1.5mm" to
+    font = QFont("Arial")
+    font.setPixelSize(max(1, round(DISC_TEXT_FONT_SIZE * CSS_PIXELS_PER_MM * scale)))
+    metrics = QFontMetricsF(font)
+    painter.setFont(font)
+    painter.setPen(Qt.GlobalColor.black)
+    for line, (text_x, text_y) in layout['text_lines']:
+        x = text_x * scale - metrics.horizontalAdvance(line) / 2
+        painter.drawText(QPointF(x, text_y * scale), line)
+
+
+def _png_chunk(chunk_type, data):
+    return (struct.pack('>I', len(data)) + chunk_type + data
+            + struct.pack('>I', zlib.crc32(chunk_type + data)))
+
+
+def _adler32_combine(adler1, adler2, length2):
+    # zlib's adler32_combine(), which Python does not expose
+    base = 65521
+    remainder = length2 % base
+    sum1 = adler1 & 0xffff
+    sum2 = (remainder * sum1) % base
+    sum1 = (sum1 + (adler2 & 0xffff) + base - 1) % base
+    sum2 = (sum2 + (adler1 >> 16) + (adler2 >> 16) + base - remainder) % base
+    return sum1 | (sum2 << 16)
+
+
+class PNGWriter:
+    """Stream a greyscale PNG band by band.
+
+    Bands are deflated independently on the worker threads and ended with
+    a sync flush, so their raw deflate blocks concatenate into one valid
+    zlib stream (the same trick pigz uses).
+    """
+
+    def __init__(self, stream, size, dpi, band_height, band_count):
+        self.stream = stream
+        self.size = size
+        self.dpi = dpi
+        self.adler = 1
+
+    def start(self):
+        pixels_per_metre = round(self.dpi / MM_PER_INCH * 1000)
+        self.stream.write(b'\x89PNG\r\n\x1a\n')
+        self.stream.write(_png_chunk(b'IHDR', struct.pack('>IIBBBBB', self.size, self.size, 8, 0, 0, 0, 0)))
+        self.stream.write(_png_chunk(b'pHYs', struct.pack('>IIB', pixels_per_metre, pixels_per_metre, 1)))
+        # zlib header, default compression
+        self.stream.write(_png_chunk(b'IDAT', b'\x78\x9c'))
+
+    @staticmethod
+    def band_encoding(pixels):
+        # Every row starts with its filter type, 0 (none)
+        rows = np.empty((pixels.shape[0], pixels.shape[1] + 1), np.uint8)
+        rows[:, 0] = 0
+        rows[:, 1:] = pixels
+        raw = rows.tobytes()
+        compressor = zlib.compressobj(ZLIB_LEVEL, zlib.DEFLATED, -15)
+        data = compressor.compress(raw) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data, zlib.adler32(raw), len(raw)
+
+    def write_band(self, data, adler, length):
+        self.adler = _adler32_combine(self.adler, adler, length)
+        self.stream.write(_png_chunk(b'IDAT', data))
+
+    def end(self):
+        # An empty final block, then the checksum of all the raw data
+        self.stream.write(_png_chunk(b'IDAT', b'\x03\x00' + struct.pack('>I', self.adler)))
+        self.stream.write(_png_chunk(b'IEND', b''))
+
+
+class TIFFWriter:
+    """Stream a greyscale, deflate compressed, strip based TIFF.
+
+    Strips are written as they arrive and the directory describing them is
+    appended at the end, then linked from the header.
+    """
+
+    def __init__(self, stream, size, dpi, band_height, band_count):
+        self.stream = stream
+        self.size = size
+        self.dpi = dpi
+        self.band_height = band_height
+        self.offsets = []
+        self.byte_counts = []
+
+    def start(self):
+        # Little endian header, the directory offset is patched in end()
+        self.stream.write(b'II*\x00' + struct.pack('<I', 0))
+
+    @staticmethod
+    def band_encoding(pixels):
+        return (zlib.compress(pixels.tobytes(), ZLIB_LEVEL),)
+
+    def write_band(self, data):
+        if self.stream.tell() + len(data) > TIFF_MAX_OFFSET:
+            raise ValueError("The image is too large for a TIFF file, use PNG instead")
+        self.offsets.append(self.stream.tell())
+        self.byte_counts.append(len(data))
+        self.stream.write(data)
+
+    def _align(self):
+        if self.stream.tell() % 2:
+            self.stream.write(b'\x00')
+        return self.stream.tell()
+
+    def end(self):
+        strip_count = len(self.offsets)
+
+        offsets_at = self._align()
+        self.stream.write(struct.pack(f'<{strip_count}I', *self.offsets))
+        byte_counts_at = self._align()
+        self.stream.write(struct.pack(f'<{strip_count}I', *self.byte_counts))
+        resolution_at = self._align()
+        self.stream.write(struct.pack('<II', round(self.dpi), 1))
+
+        # Tags in ascending order: (tag, type, count, value or offset),
+        # type 3 is SHORT, 4 LONG and 5 RATIONAL
+        entries = [
+            (256, 4, 1, self.size),  # ImageWidth
+            (257, 4, 1, self.size),  # ImageLength
+            (258, 3, 1, 8),  # BitsPerSample
+            (259, 3, 1, 8),  # Compression: deflate
+            (262, 3, 1, 1),  # PhotometricInterpretation: black is zero
+            (273, 4, strip_count, offsets_at if strip_count > 1 else self.offsets[0]),  # StripOffsets
+            (277, 3, 1, 1),  # SamplesPerPixel
+            (278, 4, 1, self.band_height),  # RowsPerStrip
+            (279, 4, strip_count, byte_counts_at if strip_count > 1 else self.byte_counts[0]),  # StripByteCounts
+            (282, 5, 1, resolution_at),  # XResolution
+            (283, 5, 1, resolution_at),  # YResolution
+            (296, 3, 1, 2),  # ResolutionUnit: inch
+        ]
+
+        directory_at = self._align()
+        if directory_at + 2 + 12 * len(entries) + 4 > TIFF_MAX_OFFSET:
+            raise ValueError("The image is too large for a TIFF file, use PNG instead")
+
+        self.stream.write(struct.pack('<H', len(entries)))
+        for tag, value_type, count, value in entries:
+            if value_type == 3 and count == 1:
+                self.stream.write(struct.pack('<HHIHH', tag, value_type, count, value, 0))
+            else:
+                self.stream.write(struct.pack('<HHII', tag, value_type, count, value))
+        self.stream.write(struct.pack('<I', 0))
+
+        self.stream.seek(4)
+        self.stream.write(struct.pack('<I', directory_at))
@@ -1,9 +1,48 @@
-import math
+from contextlib import contextmanager
+
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QDoubleSpinBox, QComboBox, QCheckBox, QFrame, QRadioButton, QButtonGroup
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QSignalBlocker
+
+from .disc_spec import RingSpec, ring_segments
+
+
+# Radius (in mm) the information is shown for until the ring is placed on a disc
+UNPLACED_RING_RADIUS = 100
+
+# Index of each speed in the RPM dropdown, other speeds are entered manually
+RPM_DROPDOWN_INDEXES = {16: 0, 33.33: 1, 45: 2, 78: 3}
+
+# Dot size multipliers offered in the dot size dropdown
+DOT_SIZES = (0.5, 0.75, 1, 1.25, 1.5, 2, 2.5, 3)
+
+
+def placed_ring_segments(spec, outer_radius=None, ring_depth=None):
+    """Segments of a ring where it sits on the disc, or at UNPLACED_RING_RADIUS until it is placed"""
+    radius = outer_radius if outer_radius is not None else UNPLACED_RING_RADIUS
+    ring_depth = ring_depth if ring_depth is not None else spec.depth
+    # Shared with the generator, which asks for the same ring when rendering it
+    return ring_segments(spec.rpm, spec.hz, spec.density, spec.single_mode, radius, ring_depth)
+
+
+def segments_info_lines(segments, tr):
+    """Lines of the ring information: segment count, line width, then the details"""
+    if segments.mode == 'single':
+        return [
+            f"{tr('number_of_segments')}: {segments.outer_num_lines}",
+            f"{tr('line_width')}: {segments.outer_line_width:.2f} mm",
+            f"{tr('ideal')}: {round(segments.num_lines_exact, 3)} {tr('lines_text')}",
+            f"{tr('created')}: {segments.outer_num_lines} ({segments.outer_rpm} {tr('rpm_text')}) {tr('lines_text')}",
+        ]
+    return [
+        f"{tr('number_of_segments')}: {segments.outer_num_lines}/{segments.inner_num_lines}",
+        f"{tr('line_width')}: {segments.outer_line_width:.2f}/{segments.inner_line_width:.2f} mm",
+        f"{tr('ideal')}: {round(segments.num_lines_exact, 3)} {tr('lines_text')}",
+        f"{tr('inner')}: {segments.inner_rpm} {tr('rpm_text')} ({segments.inner_num_lines} {tr('lines_text')})",
+        f"{tr('outer')}: {segments.outer_rpm} {tr('rpm_text')} ({segments.outer_num_lines} {tr('lines_text')})",
+    ]
 
 
 class RingSettings(QWidget):
@@ -15,6 +54,9 @@ class RingSettings(QWidget):
         self.on_move_up = on_move_up
         self.on_move_down = on_move_down
         self.tr = tr_func or (lambda x: x)
+        # Where the ring sits on the disc, set through set_ring_layout
+        self.outer_radius = None
+        self.ring_depth = None
         
         self.setup_ui()
     
@@ -33,68 +75,21 @@ class RingSettings(QWidget):
         font.setBold(True)
         font.setPointSizeF(font.pointSizeF() * 1.5)
         self.title_label.setFont(font)
-        self.title_label.setStyleSheet("color: #569CD6; margin: 0px; padding: 0px; border: none; background: transparent; font-size: 18px; font-weight: bold;")
+        self.title_label.setObjectName("ringTitle")
         self.title_label.setContentsMargins(0, 0, 0, 0)
         
         # Move up button
         move_up_button = QPushButton("▲")
-        move_up_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                color: #ffffff;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 2px 4px;
-                margin: 0px;
-            }
-            QPushButton:hover {
-                color: #cccccc;
-            }
-            QPushButton:pressed {
-                color: #999999;
-            }
-        """)
+        move_up_button.setObjectName("ringMoveButton")
         move_up_button.clicked.connect(self.request_move_up)
         
         # Move down button
         move_down_button = QPushButton("▼")
-        move_down_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                color: #ffffff;
-                font-size: 14px;
-                font-weight: bold;
-                padding: 2px 4px;
-                margin: 0px;
-            }
-            QPushButton:hover {
-                color: #cccccc;
-            }
-            QPushButton:pressed {
-                color: #999999;
-            }
-        """)
+        move_down_button.setObjectName("ringMoveButton")
         move_down_button.clicked.connect(self.request_move_down)
         
         delete_button = QPushButton(self.tr('remove'))
-        delete_button.setStyleSheet("""
-            QPushButton {
-                background-color: transparent;
-                border: none;
-                color: #f85149;
-                text-decoration: underline;
-                font-size: 12px;
-                padding: 2px;
-            }
-            QPushButton:hover {
-                color: #da3633;
-            }
-            QPushButton:pressed {
-                color: #b62324;
-            }
-        """)
+        delete_button.setObjectName("ringDeleteButton")
         delete_button.clicked.connect(self.request_delete)
         
         header_layout.addWidget(self.title_label)
@@ -108,13 +103,12 @@ class RingSettings(QWidget):
         rpm_layout = QHBoxLayout()
         rpm_layout.setSpacing(10)
         self.rpm_label = QLabel(self.tr('rpm_selection'))
-        self.rpm_label.setStyleSheet("font-weight: bold; color: #ffffff; background-color: transparent; border: none; margin: 0px; padding: 0px;")
+        self.rpm_label.setObjectName("fieldLabel")
         self.rpm_label.setContentsMargins(0, 0, 0, 0)
         
         self.rpm_combo = QComboBox()
         self.rpm_combo.addItems(["16", "33⅓", "45", "78"])
         self.rpm_combo.setCurrentIndex(1)
-        self.rpm_combo.setStyleSheet("QComboBox:disabled { color: gray; }")
         self.rpm_combo.currentIndexChanged.connect(self.settings_changed)
         
         rpm_layout.addWidget(self.rpm_label, 1)
@@ -125,30 +119,6 @@ class RingSettings(QWidget):
         manual_layout = QHBoxLayout()
         manual_layout.setSpacing(10)
         self.rpm_manual_check = QCheckBox(self.tr('enter_rpm_manually'))
-        self.rpm_manual_check.setStyleSheet("""
-            QCheckBox {
-                font-weight: 500; 
-                color: #cccccc; 
-                background-color: transparent; 
-                border: none;
-                spacing: 8px;
-            }
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-                border: 2px solid #666666;
-                background-color: #2d2d2d;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #569CD6;
-                border-color: #569CD6;
-                image: url(data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTIiIGhlaWdodD0iMTIiIHZpZXdCb3g9IjAgMCAxMiAxMiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPHBhdGggZD0iTTEwIDNMNC41IDguNUwyIDYiIHN0cm9rZT0iI0ZGRkZGRiIgc3Ryb2tlLXdpZHRoPSIyIiBzdHJva2UtbGluZWNhcD0icm91bmQiIHN0cm9rZS1saW5lam9pbj0icm91bmQiLz4KPC9zdmc+);
-            }
-            QCheckBox::indicator:hover {
-                border-color: #999999;
-            }
-        """)
         self.rpm_manual_check.stateChanged.connect(self.toggle_rpm_input)
         self.rpm_manual_check.stateChanged.connect(self.settings_changed)
         
@@ -168,38 +138,13 @@ class RingSettings(QWidget):
         hz_layout = QHBoxLayout()
         hz_layout.setSpacing(10)
         self.hz_label = QLabel(self.tr('frequency_hz'))
-        self.hz_label.setStyleSheet("font-weight: bold; color: #ffffff; background-color: transparent; border: none; margin: 0px; padding: 0px;")
+        self.hz_label.setObjectName("fieldLabel")
         self.hz_label.setContentsMargins(0, 0, 0, 0)
         
         self.hz_50_radio = QRadioButton("50 Hz")
         self.hz_60_radio = QRadioButton("60 Hz")
         self.hz_60_radio.setChecked(True)  # Default to 60 Hz
         
-        radio_style = """
-            QRadioButton {
-                color: #cccccc;
-                font-weight: 500;
-                spacing: 10px;
-            }
-            QRadioButton::indicator {
-                width: 14px;
-                height: 14px;
-                border: 2px solid #666666;
-                background-color: #2d2d2d;
-                border-radius: 7px;
-            }
-            QRadioButton::indicator:checked {
-                background-color: #569CD6;
-                border-color: #569CD6;
-            }
-            QRadioButton::indicator:hover {
-                border-color: #999999;
-            }
-        """
-        
-        self.hz_50_radio.setStyleSheet(radio_style)
-        self.hz_60_radio.setStyleSheet(radio_style)
-        
         self.hz_button_group = QButtonGroup()
         self.hz_button_group.addButton(self.hz_50_radio, 0)
         self.hz_button_group.addButton(self.hz_60_radio, 1)
@@ -217,7 +162,7 @@ class RingSettings(QWidget):
         depth_layout = QHBoxLayout()
         depth_layout.setSpacing(10)
         self.depth_label = QLabel(self.tr('ring_depth'))
-        self.depth_label.setStyleSheet("font-weight: bold; color: #ffffff; background-color: transparent; border: none; margin: 0px; padding: 0px;")
+        self.depth_label.setObjectName("fieldLabel")
         self.depth_label.setContentsMargins(0, 0, 0, 0)
         
         self.depth_input = QDoubleSpinBox()
@@ -234,16 +179,13 @@ class RingSettings(QWidget):
         mode_layout = QHBoxLayout()
         mode_layout.setSpacing(10)
         self.mode_label = QLabel(self.tr('ring_mode'))
-        self.mode_label.setStyleSheet("font-weight: bold; color: #ffffff; background-color: transparent; border: none; margin: 0px; padding: 0px;")
+        self.mode_label.setObjectName("fieldLabel")
         self.mode_label.setContentsMargins(0, 0, 0, 0)
         
         self.mode_single_radio = QRadioButton(self.tr('single_ring'))
         self.mode_dual_radio = QRadioButton(self.tr('dual_rings'))
         self.mode_single_radio.setChecked(True)  # Default to single ring
         
-        self.mode_single_radio.setStyleSheet(radio_style)
-        self.mode_dual_radio.setStyleSheet(radio_style)
-        
         self.mode_button_group = QButtonGroup()
         self.mode_button_group.addButton(self.mode_single_radio, 0)
         self.mode_button_group.addButton(self.mode_dual_radio, 1)
@@ -261,16 +203,13 @@ class RingSettings(QWidget):
         shape_layout = QHBoxLayout()
         shape_layout.setSpacing(10)
         self.shape_label = QLabel(self.tr('shape_type'))
-        self.shape_label.setStyleSheet("font-weight: bold; color: #ffffff; background-color: transparent; border: none; margin: 0px; padding: 0px;")
+        self.shape_label.setObjectName("fieldLabel")
         self.shape_label.setContentsMargins(0, 0, 0, 0)
         
         self.shape_lines_radio = QRadioButton(self.tr('lines'))
         self.shape_dots_radio = QRadioButton(self.tr('dots'))
         self.shape_lines_radio.setChecked(True)  # Default to lines
         
-        self.shape_lines_radio.setStyleSheet(radio_style)
-        self.shape_dots_radio.setStyleSheet(radio_style)
-        
         self.shape_button_group = QButtonGroup()
         self.shape_button_group.addButton(self.shape_lines_radio, 0)
         self.shape_button_group.addButton(self.shape_dots_radio, 1)
@@ -289,11 +228,11 @@ class RingSettings(QWidget):
         self.dot_size_layout = QHBoxLayout()
         self.dot_size_layout.setSpacing(10)
         self.dot_size_label = QLabel(self.tr('dot_size'))
-        self.dot_size_label.setStyleSheet("font-weight: bold; color: #ffffff; background-color: transparent; border: none; margin: 0px; padding: 0px;")
+        self.dot_size_label.setObjectName("fieldLabel")
         self.dot_size_label.setContentsMargins(0, 0, 0, 0)
         
         self.dot_size_combo = QComboBox()
-        self.dot_size_combo.addItems(["0.5x", "0.75x", "1x", "1.25x", "1.5x", "2x", "2.5x", "3x"])
+        self.dot_size_combo.addItems([f"{size:g}x" for size in DOT_SIZES])
         self.dot_size_combo.setCurrentIndex(2)
         self.dot_size_combo.currentIndexChanged.connect(self.settings_changed)
         
@@ -305,16 +244,13 @@ class RingSettings(QWidget):
         density_layout = QHBoxLayout()
         density_layout.setSpacing(10)
         self.density_label = QLabel(self.tr('density'))
-        self.density_label.setStyleSheet("font-weight: bold; color: #ffffff; background-color: transparent; border: none; margin: 0px; padding: 0px;")
+        self.density_label.setObjectName("fieldLabel")
         self.density_label.setContentsMargins(0, 0, 0, 0)
         
         self.density_double_radio = QRadioButton(self.tr('double'))
         self.density_normal_radio = QRadioButton(self.tr('normal'))
         self.density_double_radio.setChecked(True)  # Default to double density
         
-        self.density_double_radio.setStyleSheet(radio_style)
-        self.density_normal_radio.setStyleSheet(radio_style)
-        
         self.density_button_group = QButtonGroup()
         self.density_button_group.addButton(self.density_double_radio, 0)
         self.density_button_group.addButton(self.density_normal_radio, 1)
@@ -334,28 +270,11 @@ class RingSettings(QWidget):
         info_layout.setContentsMargins(0, 8, 0, 0)
         
         self.info_title_label = QLabel(self.tr('ring_information'))
-        self.info_title_label.setStyleSheet("""
-            color: #ffffff;
-            font-weight: bold;
-            font-size: 13px;
-            background-color: transparent;
-            border: none;
-            padding: 0px;
-            margin: 0px;
-        """)
+        self.info_title_label.setObjectName("ringInfoTitle")
         info_layout.addWidget(self.info_title_label)
         
         self.combined_info_label = QLabel()
-        self.combined_info_label.setStyleSheet("""
-            color: #cccccc; 
-            font-size: 12px; 
-            font-weight: normal;
-            line-height: 1.3;
-            padding: 0px;
-            background-color: transparent;
-            border: none;
-            margin: 0px;
-        """)
+        self.combined_info_label.setObjectName("ringInfo")
         self.combined_info_label.setWordWrap(True)
         info_layout.addWidget(self.combined_info_label)
         
@@ -366,14 +285,17 @@ class RingSettings(QWidget):
         self.separator = QFrame()
         self.separator.setFrameShape(QFrame.Shape.HLine)
         self.separator.setFrameShadow(QFrame.Shadow.Plain)
-        self.separator.setStyleSheet("QFrame { background-color: #808080; border: none; height: 1px; }")
+        self.separator.setObjectName("ringSeparator")
         self.separator.setFixedHeight(1)
         frame_layout.addWidget(self.separator)
         frame_layout.addSpacing(20)
         
         main_layout.addLayout(frame_layout)
         
-        self.update_segments_info()
+        # A ring owned by a window is placed (and its information shown) by
+        # it through set_ring_layout
+        if self.on_change is None:
+            self.update_segments_info()
         self.update_dot_size_visibility()
     
     def toggle_rpm_input(self, state):
@@ -408,73 +330,93 @@ class RingSettings(QWidget):
     def get_depth_value(self):
         return self.depth_input.value()
     
-    def lines_to_rpm(self, num_lines, frequency):
-        density_factor = 2 if self.density_double_radio.isChecked() else 1
-        rpm = (60 * frequency * density_factor) / num_lines
-        return round(rpm, 3)
+    def setting_controls(self):
+        return (
+            self.rpm_combo, self.rpm_manual_check, self.rpm_input, self.hz_button_group,
+            self.depth_input, self.mode_button_group, self.shape_button_group,
+            self.dot_size_combo, self.density_button_group
+        )
     
-    def calculate_segments_and_line_width(self, radius):
-        rpm = self.get_rpm_value()
-        hz = self.get_hz_value()
-        
-        density_factor = 2 if self.density_double_radio.isChecked() else 1
-        num_lines_exact = (60 * hz) / rpm * density_factor
-        
-        num_lines_floor = math.floor(num_lines_exact)
-        num_lines_floor_rpm = self.lines_to_rpm(num_lines_floor, hz)
-        num_lines_ceil = math.ceil(num_lines_exact)
-        num_lines_ceil_rpm = self.lines_to_rpm(num_lines_ceil, hz)
-        
-        num_lines_rpm = 0
-        
-        if num_lines_floor == num_lines_ceil or self.mode_single_radio.isChecked():
-            if (num_lines_floor == num_lines_ceil):
-                num_lines = num_lines_floor
+    @contextmanager
+    def bulk_update(self):
+        """Change several settings as one edit.
+
+        The controls' signals are blocked meanwhile; afterwards the
+        dependent controls are refreshed and a single change is reported.
+        """
+        blockers = [QSignalBlocker(control) for control in self.setting_controls()]
+        try:
+            yield
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+            self.update_control_states()
+            self.settings_changed()
+    
+    def apply_settings(self, settings):
+        """Set every control from a preset ring (the get_settings() schema)"""
+        with self.bulk_update():
+            rpm_value = settings.get('rpm', 33.33)
+            if rpm_value in RPM_DROPDOWN_INDEXES:
+                self.rpm_manual_check.setChecked(False)
+                self.rpm_combo.setCurrentIndex(RPM_DROPDOWN_INDEXES[rpm_value])
             else:
-                num_lines = round(num_lines_exact)
-            num_lines_rpm = self.lines_to_rpm(num_lines, hz)
-        else:
-            num_lines = 0
-        
-        segment_width = (2 * math.pi * radius) / max(num_lines, 1)
-        line_width = segment_width / 2
-        
-        return (num_lines_exact, num_lines, num_lines_rpm, line_width, 
-                num_lines_floor, num_lines_ceil, num_lines_floor_rpm, num_lines_ceil_rpm)
+                self.rpm_manual_check.setChecked(True)
+                self.rpm_input.setValue(rpm_value)
+            
+            if settings.get('hz', 60) == 50:
+                self.hz_50_radio.setChecked(True)
+            else:
+                self.hz_60_radio.setChecked(True)
+            
+            self.depth_input.setValue(settings.get('depth', 8))
+            
+            if settings.get('single_mode', True):
+                self.mode_single_radio.setChecked(True)
+            else:
+                self.mode_dual_radio.setChecked(True)
+            
+            if settings.get('shape_type', 'lines') == 'lines':
+                self.shape_lines_radio.setChecked(True)
+            else:
+                self.shape_dots_radio.setChecked(True)
+            
+            # Looked up by value, saved sizes are floats ("2.0") and the items are not ("2x")
+            dot_size = settings.get('dot_size', 1)
+            if dot_size in DOT_SIZES:
+                self.dot_size_combo.setCurrentIndex(DOT_SIZES.index(dot_size))
+            
+            if settings.get('density', 'double') == 'double':
+                self.density_double_radio.setChecked(True)
+            else:
+                self.density_normal_radio.setChecked(True)
     
-    def update_segments_info(self, radius=None):
-        if radius is None:
-            radius = 100
-        
-        (num_lines_exact, num_lines, num_lines_rpm, line_width,
-         num_lines_floor, num_lines_ceil, num_lines_floor_rpm, num_lines_ceil_rpm) = self.calculate_segments_and_line_width(radius)
-        
-        if num_lines_floor == num_lines_ceil or self.mode_single_radio.isChecked():
-            segments_text = f"{self.tr('number_of_segments')}: {num_lines}"
-            details_text = [
-                f"{self.tr('ideal')}: {round(num_lines_exact, 3)} {self.tr('lines_text')}",
-                f"{self.tr('created')}: {num_lines} ({num_lines_rpm} {self.tr('rpm_text')}) {self.tr('lines_text')}",
-            ]
-        else:
-            segments_text = f"{self.tr('number_of_segments')}: {num_lines_floor}/{num_lines_ceil}"
-            details_text = [
-                f"{self.tr('ideal')}: {round(num_lines_exact, 3)} {self.tr('lines_text')}",
-                f"{self.tr('inner')}: {num_lines_ceil_rpm} {self.tr('rpm_text')} ({num_lines_ceil} {self.tr('lines_text')})",
-                f"{self.tr('outer')}: {num_lines_floor_rpm} {self.tr('rpm_text')} ({num_lines_floor} {self.tr('lines_text')})",
-            ]
-        
-        combined_text = [
-            segments_text,
-            f"{self.tr('line_width')}: {line_width:.2f} mm",
-            "\n".join(details_text)
-        ]
-        
-        self.combined_info_label.setText("\n".join(combined_text))
+    def update_control_states(self):
+        # What toggle_rpm_input and the shape buttons do when their signals fire
+        is_manual = self.rpm_manual_check.isChecked()
+        self.rpm_input.setEnabled(is_manual)
+        self.rpm_input.setVisible(is_manual)
+        self.rpm_combo.setEnabled(not is_manual)
+        self.update_dot_size_visibility()
     
-    def settings_changed(self):
+    def set_ring_layout(self, outer_radius, ring_depth):
+        self.outer_radius = outer_radius
+        self.ring_depth = ring_depth
         self.update_segments_info()
+    
+    def update_segments_info(self):
+        segments = placed_ring_segments(self.get_spec(), self.outer_radius, self.ring_depth)
+        combined_text = "\n".join(segments_info_lines(segments, self.tr))
+        if combined_text != self.combined_info_label.text():
+            self.combined_info_label.setText(combined_text)
+    
+    def settings_changed(self):
+        # The main window refreshes the information of every ring, a change
+        # here can move the rings inside it
         if self.on_change:
             self.on_change()
+        else:
+            self.update_segments_info()
     
     def request_delete(self):
         if self.on_delete:
@@ -493,6 +435,10 @@ class RingSettings(QWidget):
         self.dot_size_label.setVisible(is_dots)
         self.dot_size_combo.setVisible(is_dots)
     
+    def set_index(self, index):
+        self.index = index
+        self.title_label.setText(f"{self.tr('ring')} {index + 1}")
+    
     def update_language(self, language):
         self.title_label.setText(f"{self.tr('ring')} {self.index + 1}")
         
@@ -528,4 +474,7 @@ class RingSettings(QWidget):
             'shape_type': 'lines' if self.shape_lines_radio.isChecked() else 'dots',
             'dot_size': float(self.dot_size_combo.currentText().replace('x', '')),
             'density': 'double' if self.density_double_radio.isChecked() else 'normal'
-        }
\ No newline at end of file
+        }
+    
+    def get_spec(self):
+        return RingSpec.from_settings(self.get_settings())
@@ -0,0 +1,401 @@
+"""
+Rings list model, delegate and view
+
+The rings of the disc are RingSpec values in a RingListModel, shown
+through a QListView. Every ring is painted as a compact row (title,
+move/remove buttons, a summary of its settings and its segments); only
+the current ring gets a RingSettings editor, opened when it becomes
+current and closed when another ring does. Adding, removing and moving
+rings change model rows only, so a disc with hundreds of rings still has
+a single editor and moving a ring rebuilds no widget.
+"""
+
+from PySide6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QPersistentModelIndex, QRect, QSize, QEvent, Signal
+)
+from PySide6.QtGui import QColor, QFont, QFontMetrics
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle
+
+from .ring_settings import RingSettings, placed_ring_segments, segments_info_lines
+
+
+RING_SPEC_ROLE = Qt.ItemDataRole.UserRole
+# (outer radius, depth) of the ring on the disc, None until it is placed
+RING_LAYOUT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+RING_ROW_MARGIN_LEFT = 5
+RING_ROW_MARGIN_RIGHT = 15
+RING_ROW_MARGIN_TOP = 8
+RING_ROW_LINE_SPACING = 6
+RING_ROW_SEPARATOR_SPACING = 14
+
+RING_TITLE_FONT_SIZE_PX = 18
+RING_SUMMARY_FONT_SIZE_PX = 13
+RING_INFO_FONT_SIZE_PX = 12
+RING_BUTTON_PADDING = 4
+RING_BUTTON_SPACING = 6
+
+# Ring information lines shown on a row, the editor shows them all
+RING_ROW_INFO_LINES = 2
+
+# action, text (None: the translated "remove"), font size, colour, hover colour
+RING_BUTTONS = (
+    ('move_up', "▲", 14, "#ffffff", "#cccccc"),
+    ('move_down', "▼", 14, "#ffffff", "#cccccc"),
+    ('delete', None, 12, "#f85149", "#da3633"),
+)
+
+RING_ROW_HOVER_COLOUR = "#2d2d2d"
+RING_TITLE_COLOUR = "#569CD6"
+RING_TEXT_COLOUR = "#ffffff"
+RING_INFO_COLOUR = "#cccccc"
+RING_SEPARATOR_COLOUR = "#808080"
+
+
+def rpm_text(rpm):
+    return "33⅓" if rpm == 33.33 else f"{rpm:g}"
+
+
+class RingListModel(QAbstractListModel):
+    """Ring specs in disc order, with where each ring was placed on the disc"""
+
+    # A ring was added, removed, moved or edited; placing rings is not a change
+    rings_changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.specs = []
+        self.layouts = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.specs)
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == RING_SPEC_ROLE:
+            return self.specs[index.row()]
+        if role == RING_LAYOUT_ROLE:
+            return self.layouts[index.row()]
+        return None
+
+    def setData(self, index, value, role=RING_SPEC_ROLE):
+        if not index.isValid() or role != RING_SPEC_ROLE:
+            return False
+        if value != self.specs[index.row()]:
+            self.specs[index.row()] = value
+            self.dataChanged.emit(index, index, [RING_SPEC_ROLE])
+            self.rings_changed.emit()
+        return True
+
+    def set_specs(self, specs):
+        self.beginResetModel()
+        self.specs = list(specs)
+        self.layouts = [None] * len(self.specs)
+        self.endResetModel()
+        self.rings_changed.emit()
+
+    def append(self, spec):
+        """Add a ring after the others, returns its row"""
+        row = len(self.specs)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.specs.append(spec)
+        self.layouts.append(None)
+        self.endInsertRows()
+        self.rings_changed.emit()
+        return row
+
+    def remove(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.specs[row]
+        del self.layouts[row]
+        self.endRemoveRows()
+        self.rings_changed.emit()
+
+    def move(self, row, new_row):
+        """Move a ring to new_row, views keep its editor and selection"""
+        if row == new_row or not (0 <= row < len(self.specs) and 0 <= new_row < len(self.specs)):
+            return False
+        # beginMoveRows takes the row the ring goes before, counted before the move
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), new_row + 1 if new_row > row else new_row)
+        self.specs.insert(new_row, self.specs.pop(row))
+        self.layouts.insert(new_row, self.layouts.pop(row))
+        self.endMoveRows()
+        self.rings_changed.emit()
+        return True
+
+    def set_ring_layouts(self, layouts):
+        """Store where each ring was placed, only the rows that moved are updated"""
+        for row, layout in enumerate(layouts):
+            if layout != self.layouts[row]:
+                self.layouts[row] = layout
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [RING_LAYOUT_ROLE])
+
+
+class RingItemDelegate(QStyledItemDelegate):
+    """Paints ring rows and edits the current ring with a RingSettings.
+
+    Clicks on the move/remove buttons, painted or in the editor, become
+    button_clicked(row, action).
+    """
+
+    button_clicked = Signal(int, str)
+
+    def __init__(self, tr_func, parent=None):
+        super().__init__(parent)
+        self.tr = tr_func
+        self.hovered = None
+        # Editor -> persistent index of its ring
+        self.editor_indexes = {}
+        self.setting_editor_data = False
+
+        self.title_font = QFont()
+        self.title_font.setBold(True)
+        self.title_font.setPixelSize(RING_TITLE_FONT_SIZE_PX)
+        self.summary_font = QFont()
+        self.summary_font.setPixelSize(RING_SUMMARY_FONT_SIZE_PX)
+        self.info_font = QFont()
+        self.info_font.setPixelSize(RING_INFO_FONT_SIZE_PX)
+        self.button_fonts = {}
+        for action, _, font_size, _, _ in RING_BUTTONS:
+            font = QFont()
+            font.setPixelSize(font_size)
+            font.setBold(action != 'delete')
+            font.setUnderline(action == 'delete')
+            self.button_fonts[action] = font
+
+        self.title_height = QFontMetrics(self.title_font).height()
+        self.summary_height = QFontMetrics(self.summary_font).height()
+        self.info_height = QFontMetrics(self.info_font).height()
+        self.row_height = (
+            RING_ROW_MARGIN_TOP + self.title_height + RING_ROW_LINE_SPACING + self.summary_height
+            + RING_ROW_LINE_SPACING + RING_ROW_INFO_LINES * self.info_height + 2 * RING_ROW_SEPARATOR_SPACING + 1
+        )
+
+    def content_rect(self, rect):
+        return rect.adjusted(RING_ROW_MARGIN_LEFT, RING_ROW_MARGIN_TOP, -RING_ROW_MARGIN_RIGHT, 0)
+
+    def button_text(self, button):
+        return button[1] if button[1] is not None else self.tr('remove')
+
+    def button_rects(self, rect):
+        """Rectangles of the row's buttons, right aligned on the title line"""
+        content = self.content_rect(rect)
+        rects = []
+        right = content.right() + 1
+        for button in reversed(RING_BUTTONS):
+            width = QFontMetrics(self.button_fonts[button[0]]).horizontalAdvance(self.button_text(button))
+            width += 2 * RING_BUTTON_PADDING
+            rects.append(QRect(right - width, content.top(), width, self.title_height))
+            right -= width + RING_BUTTON_SPACING
+        return rects[::-1]
+
+    def button_at(self, rect, position):
+        for button, button_rect in zip(RING_BUTTONS, self.button_rects(rect)):
+            if button_rect.contains(position):
+                return button
+        return None
+
+    def summary_text(self, spec):
+        parts = [
+            f"{rpm_text(spec.rpm)} {self.tr('rpm_text')}",
+            f"{spec.hz:g} Hz",
+            f"{spec.depth:.1f} mm",
+            self.tr('single_ring') if spec.single_mode else self.tr('dual_rings'),
+            self.tr('lines') if spec.shape_type == 'lines' else f"{self.tr('dots')} {spec.dot_size:g}x",
+            self.tr('double') if spec.density == 'double' else self.tr('normal'),
+        ]
+        return " · ".join(parts)
+
+    def sizeHint(self, option, index):
+        view = option.widget
+        width = view.viewport().width() if view else option.rect.width()
+        editor = view.indexWidget(index) if view else None
+        if editor is None:
+            return QSize(width, self.row_height)
+        editor_width = width - RING_ROW_MARGIN_LEFT - RING_ROW_MARGIN_RIGHT
+        height = editor.heightForWidth(editor_width) if editor.hasHeightForWidth() else -1
+        if height < 0:
+            height = editor.sizeHint().height()
+        return QSize(width, RING_ROW_MARGIN_TOP + height)
+
+    def paint(self, painter, option, index):
+        view = option.widget
+        # The current ring is covered by its editor
+        if view and view.indexWidget(index) is not None:
+            return
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            painter.fillRect(option.rect, QColor(RING_ROW_HOVER_COLOUR))
+
+        spec = index.data(RING_SPEC_ROLE)
+        layout = index.data(RING_LAYOUT_ROLE) or (None, None)
+        content = self.content_rect(option.rect)
+        buttons = self.button_rects(option.rect)
+
+        painter.setFont(self.title_font)
+        painter.setPen(QColor(RING_TITLE_COLOUR))
+        title_rect = QRect(content.left(), content.top(), buttons[0].left() - content.left(), self.title_height)
+        painter.drawText(title_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         f"{self.tr('ring')} {index.row() + 1}")
+
+        for button, button_rect in zip(RING_BUTTONS, buttons):
+            action, _, _, colour, hover_colour = button
+            painter.setFont(self.button_fonts[action])
+            painter.setPen(QColor(hover_colour if self.hovered == (index.row(), action) else colour))
+            painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, self.button_text(button))
+
+        top = content.top() + self.title_height + RING_ROW_LINE_SPACING
+        painter.setFont(self.summary_font)
+        painter.setPen(QColor(RING_TEXT_COLOUR))
+        summary = painter.fontMetrics().elidedText(self.summary_text(spec), Qt.TextElideMode.ElideRight, content.width())
+        painter.drawText(QRect(content.left(), top, content.width(), self.summary_height),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, summary)
+
+        top += self.summary_height + RING_ROW_LINE_SPACING
+        painter.setFont(self.info_font)
+        painter.setPen(QColor(RING_INFO_COLOUR))
+        lines = segments_info_lines(placed_ring_segments(spec, *layout), self.tr)
+        for line in lines[:RING_ROW_INFO_LINES]:
+            painter.drawText(QRect(content.left(), top, content.width(), self.info_height),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, line)
+            top += self.info_height
+
+        top += RING_ROW_SEPARATOR_SPACING
+        painter.fillRect(QRect(content.left(), top, content.width(), 1), QColor(RING_SEPARATOR_COLOUR))
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        event_type = event.type()
+        if event_type not in (QEvent.Type.MouseMove, QEvent.Type.MouseButtonPress,
+                              QEvent.Type.MouseButtonRelease, QEvent.Type.MouseButtonDblClick):
+            return False
+
+        button = self.button_at(option.rect, event.position().toPoint())
+        hovered = (index.row(), button[0]) if button else None
+        if hovered != self.hovered:
+            self.hovered = hovered
+            if option.widget:
+                option.widget.viewport().update()
+
+        if button is None:
+            return False
+        if event_type == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            self.button_clicked.emit(index.row(), button[0])
+        # Presses on a button do not make the ring current
+        return True
+
+    def createEditor(self, parent, option, index):
+        editor = RingSettings(
+            parent=parent,
+            index=index.row(),
+            on_delete=lambda row: self.button_clicked.emit(row, 'delete'),
+            on_change=lambda: self.editor_changed(editor),
+            tr_func=self.tr,
+            on_move_up=lambda row: self.button_clicked.emit(row, 'move_up'),
+            on_move_down=lambda row: self.button_clicked.emit(row, 'move_down')
+        )
+        self.editor_indexes[editor] = QPersistentModelIndex(index)
+        return editor
+
+    def destroyEditor(self, editor, index):
+        self.editor_indexes.pop(editor, None)
+        super().destroyEditor(editor, index)
+
+    def setEditorData(self, editor, index):
+        # Called for every change of the ring, including the editor's own:
+        # the controls are only set when the model holds something else
+        spec = index.data(RING_SPEC_ROLE)
+        if editor.get_spec() != spec:
+            self.setting_editor_data = True
+            try:
+                editor.apply_settings(spec.to_settings())
+            finally:
+                self.setting_editor_data = False
+        editor.set_ring_layout(*(index.data(RING_LAYOUT_ROLE) or (None, None)))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.get_spec(), RING_SPEC_ROLE)
+
+    def editor_changed(self, editor):
+        if not self.setting_editor_data:
+            self.commitData.emit(editor)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect.adjusted(RING_ROW_MARGIN_LEFT, RING_ROW_MARGIN_TOP, -RING_ROW_MARGIN_RIGHT, 0))
+
+    def eventFilter(self, editor, event):
+        # The editor grows and shrinks with its settings (dot size, dual ring
+        # information) and its row follows. Keys and focus changes are left to
+        # the editor: it commits every change itself and is never closed by them
+        if event.type() == QEvent.Type.LayoutRequest and editor in self.editor_indexes:
+            index = QModelIndex(self.editor_indexes[editor])
+            if index.isValid():
+                self.sizeHintChanged.emit(index)
+        return False
+
+
+class RingListView(QListView):
+    """List view of a RingListModel, the current ring is open in an editor"""
+
+    def __init__(self, delegate, parent=None):
+        super().__init__(parent)
+        self.delegate = delegate
+        self.setItemDelegate(delegate)
+        self.setMouseTracking(True)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        # Rows follow the width, the editor wraps its information
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+
+    def setModel(self, model):
+        super().setModel(model)
+        self.selectionModel().currentChanged.connect(self.open_current_editor)
+        model.rowsMoved.connect(self.renumber_editor)
+        model.rowsRemoved.connect(self.renumber_editor)
+        model.rowsInserted.connect(self.renumber_editor)
+        # The hovered button is kept by row, which another ring may take
+        for signal in (model.rowsMoved, model.rowsRemoved, model.rowsInserted, model.modelReset):
+            signal.connect(self.clear_hover)
+
+    def open_current_editor(self, current, previous):
+        if previous.isValid() and self.isPersistentEditorOpen(previous):
+            self.closePersistentEditor(previous)
+            self.delegate.sizeHintChanged.emit(previous)
+        if current.isValid():
+            self.openPersistentEditor(current)
+            self.delegate.sizeHintChanged.emit(current)
+            self.scrollTo(current)
+
+    def current_editor(self):
+        index = self.currentIndex()
+        return self.indexWidget(index) if index.isValid() else None
+
+    def renumber_editor(self, *_):
+        editor = self.current_editor()
+        if editor is not None and editor.index != self.currentIndex().row():
+            editor.set_index(self.currentIndex().row())
+
+    def update_language(self, language):
+        editor = self.current_editor()
+        if editor is not None:
+            editor.update_language(language)
+        self.viewport().update()
+
+    def clear_hover(self):
+        if self.delegate.hovered is not None:
+            self.delegate.hovered = None
+            self.viewport().update()
+
+    def leaveEvent(self, event):
+        self.clear_hover()
+        super().leaveEvent(event)
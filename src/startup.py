@@ -0,0 +1,167 @@
+"""
+Startup timing
+
+start.py and the main window wrap each startup phase in profile_span().
+The spans cost nothing unless a StartupProfiler is active:
+
+    STROBODISC_STARTUP_REPORT=1 python start.py
+        prints the top level phases to stderr once the first preview is shown
+
+    python start.py --profile-startup[=DIR]
+    STROBODISC_PROFILE_STARTUP=DIR python start.py
+        also writes startup-profile.json (every span, nested) and
+        startup-trace.json (Chrome trace format, open it in chrome://tracing
+        or https://ui.perfetto.dev) to DIR, the current directory by default
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+
+STARTUP_REPORT_ENV = "STROBODISC_STARTUP_REPORT"
+PROFILE_STARTUP_ENV = "STROBODISC_PROFILE_STARTUP"
+PROFILE_STARTUP_OPTION = "--profile-startup"
+
+PROFILE_REPORT_FILE = "startup-profile.json"
+PROFILE_TRACE_FILE = "startup-trace.json"
+
+_active_profiler = None
+
+
+class StartupProfiler:
+    """Nested, timed startup spans"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []
+        # Spans nest per thread, the preview is rendered on a worker
+        self.local = threading.local()
+
+    @contextmanager
+    def span(self, name, **args):
+        start = time.perf_counter()
+        depth = getattr(self.local, 'depth', 0)
+        self.local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self.local.depth = depth
+            self.add_span(name, start, time.perf_counter(), depth, **args)
+
+    def add_span(self, name, start, end, depth=0, **args):
+        """Record a span measured elsewhere, start and end are perf_counter() values"""
+        self.spans.append({
+            'name': name,
+            'start_ms': (start - self.origin) * 1000,
+            'duration_ms': (end - start) * 1000,
+            'depth': depth,
+            'thread': threading.current_thread().name,
+            'args': args,
+        })
+
+    def total_ms(self):
+        return max((span['start_ms'] + span['duration_ms'] for span in self.spans), default=0)
+
+    def report(self):
+        spans = sorted(self.spans, key=lambda span: (span['start_ms'], span['depth']))
+        return {
+            'total_ms': round(self.total_ms(), 3),
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            # Nuitka defines __compiled__ in every module it compiles
+            'compiled': '__compiled__' in globals(),
+            'spans': [
+                dict(span, start_ms=round(span['start_ms'], 3), duration_ms=round(span['duration_ms'], 3))
+                for span in spans
+            ],
+        }
+
+    def summary(self):
+        """One line with the outermost phases of the main thread"""
+        main_thread = threading.main_thread().name
+        spans = [span for span in self.spans if span['thread'] == main_thread]
+
+        def contains(outer, inner):
+            return (outer is not inner and outer['start_ms'] <= inner['start_ms']
+                    and inner['start_ms'] + inner['duration_ms'] <= outer['start_ms'] + outer['duration_ms'])
+
+        phases = ", ".join(
+            f"{span['name']} {span['duration_ms']:.0f} ms"
+            for span in sorted(spans, key=lambda span: span['start_ms'])
+            if not any(contains(outer, span) for outer in spans)
+        )
+        return f"Startup: {phases} (total {self.total_ms():.0f} ms)"
+
+    def chrome_trace(self):
+        threads = {}
+        events = []
+        for span in self.spans:
+            thread_id = threads.setdefault(span['thread'], len(threads) + 1)
+            events.append({
+                'name': span['name'],
+                'cat': 'startup',
+                'ph': 'X',
+                'ts': round(span['start_ms'] * 1000, 1),
+                'dur': round(span['duration_ms'] * 1000, 1),
+                'pid': os.getpid(),
+                'tid': thread_id,
+                'args': span['args'],
+            })
+        for name, thread_id in threads.items():
+            events.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': thread_id, 'args': {'name': name}
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, directory):
+        """Write the JSON report and the Chrome trace, return their paths"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        report_path = directory / PROFILE_REPORT_FILE
+        trace_path = directory / PROFILE_TRACE_FILE
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+        return report_path, trace_path
+
+
+def profile_startup_directory(argv):
+    """Remove the profiling option from argv and return the output directory, or None"""
+    directory = os.environ.get(PROFILE_STARTUP_ENV) or None
+    for argument in list(argv[1:]):
+        if argument == PROFILE_STARTUP_OPTION:
+            directory = directory or "."
+            argv.remove(argument)
+        elif argument.startswith(PROFILE_STARTUP_OPTION + "="):
+            directory = argument.split("=", 1)[1] or "."
+            argv.remove(argument)
+    return directory
+
+
+def start_profiling():
+    global _active_profiler
+    _active_profiler = StartupProfiler()
+    return _active_profiler
+
+
+def stop_profiling():
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    return profiler
+
+
+def active_profiler():
+    return _active_profiler
+
+
+def profile_span(name, **args):
+    """Time a startup phase while profiling, do nothing otherwise"""
+    if _active_profiler is None:
+        return nullcontext()
+    return _active_profiler.span(name, **args)
@@ -1,80 +1,225 @@
-import math
-import tempfile
-import svgwrite
+import io
+import threading
+from collections import OrderedDict
+
+from .disc_spec import calculate_ring_lines, layout_disc
+from .geometry import compute_ring_geometry, segment_set_annulus, segment_set_pitch
+from .svg_writer import (
+    SVGStreamWriter, DEFAULT_PRECISION, COMPACT_PRECISION, ENCODING_ELEMENTS, ENCODING_PATHS
+)
+
+
+# Font size is fixed regardless of disc size (in mm)
+DISC_TEXT_FONT_SIZE = 1.5
+
+# Number of rings whose geometry and SVG fragments are kept between generations
+RING_CACHE_SIZE = 64
+
+
+class GenerationCancelled(Exception):
+    """Raised when a generation is abandoned because its result is no longer needed"""
+
+
+class RingCache:
+    """Least recently used cache of per-ring geometry and SVG fragments"""
+    
+    def __init__(self, max_size=RING_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+    
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry
+    
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+    
+    def clear(self):
+        self.entries.clear()
 
 
 class SVGGenerator:
-    def __init__(self):
-        self.temp_svg_file = None
+    def __init__(self, cache_size=RING_CACHE_SIZE):
+        self.ring_cache = RingCache(cache_size)
+        # Generations may run on worker threads, the cache is shared between them
+        self.lock = threading.Lock()
     
-    def calculate_lines_for_ring(self, ring_widget, radius, ring_depth):
-        settings = ring_widget.get_settings()
-        rpm = settings['rpm']
-        hz = settings['hz']
-        single_mode = settings['single_mode']
-        shape_type = settings['shape_type']
-        density = settings['density']
-        dot_size = settings['dot_size']
-        
-        ring_widget.update_segments_info(radius)
-        
-        density_factor = 2 if density == "double" else 1
-        num_lines_exact = (60 * hz) / rpm * density_factor
-        
-        num_lines_floor = math.floor(num_lines_exact)
-        num_lines_ceil = math.ceil(num_lines_exact)
-        
-        if num_lines_floor == num_lines_ceil or single_mode:
-            if num_lines_floor == num_lines_ceil:
-                num_lines = num_lines_floor
-            else:
-                num_lines = round(num_lines_exact)
+    def build_disc_layout(self, disc_spec, is_cancelled=None):
+        """Compute everything that gets drawn on the disc, independent of the output format.
+
+        is_cancelled is polled between rings and GenerationCancelled is
+        raised once it returns True.
+        """
+        outer_circle, ring_layouts = layout_disc(disc_spec)
+        
+        rings = []
+        for ring_layout in ring_layouts:
+            if is_cancelled and is_cancelled():
+                raise GenerationCancelled()
             
-            circumference = 2 * math.pi * radius
-            line_width = circumference / (num_lines * 2)
+            # Only rings whose settings or position changed are rebuilt, the
+            # rest reuse their cached geometry
+            entry = self.ring_cache.get(ring_layout)
+            if entry is None:
+                lines_info = calculate_ring_lines(ring_layout.spec, ring_layout.outer_radius, ring_layout.depth)
+                entry = {
+                    'segment_sets': compute_ring_geometry(
+                        lines_info, ring_layout.center, ring_layout.outer_radius,
+                        ring_layout.inner_radius, ring_layout.depth
+                    ),
+                    'fragments': {},
+                }
+                self.ring_cache.put(ring_layout, entry)
             
-            return {
-                'mode': 'single',
-                'num_lines': num_lines,
-                'line_width': line_width,
-                'shape_type': shape_type,
-                'dot_size': dot_size
-            }
-        else:
-            outer_circumference = 2 * math.pi * radius
-            inner_circumference = 2 * math.pi * (radius - ring_depth)
+            rings.append(entry['segment_sets'])
+        
+        return {
+            'diameter': disc_spec.diameter,
+            'center': disc_spec.center,
+            'outer_circle': outer_circle,
+            'rings': rings,
+            'ring_layouts': ring_layouts,
+            'spindle_radius': disc_spec.spindle_diameter / 2,
+            'text_lines': self._layout_disc_text(disc_spec),
+        }
+    
+    def get_disc_layout(self, disc_spec, is_cancelled=None):
+        """Thread-safe build_disc_layout, for backends that draw the layout themselves"""
+        with self.lock:
+            return self.build_disc_layout(disc_spec, is_cancelled)
+
+    def generate_disc(self, disc_spec, validated=False, encoding=ENCODING_ELEMENTS,
+                      precision=None, filename=None):
+        """Generate the disc as an SVG document.
+
+        The document is returned as UTF-8 bytes, so previews never touch the
+        disk; when filename is given it is written there instead and the
+        path is returned.
+
+        By default the document is streamed without building any element
+        objects. With validated=True it is built through svgwrite, which
+        checks every attribute against the "tiny" profile (much slower on
+        dense discs, and only available for the 'elements' encoding).
+
+        encoding='paths' writes each segment set as one compound <path> and
+        encoding='dasharray' as one dashed <circle>; precision sets the
+        number of decimals used for coordinates.
+        """
+        if validated and encoding != ENCODING_ELEMENTS:
+            raise ValueError("Validated output only supports the 'elements' encoding")
+        
+        with self.lock:
+            layout = self.build_disc_layout(disc_spec)
             
-            outer_line_width = outer_circumference / (num_lines_floor * 2)
-            inner_line_width = inner_circumference / (num_lines_ceil * 2)
+            if filename is None:
+                stream = io.StringIO()
+                self._write_document(layout, stream, validated, encoding, precision)
+                return stream.getvalue().encode('utf-8')
             
-            return {
-                'mode': 'double',
-                'outer_num_lines': num_lines_floor,
-                'outer_line_width': outer_line_width,
-                'inner_num_lines': num_lines_ceil,
-                'inner_line_width': inner_line_width,
-                'shape_type': shape_type,
-                'dot_size': dot_size
-            }
+            with open(filename, 'w', encoding='utf-8') as f:
+                self._write_document(layout, f, validated, encoding, precision)
+            return filename
+    
+    def generate_preview(self, disc_spec, is_cancelled=None, min_pitch=None):
+        """Generate the preview document, safe to call from a worker thread.
+
+        Segment sets whose pitch is below min_pitch (in mm, typically one
+        preview pixel) are drawn as a grey annulus of the same coverage.
+
+        Returns (svg bytes, ring layouts, whether any set was reduced).
+        Raises GenerationCancelled as soon as is_cancelled returns True.
+        """
+        with self.lock:
+            layout = self.build_disc_layout(disc_spec, is_cancelled)
+            stream = io.StringIO()
+            reduced = self.write_layout(layout, stream, min_pitch=min_pitch)
+            return stream.getvalue().encode('utf-8'), layout['ring_layouts'], reduced
+    
+    def _write_document(self, layout, stream, validated, encoding, precision):
+        if validated:
+            self._write_with_svgwrite(layout, stream)
+        else:
+            self.write_layout(layout, stream, encoding, precision)
     
-    def generate_disc(self, diameter, spindle_diameter, outer_circle_width, 
-                     ring_separation, ring_widgets, disc_text=None):
-        self.temp_svg_file = tempfile.NamedTemporaryFile(suffix=".svg", delete=False)
-        self.temp_svg_file.close()
+    def write_layout(self, layout, stream, encoding=ENCODING_ELEMENTS, precision=None, min_pitch=None):
+        """Stream a disc layout as an SVG document to a text file or buffer.
+
+        Returns True when segment sets were reduced to annuli (see
+        generate_preview).
+        """
+        if precision is None:
+            precision = COMPACT_PRECISION if encoding == ENCODING_PATHS else DEFAULT_PRECISION
+        writer = SVGStreamWriter(stream, layout['diameter'], precision)
+        center = layout['center']
+        
+        writer.start()
+        
+        if layout['outer_circle']:
+            disc_radius, outer_circle_width = layout['outer_circle']
+            writer.circle(center, disc_radius, fill='none', stroke='black', stroke_width=outer_circle_width)
+        
+        reduced = False
+        for ring_layout, segment_sets in zip(layout['ring_layouts'], layout['rings']):
+            collapsed = tuple(
+                min_pitch is not None and segment_set_pitch(segment_set) < min_pitch
+                for segment_set in segment_sets
+            )
+            reduced = reduced or any(collapsed)
+            stream.write(self._ring_fragment(
+                ring_layout, segment_sets, layout['diameter'], encoding, precision, collapsed
+            ))
+        
+        # Spindle Hole
+        writer.circle(center, layout['spindle_radius'], fill='black', stroke='black', stroke_width=0.2)
+        
+        for line, insert in layout['text_lines']:
+            writer.text(line, insert, font_size=f"{DISC_TEXT_FONT_SIZE}mm", font_family="Arial,sans-serif")
+        
+        writer.end()
+        return reduced
+    
+    def _ring_fragment(self, ring_layout, segment_sets, diameter, encoding, precision, collapsed):
+        """Return the SVG markup of one ring, reusing it while the ring is cached.
+
+        collapsed flags, per segment set, the sets drawn as a grey annulus.
+        """
+        entry = self.ring_cache.entries.get(ring_layout)
+        fragments = entry['fragments'] if entry is not None else {}
+        
+        fragment = fragments.get((encoding, precision, collapsed))
+        if fragment is None:
+            buffer = io.StringIO()
+            writer = SVGStreamWriter(buffer, diameter, precision)
+            for segment_set, is_collapsed in zip(segment_sets, collapsed):
+                if is_collapsed:
+                    writer.annulus(segment_set['center'], *segment_set_annulus(segment_set))
+                else:
+                    writer.segment_set(segment_set, encoding)
+            fragment = buffer.getvalue()
+            fragments[(encoding, precision, collapsed)] = fragment
+        return fragment
+    
+    def _write_with_svgwrite(self, layout, stream):
+        # svgwrite is slow to import and only needed for validated output
+        import svgwrite
+        
+        diameter = layout['diameter']
+        center = layout['center']
         
         dwg = svgwrite.Drawing(
-            self.temp_svg_file.name,
             size=(f"{diameter}mm", f"{diameter}mm"),
             profile="tiny",
             viewBox=f"0 0 {diameter} {diameter}",
         )
         
-        center = (diameter / 2, diameter / 2)
-        
-        # Draw Outer Circle
-        disc_radius = diameter / 2 - (outer_circle_width / 2 if outer_circle_width > 0 else 0)
-        
-        if outer_circle_width > 0:
+        if layout['outer_circle']:
+            disc_radius, outer_circle_width = layout['outer_circle']
             dwg.add(dwg.circle(
                 center=center, 
                 r=disc_radius, 
@@ -82,166 +227,68 @@ class SVGGenerator:
                 stroke='black', 
                 stroke_width=outer_circle_width
             ))
-            
-        current_radius = disc_radius - (outer_circle_width / 2 if outer_circle_width > 0 else 0)
         
-        # Draw each ring from outside to inside
-        for i, ring_widget in enumerate(ring_widgets):
-            settings = ring_widget.get_settings()
-            ring_depth = settings['depth']
-            
-            inner_radius = current_radius - ring_depth
-            
-            if inner_radius < spindle_diameter / 2:
-                inner_radius = spindle_diameter / 2
-                ring_depth = current_radius - inner_radius
-            
-            lines_info = self.calculate_lines_for_ring(ring_widget, current_radius, ring_depth)
-            
-            if lines_info['mode'] == 'single':
-                self._draw_single_ring(dwg, center, lines_info, current_radius, inner_radius)
-            else:
-                self._draw_double_ring(dwg, center, lines_info, current_radius, inner_radius, ring_depth)
-            
-            current_radius = inner_radius - ring_separation
+        for segment_sets in layout['rings']:
+            self._draw_segment_sets(dwg, segment_sets)
         
         # Draw Spindle Hole
         dwg.add(dwg.circle(
             center=center, 
-            r=spindle_diameter/2, 
+            r=layout['spindle_radius'], 
             fill='black', 
             stroke='black', 
             stroke_width=0.2
         ))
         
-        # Draw text positioning
-        if disc_text:
-            self._draw_disc_text(dwg, center, diameter, spindle_diameter, disc_text)
+        for line, insert in layout['text_lines']:
+            dwg.add(dwg.text(
+                line, 
+                insert=insert,
+                text_anchor="middle",
+                font_size=f"{DISC_TEXT_FONT_SIZE}mm",
+                font_family="Arial,sans-serif",
+                fill="black"
+            ))
         
-        dwg.save()
-        return self.temp_svg_file.name
+        dwg.write(stream)
     
-    def _draw_single_ring(self, dwg, center, lines_info, current_radius, inner_radius):
-        num_lines = lines_info['num_lines']
-        line_width = lines_info['line_width']
-        shape_type = lines_info['shape_type']
-        dot_size = lines_info['dot_size']
-        
-        angle_increment = 360 / num_lines
+    def _draw_segment_sets(self, dwg, segment_sets):
+        import svgwrite
         
-        for j in range(num_lines):
-            angle = math.radians(j * angle_increment)
-            
-            if shape_type == 'lines':
-                x1 = center[0] + current_radius * math.sin(angle)
-                y1 = center[1] - (current_radius * math.cos(angle))
-                
-                x2 = center[0] + inner_radius * math.sin(angle)
-                y2 = center[1] - (inner_radius * math.cos(angle))
-                
-                dwg.add(dwg.line((x1, y1), (x2, y2), stroke=svgwrite.rgb(0, 0, 0, "%"), stroke_width=line_width))
+        for segment_set in segment_sets:
+            if segment_set['shape_type'] == 'lines':
+                stroke = svgwrite.rgb(0, 0, 0, "%")
+                line_width = segment_set['width']
+                for x1, y1, x2, y2 in zip(segment_set['x1'].tolist(), segment_set['y1'].tolist(),
+                                          segment_set['x2'].tolist(), segment_set['y2'].tolist()):
+                    dwg.add(dwg.line((x1, y1), (x2, y2), stroke=stroke, stroke_width=line_width))
             else:
-                mid_radius = (current_radius + inner_radius) / 2
-                dot_x = center[0] + mid_radius * math.sin(angle)
-                dot_y = center[1] - (mid_radius * math.cos(angle))
-                
-                dot_radius = (line_width / 2) * dot_size
-                
-                dwg.add(dwg.circle(center=(dot_x, dot_y), r=dot_radius, fill='black'))
+                dot_radius = segment_set['radius']
+                for dot_x, dot_y in zip(segment_set['cx'].tolist(), segment_set['cy'].tolist()):
+                    dwg.add(dwg.circle(center=(dot_x, dot_y), r=dot_radius, fill='black'))
     
-    def _draw_double_ring(self, dwg, center, lines_info, current_radius, inner_radius, ring_depth):
-        shape_type = lines_info['shape_type']
-        
-        # Outer set
-        outer_num_lines = lines_info['outer_num_lines']
-        outer_line_width = lines_info['outer_line_width']
-        
-        angle_increment_outer = 360 / outer_num_lines
-        
-        for j in range(outer_num_lines):
-            angle = math.radians(j * angle_increment_outer)
-            
-            if shape_type == 'lines':
-                x1 = center[0] + current_radius * math.sin(angle)
-                y1 = center[1] - (current_radius * math.cos(angle))
-                
-                mid_radius = current_radius - ring_depth / 2
-                x2 = center[0] + mid_radius * math.sin(angle)
-                y2 = center[1] - (mid_radius * math.cos(angle))
-                
-                dwg.add(dwg.line((x1, y1), (x2, y2), stroke=svgwrite.rgb(0, 0, 0, "%"), stroke_width=outer_line_width))
-            else:
-                outer_dot_radius = current_radius - ring_depth / 4
-                dot_x = center[0] + outer_dot_radius * math.sin(angle)
-                dot_y = center[1] - (outer_dot_radius * math.cos(angle))
-                
-                dot_size = lines_info['dot_size']
-                dot_radius = (outer_line_width / 2) * dot_size
-                
-                dwg.add(dwg.circle(center=(dot_x, dot_y), r=dot_radius, fill='black'))
-        
-        # Inner set
-        inner_num_lines = lines_info['inner_num_lines']
-        inner_line_width = lines_info['inner_line_width']
-        
-        angle_increment_inner = 360 / inner_num_lines
-        
-        for j in range(inner_num_lines):
-            angle = math.radians(j * angle_increment_inner)
-            
-            if shape_type == 'lines':
-                mid_radius = current_radius - ring_depth / 2
-                x1 = center[0] + mid_radius * math.sin(angle)
-                y1 = center[1] - (mid_radius * math.cos(angle))
-                
-                x2 = center[0] + inner_radius * math.sin(angle)
-                y2 = center[1] - (inner_radius * math.cos(angle))
-                
-                dwg.add(dwg.line((x1, y1), (x2, y2), stroke=svgwrite.rgb(0, 0, 0, "%"), stroke_width=inner_line_width))
-            else:
-                inner_dot_radius = inner_radius + ring_depth / 4
-                dot_x = center[0] + inner_dot_radius * math.sin(angle)
-                dot_y = center[1] - (inner_dot_radius * math.cos(angle))
-                
-                dot_size = lines_info['dot_size']
-                dot_radius = (inner_line_width / 2) * dot_size
-                
-                dwg.add(dwg.circle(center=(dot_x, dot_y), r=dot_radius, fill='black'))
-    
-    def _draw_disc_text(self, dwg, center, diameter, spindle_diameter, disc_text):
-        """Draw text at specified positions relative to the spindle center"""
-        center_x, center_y = center
-        
-        # Font size is fixed regardless of disc size
-        font_size = 1.5  # Fixed font size in mm (reduced to half)
+    def _layout_disc_text(self, disc_spec):
+        """Return (line, (x, y)) text positions relative to the spindle center"""
+        center_x, center_y = disc_spec.center
+        spindle_diameter = disc_spec.spindle_diameter
+        font_size = DISC_TEXT_FONT_SIZE
+        text_lines = []
         
         # Top text: centered above spindle, grows upward (lines reversed for proper visual order)
-        if disc_text.get('top', '').strip():
-            lines = disc_text['top'].strip().split('\n')
+        if disc_spec.text_top.strip():
+            lines = disc_spec.text_top.strip().split('\n')
             lines = [line for line in lines if line.strip()]  # Filter empty lines
             lines.reverse()  # Reverse order so first line appears closest to spindle
             for i, line in enumerate(lines):
                 text_y = center_y - (spindle_diameter/2) - (font_size * 3.0) - (i * font_size * 3.5)
-                dwg.add(dwg.text(
-                    line, 
-                    insert=(center_x, text_y),
-                    text_anchor="middle",
-                    font_size=f"{font_size}mm",
-                    font_family="Arial,sans-serif",
-                    fill="black"
-                ))
+                text_lines.append((line, (center_x, text_y)))
         
         # Bottom text: centered below spindle, grows downward
-        if disc_text.get('bottom', '').strip():
-            lines = disc_text['bottom'].strip().split('\n')
+        if disc_spec.text_bottom.strip():
+            lines = disc_spec.text_bottom.strip().split('\n')
             for i, line in enumerate(lines):
                 if line.strip():
                     text_y = center_y + (spindle_diameter/2) + (font_size * 6.0) + (i * font_size * 3.5)
-                    dwg.add(dwg.text(
-                        line, 
-                        insert=(center_x, text_y),
-                        text_anchor="middle",
-                        font_size=f"{font_size}mm",
-                        font_family="Arial,sans-serif",
-                        fill="black"
-                    ))
\ No newline at end of file
+                    text_lines.append((line, (center_x, text_y)))
+        
+        return text_lines
@@ -0,0 +1,177 @@
+import math
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+
+
+# svgwrite's "tiny" profile rounds every number to 4 decimals
+DEFAULT_PRECISION = 4
+
+# Compact path output defaults to micrometre precision (coordinates are in mm)
+COMPACT_PRECISION = 3
+
+# Number of elements formatted per write() call
+CHUNK_SIZE = 4096
+
+# Length of the round capped dashes that draw dots in the dasharray encoding (in mm)
+DOT_DASH_LENGTH = 1e-4
+
+# How each segment set is encoded in the document
+ENCODING_ELEMENTS = 'elements'  # one <line> or <circle> per segment
+ENCODING_PATHS = 'paths'  # one compound <path> per segment set
+ENCODING_DASHARRAY = 'dasharray'  # one dashed <circle> per segment set
+ENCODINGS = (ENCODING_ELEMENTS, ENCODING_PATHS, ENCODING_DASHARRAY)
+
+
+class SVGStreamWriter:
+    """Write an SVG document straight to a text stream.
+
+    Elements are formatted in chunks from the geometry arrays, without
+    building a per-element object tree or validating attributes.
+    """
+
+    def __init__(self, stream, diameter, precision=DEFAULT_PRECISION):
+        self.stream = stream
+        self.diameter = diameter
+        self.precision = precision
+
+    def _numbers(self, *arrays):
+        # Interleave the arrays column-wise and convert to Python floats so that
+        # "%r" gives the same short representation svgwrite writes
+        stacked = np.column_stack(arrays)
+        return np.round(stacked, self.precision).ravel().tolist()
+
+    def _number(self, value):
+        return repr(round(float(value), self.precision))
+
+    @staticmethod
+    def _exact_number(value):
+        return repr(float(value))
+
+    def _write_repeated(self, template, values, per_element):
+        step = CHUNK_SIZE * per_element
+        for start in range(0, len(values), step):
+            chunk = values[start:start + step]
+            self.stream.write((template * (len(chunk) // per_element)) % tuple(chunk))
+
+    def start(self):
+        diameter = self.diameter
+        self.stream.write(
+            '<?xml version="1.0" encoding="utf-8" ?>\n'
+            f'<svg baseProfile="tiny" height="{diameter}mm" version="1.2" '
+            f'viewBox="0 0 {diameter} {diameter}" width="{diameter}mm" '
+            'xmlns="http://www.w3.org/2000/svg" '
+            'xmlns:ev="http://www.w3.org/2001/xml-events" '
+            'xmlns:xlink="http://www.w3.org/1999/xlink"><defs />'
+        )
+
+    def end(self):
+        self.stream.write('</svg>')
+
+    def circle(self, center, r, fill, stroke=None, stroke_width=None):
+        attributes = (
+            f'cx="{self._number(center[0])}" cy="{self._number(center[1])}" '
+            f'fill="{fill}" r="{self._number(r)}"'
+        )
+        if stroke is not None:
+            attributes += f' stroke="{stroke}" stroke-width="{self._number(stroke_width)}"'
+        self.stream.write(f'<circle {attributes} />')
+
+    def annulus(self, center, radius, width, coverage):
+        # A ring of uniform grey standing in for segments too small to resolve
+        self.stream.write(
+            f'<circle cx="{self._number(center[0])}" cy="{self._number(center[1])}" '
+            f'fill="none" r="{self._number(radius)}" stroke="black" '
+            f'stroke-opacity="{self._number(coverage)}" stroke-width="{self._number(width)}" />'
+        )
+
+    def segment_set(self, segment_set, encoding=ENCODING_ELEMENTS):
+        if encoding == ENCODING_PATHS:
+            self._segment_set_path(segment_set)
+        elif encoding == ENCODING_DASHARRAY:
+            self._segment_set_dasharray(segment_set)
+        elif segment_set['shape_type'] == 'lines':
+            stroke_width = self._number(segment_set['width'])
+            template = (
+                f'<line stroke="rgb(0%%,0%%,0%%)" stroke-width="{stroke_width}" '
+                'x1="%r" x2="%r" y1="%r" y2="%r" />'
+            )
+            values = self._numbers(segment_set['x1'], segment_set['x2'],
+                                   segment_set['y1'], segment_set['y2'])
+            self._write_repeated(template, values, 4)
+        else:
+            radius = self._number(segment_set['radius'])
+            template = f'<circle cx="%r" cy="%r" fill="black" r="{radius}" />'
+            values = self._numbers(segment_set['cx'], segment_set['cy'])
+            self._write_repeated(template, values, 2)
+
+    def _segment_set_path(self, segment_set):
+        # A single subpath per segment, all sharing the styling of the <path>
+        if segment_set['shape_type'] == 'lines':
+            stroke_width = self._number(segment_set['width'])
+            self.stream.write(f'<path fill="none" stroke="black" stroke-width="{stroke_width}" d="')
+            values = self._numbers(segment_set['x1'], segment_set['y1'],
+                                   segment_set['x2'] - segment_set['x1'],
+                                   segment_set['y2'] - segment_set['y1'])
+            self._write_repeated('M%r %rl%r %r', values, 4)
+        else:
+            # Each dot is drawn as two half-circle arcs starting at its leftmost point
+            radius = segment_set['radius']
+            r = self._number(radius)
+            diameter = self._number(2 * radius)
+            self.stream.write('<path fill="black" d="')
+            values = self._numbers(segment_set['cx'] - radius, segment_set['cy'])
+            self._write_repeated(f'M%r %ra{r} {r} 0 1 0 {diameter} 0a{r} {r} 0 1 0 -{diameter} 0z', values, 2)
+        self.stream.write('" />')
+
+    def _segment_set_dasharray(self, segment_set):
+        # The whole set becomes one circle whose dash pattern repeats once per
+        # segment, so its size no longer depends on the number of segments.
+        # The circle is rotated so that its path starts half a pitch before
+        # 12 o'clock, in the middle of a gap: the first dash is then centred
+        # at 12 o'clock like the explicit geometry, and the point where the
+        # path closes falls between two dashes.
+        # The dash pattern repeats once per segment, so rounding it would add
+        # up around the ring: it is written at full precision, for the radius
+        # as written, and closes exactly on the circle.
+        center_x, center_y = segment_set['center']
+        num_segments = segment_set['num_segments']
+        cx = self._number(center_x)
+        cy = self._number(center_y)
+        rotation = self._exact_number(-90 - 180 / num_segments)
+        
+        if segment_set['shape_type'] == 'lines':
+            start_radius = segment_set['start_radius']
+            end_radius = segment_set['end_radius']
+            radius = (start_radius + end_radius) / 2
+            stroke_width = abs(start_radius - end_radius)
+            # A dash as long as the line width at the middle radius covers the
+            # same area as the explicit (constant width) line
+            dash = segment_set['width']
+            extra = ''
+        else:
+            # Near zero length dashes with round caps are drawn as dots (some
+            # renderers, Qt included, skip dashes of exactly zero length)
+            radius = segment_set['position_radius']
+            stroke_width = 2 * segment_set['radius']
+            dash = DOT_DASH_LENGTH
+            extra = ' stroke-linecap="round"'
+        
+        r = self._number(radius)
+        pitch = 2 * math.pi * float(r) / num_segments
+        dash = min(dash, pitch)
+        gap = pitch - dash
+        self.stream.write(
+            f'<circle cx="{cx}" cy="{cy}" r="{r}" fill="none" stroke="black" '
+            f'stroke-width="{self._number(stroke_width)}"{extra} '
+            f'stroke-dasharray="{self._exact_number(dash)} {self._exact_number(gap)}" '
+            f'stroke-dashoffset="{self._exact_number(dash + gap / 2)}" '
+            f'transform="rotate({rotation} {cx} {cy})" />'
+        )
+
+    def text(self, content, insert, font_size, font_family, text_anchor="middle", fill="black"):
+        self.stream.write(
+            f'<text fill="{fill}" font-family={quoteattr(font_family)} font-size="{font_size}" '
+            f'text-anchor="{text_anchor}" x="{self._number(insert[0])}" '
+            f'y="{self._number(insert[1])}">{escape(content)}</text>'
+        )
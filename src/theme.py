@@ -0,0 +1,249 @@
+"""
+Application theme
+
+The whole window is styled by one style sheet, set once on the central
+widget: Qt parses it a single time and matches it against every widget
+created afterwards. Widgets pick their look through their object name
+(several widgets may share one) instead of carrying style sheets of their
+own, so adding a ring does no style sheet parsing at all.
+
+Dialogs are not children of the central widget and keep the platform look.
+"""
+
+import base64
+
+
+CHECK_MARK_SVG = """<svg width="12" height="12" viewBox="0 0 12 12" fill="none" xmlns="http://www.w3.org/2000/svg">
+<path d="M10 3L4.5 8.5L2 6" stroke="#FFFFFF" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"/>
+</svg>"""
+
+CHECK_MARK_URL = "data:image/svg+xml;base64," + base64.b64encode(CHECK_MARK_SVG.encode()).decode()
+
+STYLESHEET = """
+QWidget {
+    background-color: #1e1e1e;
+    color: #ffffff;
+}
+QPushButton {
+    background-color: #569cd6;
+    color: #ffffff;
+    border: none;
+    padding: 8px 16px;
+    border-radius: 4px;
+}
+QGroupBox {
+    color: #ffffff;
+    font-weight: bold;
+}
+QLabel {
+    color: #ffffff;
+    font-size: 13px;
+}
+QTabWidget {
+    border: none;
+    background-color: transparent;
+}
+QTabWidget::pane {
+    border: 1px solid #404040;
+    border-radius: 8px;
+    background-color: rgba(40, 40, 40, 0.95);
+    margin-top: -1px;
+}
+QTabBar::tab {
+    background-color: #2d2d2d;
+    border: 1px solid #404040;
+    border-bottom: none;
+    border-top-left-radius: 8px;
+    border-top-right-radius: 8px;
+    padding: 12px 20px;
+    margin-right: 2px;
+    font-weight: 600;
+    color: #cccccc;
+}
+QTabBar::tab:selected {
+    background-color: #569cd6;
+    color: #ffffff;
+    border-color: #569cd6;
+}
+QTabBar::tab:hover:!selected {
+    background-color: #404040;
+    color: #ffffff;
+}
+
+#controlsPanel, #controlsPanel QWidget {
+    background-color: #252525;
+}
+
+QComboBox:disabled, QAbstractSpinBox:disabled {
+    color: gray;
+}
+
+QRadioButton {
+    color: #cccccc;
+    font-weight: 500;
+    spacing: 10px;
+}
+QRadioButton::indicator {
+    width: 14px;
+    height: 14px;
+    border: 2px solid #666666;
+    background-color: #2d2d2d;
+    border-radius: 7px;
+}
+QRadioButton::indicator:checked {
+    background-color: #569CD6;
+    border-color: #569CD6;
+}
+QRadioButton::indicator:hover {
+    border-color: #999999;
+}
+QRadioButton:disabled {
+    color: #666666;
+}
+QRadioButton::indicator:disabled {
+    border-color: #444444;
+    background-color: #1e1e1e;
+}
+
+QCheckBox {
+    font-weight: 500;
+    color: #cccccc;
+    border: none;
+    spacing: 8px;
+}
+QCheckBox::indicator {
+    width: 16px;
+    height: 16px;
+    border: 2px solid #666666;
+    background-color: #2d2d2d;
+    border-radius: 3px;
+}
+QCheckBox::indicator:checked {
+    background-color: #569CD6;
+    border-color: #569CD6;
+    image: url(%(check_mark)s);
+}
+QCheckBox::indicator:hover {
+    border-color: #999999;
+}
+
+QPushButton#primaryButton {
+    background-color: #569CD6;
+    border: none;
+    padding: 3px 14px;
+    font-size: 14px;
+    color: #ffffff;
+    min-height: 27px;
+    max-height: 27px;
+}
+QPushButton#primaryButton:hover {
+    background-color: #2E383F;
+}
+QPushButton#primaryButton:pressed {
+    background-color: #569CD6;
+}
+
+QLabel#sectionTitle {
+    background-color: transparent;
+    font-weight: bold;
+    font-size: 20px;
+    color: #569CD6;
+    margin: 0px;
+    padding: 0px;
+    border: none;
+}
+
+QLabel#fieldLabel {
+    background-color: transparent;
+    font-weight: bold;
+    color: #ffffff;
+    border: none;
+    margin: 0px;
+    padding: 0px;
+}
+
+QLabel#ringTitle {
+    background-color: transparent;
+    color: #569CD6;
+    margin: 0px;
+    padding: 0px;
+    border: none;
+    font-size: 18px;
+    font-weight: bold;
+}
+QPushButton#ringMoveButton {
+    background-color: transparent;
+    border: none;
+    color: #ffffff;
+    font-size: 14px;
+    font-weight: bold;
+    padding: 2px 4px;
+    margin: 0px;
+}
+QPushButton#ringMoveButton:hover {
+    color: #cccccc;
+}
+QPushButton#ringMoveButton:pressed {
+    color: #999999;
+}
+QPushButton#ringDeleteButton {
+    background-color: transparent;
+    border: none;
+    color: #f85149;
+    text-decoration: underline;
+    font-size: 12px;
+    padding: 2px;
+}
+QPushButton#ringDeleteButton:hover {
+    color: #da3633;
+}
+QPushButton#ringDeleteButton:pressed {
+    color: #b62324;
+}
+QLabel#ringInfoTitle {
+    background-color: transparent;
+    color: #ffffff;
+    font-weight: bold;
+    font-size: 13px;
+    border: none;
+    padding: 0px;
+    margin: 0px;
+}
+QLabel#ringInfo {
+    background-color: transparent;
+    color: #cccccc;
+    font-size: 12px;
+    font-weight: normal;
+    padding: 0px;
+    border: none;
+    margin: 0px;
+}
+QFrame#ringSeparator {
+    background-color: #808080;
+    border: none;
+    height: 1px;
+}
+
+QListView#presetsList {
+    background-color: #2d2d2d;
+    border: 1px solid #404040;
+    border-radius: 4px;
+    color: #ffffff;
+    padding: 5px;
+}
+QListView#presetsList::item {
+    background-color: transparent;
+    padding: 8px;
+    border-bottom: 1px solid #404040;
+}
+QListView#presetsList::item:selected {
+    background-color: #569cd6;
+}
+QListView#presetsList::item:hover {
+    background-color: #404040;
+}
+
+QWidget#previewPanel {
+    background-color: white;
+}
+""" % {'check_mark': CHECK_MARK_URL}
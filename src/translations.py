@@ -34,6 +34,14 @@ TRANSLATIONS = {
         'spanish': 'Español',
         'export_format': 'Export format:',
         'page_size': 'Page size:',
+        'svg_encoding': 'SVG encoding:',
+        'svg_encoding_elements': 'One element per segment',
+        'svg_encoding_paths': 'One path per ring (compact)',
+        'svg_encoding_dasharray': 'Dash pattern (constant size)',
+        'coordinate_decimals': 'Coordinate decimals:',
+        'resolution_dpi': 'Resolution (DPI):',
+        'exporting_image': 'Exporting image...',
+        'cancel': 'Cancel',
         'export': 'Export',
         'warning': 'Warning',
         'error': 'Error',
@@ -111,6 +119,14 @@ TRANSLATIONS = {
         'spanish': 'Español',
         'export_format': 'Formato de exportación:',
         'page_size': 'Tamaño de página:',
+        'svg_encoding': 'Codificación SVG:',
+        'svg_encoding_elements': 'Un elemento por segmento',
+        'svg_encoding_paths': 'Un trazado por anillo (compacto)',
+        'svg_encoding_dasharray': 'Patrón de trazos (tamaño constante)',
+        'coordinate_decimals': 'Decimales de coordenadas:',
+        'resolution_dpi': 'Resolución (PPP):',
+        'exporting_image': 'Exportando imagen...',
+        'cancel': 'Cancelar',
         'export': 'Exportar',
         'warning': 'Advertencia',
         'error': 'Error',
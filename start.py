@@ -1,9 +1,47 @@
+import os
 import sys
-from PySide6.QtWidgets import QApplication
-from src.main_window import StroboscopeMultiRingsGenerator
+import time
+from src.startup import (
+    STARTUP_REPORT_ENV, active_profiler, profile_span, profile_startup_directory,
+    start_profiling, stop_profiling
+)
+
+# Profiling starts before the heavy imports so that their cost is included
+profile_directory = profile_startup_directory(sys.argv)
+if profile_directory or os.environ.get(STARTUP_REPORT_ENV):
+    start_profiling()
+
+with profile_span("imports"):
+    with profile_span("import PySide6"):
+        from PySide6.QtWidgets import QApplication
+    with profile_span("import main_window"):
+        from src.main_window import StroboscopeMultiRingsGenerator
+
+
+def report_startup(window, shown_at):
+    """Close the profile once the first preview is on screen"""
+    def on_first_preview(generation):
+        window.preview_displayed.disconnect(on_first_preview)
+        profiler = stop_profiling()
+        profiler.add_span("first preview", shown_at, time.perf_counter())
+        print(profiler.summary(), file=sys.stderr)
+        if profile_directory:
+            for path in profiler.write(profile_directory):
+                print(f"Wrote {path}", file=sys.stderr)
+
+    # Stale or failed preview jobs are never displayed and do not count
+    window.preview_displayed.connect(on_first_preview)
+
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = StroboscopeMultiRingsGenerator()
-    window.show()
+    with profile_span("QApplication"):
+        app = QApplication(sys.argv)
+    with profile_span("main window"):
+        window = StroboscopeMultiRingsGenerator()
+    with profile_span("show"):
+        window.show()
+
+    if active_profiler():
+        report_startup(window, time.perf_counter())
+
     sys.exit(app.exec())
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from src.disc_spec import DiscSpec, RingSpec
+from src.polar_raster import render_coverage
+from src.raster_export import BandRenderer
+from src.svg_generator import SVGGenerator
+
+
+# Supersampling factor of the QPainter reference
+REFERENCE_SCALE = 8
+
+DISCS = {
+    # 46 lines, 80 dots and a 450 line ring too fine to resolve: the bottom
+    # half is mirrored from the top
+    'even': DiscSpec(diameter=60, rings=(
+        RingSpec(rpm=78, hz=60, depth=6, density='normal'),
+        RingSpec(rpm=45, hz=60, depth=6, density='normal', shape_type='dots', dot_size=1.5),
+        RingSpec(rpm=16, hz=60, depth=4, density='double'),
+    )),
+    # 77 lines, 67 dots and 375 lines: every row is computed
+    'odd': DiscSpec(diameter=60, rings=(
+        RingSpec(rpm=78, hz=50, depth=6, density='double'),
+        RingSpec(rpm=45, hz=50, depth=6, density='normal', shape_type='dots', dot_size=1.5),
+        RingSpec(rpm=16, hz=50, depth=4, density='double'),
+    )),
+}
+
+
+def reference_coverage(layout, size):
+    """Ink coverage painted with QPainter at a higher resolution, averaged down to size"""
+    large = size * REFERENCE_SCALE
+    pixels = BandRenderer(layout, large / layout['diameter'], large).render_band(0, large)
+    coverage = 1 - pixels.astype(np.float64) / 255
+    return coverage.reshape(size, REFERENCE_SCALE, size, REFERENCE_SCALE).mean(axis=(1, 3))
+
+
+@pytest.mark.parametrize("size", [120, 121])
+@pytest.mark.parametrize("disc", DISCS)
+def test_render_coverage_matches_qpainter(qt_app, disc, size):
+    layout = SVGGenerator().build_disc_layout(DISCS[disc])
+    counts = {segment_set['num_segments'] % 2 for ring in layout['rings'] for segment_set in ring}
+    assert counts == ({0} if disc == 'even' else {1})
+
+    coverage = render_coverage(layout, size)
+    reference = reference_coverage(layout, size)
+
+    assert coverage.shape == (size, size)
+    assert coverage.min() >= 0 and coverage.max() <= 1
+    # Edges are anti-aliased differently, and the finest ring is averaged to
+    # grey instead of resolved, but the ink matches pixel by pixel and in total
+    difference = np.abs(coverage - reference)
+    assert difference.max() < 0.2
+    assert difference.mean() < 0.015
+    assert abs(coverage.mean() - reference.mean()) < 0.005
+
+    # Both halves are mirrored from the same computed half
+    np.testing.assert_array_equal(coverage, coverage[:, ::-1])
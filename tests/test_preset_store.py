@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from src.config_manager import ConfigManager
+from src.preset_store import PresetStore
+
+
+# Not in alphabetical order, the store must keep the order they were saved in
+LEGACY_PRESETS = {
+    "Zeta 45": {'diameter': 150, 'rings': [{'rpm': 45, 'hz': 50}]},
+    "Alpha 33": {'diameter': 175, 'rings': [{'rpm': 33.33, 'hz': 60}, {'rpm': 78, 'hz': 60}]},
+    "Mid 78 ñ": {'diameter': 300, 'rings': [{'rpm': 78, 'hz': 50, 'shape_type': 'dots'}]},
+}
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ConfigManager, "_get_config_dir", lambda self: tmp_path)
+    config = {'language': 'en', 'diameter': 150, 'presets': LEGACY_PRESETS}
+    (tmp_path / "config.json").write_text(json.dumps(config, ensure_ascii=False), encoding='utf-8')
+    return tmp_path
+
+
+def open_store():
+    config_manager = ConfigManager()
+    return config_manager, config_manager.preset_store()
+
+
+def read_config(config_dir):
+    return json.loads((config_dir / "config.json").read_text(encoding='utf-8'))
+
+
+def test_migration_keeps_presets_and_order(config_dir):
+    config_manager, store = open_store()
+    try:
+        assert store.names() == list(LEGACY_PRESETS)
+        for name, preset_data in LEGACY_PRESETS.items():
+            assert store.get(name) == preset_data
+    finally:
+        store.close()
+
+    # The presets left config.json, the other settings stayed
+    assert read_config(config_dir) == {'language': 'en', 'diameter': 150}
+
+
+def test_migration_runs_once(config_dir):
+    _, store = open_store()
+    store.close()
+
+    _, store = open_store()
+    try:
+        assert store.names() == list(LEGACY_PRESETS)
+    finally:
+        store.close()
+
+
+def test_interrupted_migration_keeps_stored_presets(config_dir):
+    # A previous run filled the store, then changed and added presets, but
+    # config.json was never rewritten
+    store = PresetStore(config_dir / "presets.sqlite3")
+    store.import_presets(LEGACY_PRESETS.items())
+    store.put("Alpha 33", {'diameter': 120, 'rings': [{'rpm': 16, 'hz': 50}]})
+    store.put("Newer", {'diameter': 150, 'rings': [{'rpm': 45, 'hz': 60}]})
+    store.close()
+
+    _, store = open_store()
+    try:
+        assert store.names() == list(LEGACY_PRESETS) + ["Newer"]
+        assert store.get("Alpha 33")['diameter'] == 120
+    finally:
+        store.close()
+    assert 'presets' not in read_config(config_dir)
+
+
+def test_failed_config_save_keeps_legacy_presets(config_dir, monkeypatch):
+    def fail_replace(source, destination):
+        raise OSError("read-only config directory")
+
+    with monkeypatch.context() as patch:
+        patch.setattr("src.config_manager.os.replace", fail_replace)
+        config_manager, store = open_store()
+        try:
+            assert store.names() == list(LEGACY_PRESETS)
+            assert config_manager.config['presets'] == LEGACY_PRESETS
+            store.delete("Zeta 45")
+        finally:
+            store.close()
+    assert read_config(config_dir)['presets'] == LEGACY_PRESETS
+
+    # The next start finishes the migration without bringing the deleted preset back
+    _, store = open_store()
+    try:
+        assert store.names() == ["Alpha 33", "Mid 78 ñ"]
+    finally:
+        store.close()
+    assert 'presets' not in read_config(config_dir)
+
+
+@pytest.mark.parametrize("legacy_presets", [["Zeta 45"], "Zeta 45", None])
+def test_unexpected_legacy_presets_are_left_alone(config_dir, legacy_presets):
+    config = {'language': 'en', 'presets': legacy_presets}
+    (config_dir / "config.json").write_text(json.dumps(config), encoding='utf-8')
+
+    _, store = open_store()
+    try:
+        assert store.names() == []
+    finally:
+        store.close()
+    assert read_config(config_dir) == config
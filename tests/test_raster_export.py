@@ -0,0 +1,143 @@
+import io
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from src import raster_export
+from src.disc_spec import DiscSpec, RingSpec
+from src.raster_export import (
+    BandRenderer, PNGWriter, TIFFWriter, TIFF_MAX_OFFSET, _adler32_combine, export_raster, image_size
+)
+from src.svg_generator import SVGGenerator
+
+
+# Odd size and band height, so the last band is a short one
+SIZE = 37
+BAND_HEIGHT = 16
+
+
+def random_pixels(size=SIZE, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (size, size), np.uint8)
+
+
+def write_image(writer_class, pixels, band_height=BAND_HEIGHT, dpi=300):
+    size = pixels.shape[0]
+    bands = range(0, size, band_height)
+    stream = io.BytesIO()
+    writer = writer_class(stream, size, dpi, band_height, len(bands))
+    writer.start()
+    for top in bands:
+        writer.write_band(*writer.band_encoding(pixels[top:top + band_height]))
+    writer.end()
+    return stream.getvalue()
+
+
+def decode_png(data):
+    """Decode a greyscale PNG with zlib alone, checking every chunk CRC and the stream checksum"""
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    position = 8
+    chunks = []
+    while position < len(data):
+        length, = struct.unpack('>I', data[position:position + 4])
+        chunk_type = data[position + 4:position + 8]
+        chunk_data = data[position + 8:position + 8 + length]
+        crc, = struct.unpack('>I', data[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(chunk_type + chunk_data)
+        chunks.append((chunk_type, chunk_data))
+        position += 12 + length
+
+    assert chunks[0][0] == b'IHDR' and chunks[-1][0] == b'IEND'
+    width, height, depth, colour_type = struct.unpack('>IIBB', chunks[0][1][:10])
+    assert (depth, colour_type) == (8, 0)
+
+    # zlib.decompress() raises on a wrong adler32
+    raw = zlib.decompress(b''.join(chunk_data for chunk_type, chunk_data in chunks if chunk_type == b'IDAT'))
+    rows = np.frombuffer(raw, np.uint8).reshape(height, width + 1)
+    assert not rows[:, 0].any()
+    return rows[:, 1:]
+
+
+def decode_with_qt(data, image_format):
+    from PySide6.QtGui import QImage, QImageReader
+
+    if image_format.encode() not in [bytes(name) for name in QImageReader.supportedImageFormats()]:
+        pytest.skip(f"Qt has no {image_format} reader")
+    image = QImage.fromData(data, image_format)
+    assert not image.isNull()
+    image = image.convertToFormat(QImage.Format.Format_Grayscale8)
+    pixels = np.frombuffer(image.constBits(), np.uint8).reshape(image.height(), image.bytesPerLine())
+    return pixels[:, :image.width()].copy()
+
+
+@pytest.mark.parametrize("lengths", [(1, 1), (100, 70000), (65521, 3), (200000, 131042)])
+def test_adler32_combine(lengths):
+    rng = np.random.default_rng(1)
+    first, second = (rng.integers(0, 256, length, np.uint8).tobytes() for length in lengths)
+    combined = _adler32_combine(zlib.adler32(first), zlib.adler32(second), len(second))
+    assert combined == zlib.adler32(first + second)
+
+
+@pytest.mark.parametrize("band_height", [BAND_HEIGHT, 1, SIZE])
+def test_png_round_trip(band_height):
+    pixels = random_pixels()
+    data = write_image(PNGWriter, pixels, band_height)
+    np.testing.assert_array_equal(decode_png(data), pixels)
+
+
+def test_png_decodes_with_qt(qt_app):
+    pixels = random_pixels()
+    np.testing.assert_array_equal(decode_with_qt(write_image(PNGWriter, pixels), "png"), pixels)
+
+
+@pytest.mark.parametrize("band_height", [BAND_HEIGHT, 1, SIZE])
+def test_tiff_round_trip(qt_app, band_height):
+    pixels = random_pixels()
+    data = write_image(TIFFWriter, pixels, band_height)
+    np.testing.assert_array_equal(decode_with_qt(data, "tiff"), pixels)
+
+
+def test_tiff_rejects_offsets_past_4gb():
+    class FarStream:
+        # A stream already positioned close to the 32 bit offset limit
+        def tell(self):
+            return TIFF_MAX_OFFSET - 10
+
+        def write(self, data):
+            pass
+
+    writer = TIFFWriter(FarStream(), SIZE, 300, BAND_HEIGHT, 3)
+    with pytest.raises(ValueError):
+        writer.write_band(b'\x00' * 11)
+
+
+@pytest.mark.parametrize("file_format", ["png", "tiff"])
+def test_export_matches_a_single_band(qt_app, tmp_path, monkeypatch, file_format):
+    disc_spec = DiscSpec(
+        diameter=60,
+        rings=(RingSpec(rpm=78, hz=50, depth=5), RingSpec(rpm=45, hz=60, depth=5, shape_type='dots')),
+        text_top="Top",
+    )
+    layout = SVGGenerator().get_disc_layout(disc_spec)
+    dpi = 100
+    size = image_size(layout, dpi)
+    # 16 row bands (the minimum), painted by several workers
+    monkeypatch.setattr(raster_export, "BAND_BYTES", 1)
+
+    file_path = tmp_path / f"disc.{file_format}"
+    progress = []
+    export_raster(layout, str(file_path), dpi, workers=3, progress=lambda done, total: progress.append((done, total)))
+
+    band_count = -(-size // 16)
+    assert progress == [(done, band_count) for done in range(1, band_count + 1)]
+
+    data = file_path.read_bytes()
+    pixels = decode_png(data) if file_format == "png" else decode_with_qt(data, "tiff")
+    expected = BandRenderer(layout, size / layout['diameter'], size).render_band(0, size)
+    assert pixels.shape == (size, size)
+    # Anti-aliasing differs slightly with the painter's offset, on every row
+    # alike, a seam between bands would show as whole rows of differences
+    difference = np.abs(pixels.astype(int) - expected)
+    assert difference.max() <= 8
+    assert difference.mean() < 0.1